@@ -1,17 +1,24 @@
 """Import FLASK Module, Database and BLUEPRINTS"""
-from flask import Flask, render_template
+import os
+from flask import Flask, render_template, request
+from jinja2 import FileSystemBytecodeCache
 from flask_login import LoginManager
 from flask_caching import Cache
 from flask_jwt_extended import JWTManager
 from config import Config
 from models.database import db
+from app.json_provider import ORJSONProvider, orjson
 
 # Initialize Flask extensions
 login_manager = LoginManager()
 login_manager.login_view = 'bp_auth.login'  # Redirect to login page if user is not logged in
-cache = Cache(config={'CACHE_TYPE': 'SimpleCache'})  # Simple cache configuration
+cache = Cache()  # Backend is configured from Config (Redis when REDIS_URL is set)
 jwt = JWTManager()  # JWT manager for handling JSON Web Tokens
 
+# Imported once here rather than inside load_user: the bp_auth package needs the
+# extension objects above (e.g. cache) to exist before it can be loaded
+from app.bp_auth.user import User
+
 
 
 @login_manager.user_loader
@@ -25,7 +32,8 @@ def load_user(user_id):
     Returns:
         User: The User object associated with the given ID, or None if not found.
     """
-    from app.bp_auth.user import User
+    # Flask-Login stores the result on g for the rest of the request, so this
+    # runs at most once per request however often current_user is accessed
     return User.get_user_by_id(user_id)
 
 def create_app():
@@ -42,14 +50,31 @@ def create_app():
 
     # Load the configuration settings from the Config class
     app.config.from_object(Config)
-
-    # Set up the secret key for JWT (for encoding and decoding tokens)
-    app.config["JWT_SECRET_KEY"] = "super-secret-key"  
+    app.logger.setLevel(app.config["LOG_LEVEL"])
+
+    # Serialize JSON responses with orjson when available
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
+    # Persist compiled templates so each worker skips re-parsing them on cold start.
+    # Must be set before the Jinja environment is created (blueprint filters create it).
+    # The directory is private to the app user: cached bytecode is executed when loaded.
+    jinja_cache_dir = app.config["JINJA_CACHE_DIR"] or os.path.join(app.instance_path, "jinja_cache")
+    os.makedirs(jinja_cache_dir, mode=0o700, exist_ok=True)
+    os.chmod(jinja_cache_dir, 0o700)
+    app.jinja_options = {
+        **app.jinja_options,
+        "bytecode_cache": FileSystemBytecodeCache(directory=jinja_cache_dir),
+        "cache_size": 1000
+    }
+
+    # JWT key and algorithm come from Config (JWT_SECRET_KEY / JWT_ALGORITHM)
     jwt.init_app(app)  # Initialize JWT manager with the app
 
     # Initialize the Flask extensions with the app
     login_manager.init_app(app)
     cache.init_app(app)
+    db.init_app(app)  # One pooled connection per request, returned at teardown
 
     # Import blueprints for different parts of the application
     from app.bp_main.routes import bp_main
@@ -69,6 +94,18 @@ def create_app():
     app.register_blueprint(bp_report)
     app.register_blueprint(bp_api_auth)
 
+    from app.bp_admin.utils_admin import UPLOAD_NAME_PATTERN
+
+    @app.after_request
+    def cache_uploaded_images(response):
+        """Let browsers and CDNs keep content-addressed uploads forever: a new image gets a new name."""
+        if request.endpoint == "static" and response.status_code == 200 and \
+                UPLOAD_NAME_PATTERN.fullmatch(request.view_args.get("filename", "")):
+            response.cache_control.public = True
+            response.cache_control.max_age = 31536000
+            response.cache_control.immutable = True
+        return response
+
     @app.errorhandler(404)
     def page_not_found(e):
         """Render a custom 404 error page."""
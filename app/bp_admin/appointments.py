@@ -5,21 +5,29 @@ from . import bp_admin
 from .forms import AddAppointment, EditAppointmentForm
 from .utils_admin import (
     flash_and_redirect, role_required, make_context,
-    invalidate_appointment_cache, populate_appointment_form_choices
+    invalidate_appointment_cache, populate_appointment_form_choices,
+    get_cached_client_choices, get_cached_provider_choices,
+    cache_page, appointment_rev_key, SLOT_MAX_DURATION, conditional_page, db_executor,
+    get_cache_rev, APPOINTMENTS_REV_KEY, APPOINTMENT_REV_TIMEOUT,
+    delete_memoized_many, get_request_user
 )
-from models.database import db
-
-
-# Constants
-ALL_SLOTS = [(f"{h}-{h+1}", f"{h}-{h+1}") for h in list(range(1, 12)) + list(range(13, 22))]
-
-# Helpers
-def get_pay_rates(provider_choices):
-    return {
-        pid: db.get_user_by_id(pid)[14] or 15.75
-        for pid, _ in provider_choices if pid != -1
-    }
-
+from models.database import db, SlotTakenError
+
+
+# Prepared once per pooled connection for the edit_appointment hot path
+db.prepare("admin_update_appointment", """
+    UPDATE salon_appointment
+    SET date_appoint = $1, slot = $2, venue = $3,
+        provider_id = $4, provider_name = $5,
+        consumer_id = $6, consumer_name = $7,
+        nber_services = $8
+    WHERE appointment_id = $9
+""")
+db.prepare("admin_update_service", """
+    UPDATE salon_service
+    SET service_name = $1, service_duration = $2
+    WHERE appointment_id = $3
+""")
 
 @bp_admin.route("/manage_appointments")
 @login_required
@@ -32,34 +40,50 @@ def manage_appointments():
     cached helper function to render the appointments management page.
     """
     filter_status = request.args.get("status", "all")
-    return _get_manage_appointments_cached(current_user.user_type, filter_status)
+    rev = get_cache_rev(cache, APPOINTMENTS_REV_KEY)
+    return conditional_page(_get_manage_appointments_cached(rev, current_user.user_type, filter_status))
 
 
-@cache.memoize(timeout=60)
-def _get_manage_appointments_cached(user_type, filter_status):
+def _get_manage_appointments_cached(rev, user_type, filter_status):
     """
     Cached helper function to render the Manage Appointments view.
 
+    The page is cached under a key embedding the appointments generation, so any
+    appointment change clears it for every admin type and tab with one counter bump.
+
     Args:
+        rev (int): Current appointments generation.
         user_type (str): The user type of the currently logged-in admin.
         filter_status (str): The appointment status to filter by.
 
     Returns:
         str: Rendered HTML of the manage_appointments page.
     """
-    form = AddAppointment()
+    return cache_page(
+        cache,
+        f"appt:manage:{rev}:{user_type}:{filter_status}",
+        lambda: _render_manage_appointments(filter_status)
+    )
 
-    # Populate dropdown choices for the appointment form (e.g., venues, slots, users)
-    populate_appointment_form_choices(form, db)
 
-    # Retrieve and optionally filter appointments by status
-    all_appointments = db.get_all_appointments()
-    appointments = [
-        a for a in all_appointments if a["status"] == filter_status
-    ] if filter_status != "all" else all_appointments
+def _render_manage_appointments(filter_status):
+    """
+    Render the Manage Appointments view.
 
-    # Prepare pay rates for professionals, used to display or calculate cost
-    pay_rates = get_pay_rates(form.provider_id.choices)
+    Args:
+        filter_status (str): The appointment status to filter by.
+
+    Returns:
+        str: Rendered HTML of the manage_appointments page.
+    """
+    form = AddAppointment()
+
+    # Retrieve appointments (filtered by status in SQL) on a spare pooled connection...
+    appointments_future = db.submit(db_executor, db.get_appointments, filter_status)
+
+    # ...while the dropdown choices for the appointment form are populated (e.g., venues, users)
+    pay_rates = populate_appointment_form_choices(form, db, cache)
+    appointments = appointments_future.result()
 
     # Render the management template with context and data
     return render_template(
@@ -87,14 +111,16 @@ def view_admin_appointment(appt_id):
         str: Rendered HTML of the appointment detail page.
     """
     return_status = request.args.get("status", "all")  # Optional return context for navigation
-    return _get_view_appointment_cached(appt_id, return_status)
+    return conditional_page(_get_view_appointment_cached(appt_id, return_status))
 
 
-@cache.memoize(timeout=60)
 def _get_view_appointment_cached(appt_id, return_status):
     """
     Cached helper function to fetch and render a specific appointment's details.
 
+    The key embeds the appointment's own generation counter, so only edits to this
+    appointment clear it.
+
     Args:
         appt_id (int): ID of the appointment.
         return_status (str): Status filter to preserve page context on return.
@@ -102,6 +128,25 @@ def _get_view_appointment_cached(appt_id, return_status):
     Returns:
         str: Rendered HTML page with appointment details.
     """
+    rev = get_cache_rev(cache, appointment_rev_key(appt_id), timeout=APPOINTMENT_REV_TIMEOUT)
+    return cache_page(
+        cache,
+        f"appt:view:{appt_id}:{rev}:{return_status}",
+        lambda: _render_view_appointment(appt_id, return_status)
+    )
+
+
+def _render_view_appointment(appt_id, return_status):
+    """
+    Fetch and render a specific appointment's details.
+
+    Args:
+        appt_id (int): ID of the appointment.
+        return_status (str): Status filter to preserve page context on return.
+
+    Returns:
+        str|Response: Rendered HTML page, or a redirect if the appointment does not exist.
+    """
     appointment = db.get_appointment_by_id(appt_id)
 
     # Redirect with error if appointment is not found
@@ -142,18 +187,17 @@ def edit_appointment(appt_id):
     form = EditAppointmentForm()
 
     # Populate dropdowns for client, professional, and slot selection
-    form.consumer_id.choices = db.get_client_choices()
-    form.provider_id.choices = db.get_provider_choices()
-    form.slot.choices = [(f"{h}-{h+1}", f"{h}-{h+1}") for h in list(range(1, 12)) + list(range(13, 22))]
-    pay_rates = get_pay_rates(form.provider_id.choices)
+    form.consumer_id.choices = get_cached_client_choices(cache, db)
+    form.provider_id.choices, pay_rates = get_cached_provider_choices(cache, db)
 
     if form.validate_on_submit():
         try:
             # Extract form data
             consumer_id = form.consumer_id.data
             provider_id = form.provider_id.data
-            consumer_name = db.get_user_name_by_id(consumer_id)
-            provider_name = db.get_user_name_by_id(provider_id)
+            # Full names are the labels of the (already loaded) dropdown choices
+            consumer_name = dict(form.consumer_id.choices).get(consumer_id, "Client")
+            provider_name = dict(form.provider_id.choices).get(provider_id, "Professional")
             date = form.date_appoint.data
             slot = form.slot.data
             venue = form.venue.data
@@ -161,16 +205,12 @@ def edit_appointment(appt_id):
             nber_services = form.nber_services.data
             duration = form.duration.data
 
-            # Validate time slot format and duration bounds
-            try:
-                start_hour = int(slot.split("-")[0])
-            except ValueError:
+            # Validate time slot and duration bounds
+            max_duration = SLOT_MAX_DURATION.get(slot)
+            if max_duration is None:
                 flash("Invalid time slot format. Example: '10-11'.", "danger")
                 return render_template("appointments/edit_appointment.html", form=form, pay_rates=pay_rates)
 
-            max_end_hour = 12 if start_hour < 12 else 22
-            max_duration = max_end_hour - start_hour
-
             if not (1 <= duration <= max_duration):
                 flash(f"Invalid duration. For time slot {slot}, allowed duration is 1 to {max_duration} hours.", "danger")
                 return render_template("appointments/edit_appointment.html", form=form, pay_rates=pay_rates)
@@ -179,34 +219,30 @@ def edit_appointment(appt_id):
                 flash(f"Number of services ({nber_services}) cannot exceed duration ({duration}).", "danger")
                 return render_template("appointments/edit_appointment.html", form=form, pay_rates=pay_rates)
 
-            # Update appointment
-            db.execute("""
-                UPDATE salon_appointment
-                SET date_appoint = %s, slot = %s, venue = %s,
-                    provider_id = %s, provider_name = %s,
-                    consumer_id = %s, consumer_name = %s,
-                    nber_services = %s
-                WHERE appointment_id = %s
-            """, (date, slot, venue, provider_id, provider_name, consumer_id, consumer_name, nber_services, appt_id))
-
-            # Update service
-            db.execute("""
-                UPDATE salon_service
-                SET service_name = %s, service_duration = %s
-                WHERE appointment_id = %s
-            """, (service_name, duration, appt_id))
+            # Update appointment and its service atomically
+            with db.transaction() as cur:
+                db.execute_prepared(cur, "admin_update_appointment", (
+                    date, slot, venue, provider_id, provider_name, consumer_id, consumer_name, nber_services, appt_id
+                ))
+                db.execute_prepared(cur, "admin_update_service", (service_name, duration, appt_id))
 
             db.log_admin_action(
                 f"Admin '{current_user.user_name}' edited appointment #{appt_id} (Consumer: {consumer_name}, Provider: {provider_name})",
                 current_user.user_name
             )
 
-            invalidate_appointment_cache(cache, current_user.user_type)
-            cache.delete_memoized(_get_user_appointments_cached, consumer_id)
-            cache.delete_memoized(_get_user_appointments_cached, provider_id)
+            invalidate_appointment_cache(cache, appt_id)
+            delete_memoized_many(
+                cache,
+                (_get_user_appointments_cached, consumer_id),
+                (_get_user_appointments_cached, provider_id)
+            )
 
             return flash_and_redirect("Appointment updated successfully.", "success", "bp-admin.manage_appointments")
 
+        except SlotTakenError as e:
+            flash(str(e), "warning")
+            return render_template("appointments/edit_appointment.html", form=form, pay_rates=pay_rates)
         except Exception as e:
             flash(f"Error updating appointment: {e}", "danger")
             return render_template("appointments/edit_appointment.html", form=form, pay_rates=pay_rates)
@@ -257,9 +293,12 @@ def delete_appointment(appt_id):
 
     # Perform deletion and cache invalidation
     db.delete_appointment(appt_id)
-    invalidate_appointment_cache(cache, current_user.user_type)
-    cache.delete_memoized(_get_user_appointments_cached, appt["consumer_id"])
-    cache.delete_memoized(_get_user_appointments_cached, appt["provider_id"])
+    invalidate_appointment_cache(cache, appt_id)
+    delete_memoized_many(
+        cache,
+        (_get_user_appointments_cached, appt["consumer_id"]),
+        (_get_user_appointments_cached, appt["provider_id"])
+    )
 
     flash("Appointment deleted successfully.", "success")
     return redirect(url_for("bp-admin.manage_appointments"))
@@ -293,7 +332,7 @@ def _get_user_appointments_cached(user_id):
         str: Rendered HTML template displaying the user's appointments.
     """
     # Retrieve the user by ID
-    user = db.get_user_by_id(user_id)
+    user = get_request_user(db, user_id)
     if not user:
         return flash_and_redirect("User not found.", "danger", "bp-admin.manage_users")
 
@@ -306,8 +345,8 @@ def _get_user_appointments_cached(user_id):
         appointments=appointments,
         user=user,
         context=make_context(
-            f"Appointments for {user[4]}",  # user_name
-            f"Appointments - {user[5]} {user[6]}"  # fname + lname
+            f"Appointments for {user['user_name']}",
+            f"Appointments - {user['fname']} {user['lname']}"
         )
     )
 
@@ -329,8 +368,7 @@ def create_appointment():
     form = AddAppointment()
 
     # Populate dropdowns for venue, time slot, client, and provider
-    populate_appointment_form_choices(form, db)
-    pay_rates = get_pay_rates(form.provider_id.choices)
+    pay_rates = populate_appointment_form_choices(form, db, cache)
 
     if form.validate_on_submit():
         try:
@@ -345,9 +383,10 @@ def create_appointment():
             nb_services = form.nb_services.data or 1
 
             # Determine max duration based on selected time slot
-            start_hour = int(slot.split("-")[0])
-            max_end_hour = 12 if start_hour < 12 else 22
-            max_duration = max_end_hour - start_hour
+            max_duration = SLOT_MAX_DURATION.get(slot)
+            if max_duration is None:
+                flash(f"Invalid time slot {slot}.", "danger")
+                return redirect(url_for("bp-admin.manage_appointments"))
 
             # Validate duration constraints
             if not (1 <= duration <= max_duration):
@@ -359,9 +398,9 @@ def create_appointment():
                 flash(f"Number of services ({nb_services}) cannot exceed duration in hours ({duration}).", "danger")
                 return redirect(url_for("bp-admin.manage_appointments"))
 
-            # Lookup full names for client and provider
-            consumer_name = db.get_user_name_by_id(client_id) or "Client"
-            provider_name = db.get_user_name_by_id(provider_id) or "Professional"
+            # Full names for client and provider are the labels of the dropdown choices
+            consumer_name = dict(form.client_id.choices).get(client_id, "Client")
+            provider_name = dict(form.provider_id.choices).get(provider_id, "Professional")
 
             # Insert appointment into database
             appointment_id = db.add_appointment({
@@ -395,23 +434,20 @@ def create_appointment():
             )
 
             # Clear cached appointment data
-            invalidate_appointment_cache(cache, current_user.user_type)
+            invalidate_appointment_cache(cache)
 
             flash("Appointment created successfully.", "success")
             return redirect(url_for("bp-admin.manage_appointments", status="requested"))
 
+        except SlotTakenError as e:
+            flash(str(e), "warning")
+            return redirect(url_for("bp-admin.manage_appointments"))
         except Exception as e:
             flash(f"Error saving appointment: {e}", "danger")
             return redirect(url_for("bp-admin.manage_appointments"))
 
-    # If form not valid, show error and re-render appointment form
+    # If form not valid, flash the field errors and go back to the (cached) management page
     flash("Failed to create appointment. Please check the form.", "danger")
-    appointments = db.get_all_appointments()
-    return render_template(
-        "appointments/manage_appointments.html",
-        appointments=appointments,
-        form=form,
-        pay_rates=pay_rates,
-        context=make_context("Manage Appointments"),
-        filter_status="all"
-    )
+    for field_name, errors in form.errors.items():
+        flash(f"{form[field_name].label.text}: {' '.join(errors)}", "danger")
+    return redirect(url_for("bp-admin.manage_appointments"))
@@ -1,7 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import DateField, IntegerField, StringField, PasswordField, SubmitField, SelectField, TextAreaField
 from wtforms.validators import DataRequired, Length, Email, EqualTo, NumberRange
-from models.database import db
+from .utils_admin import ALL_SLOTS, ADMIN_VENUE_CHOICES
 
 # === Form for editing an appointment by admin ===
 class EditAppointmentForm(FlaskForm):
@@ -9,7 +9,7 @@ class EditAppointmentForm(FlaskForm):
     consumer_id = SelectField("Consumer", coerce=int, validators=[DataRequired()])
     provider_id = SelectField("Provider", coerce=int, validators=[DataRequired()])
     date_appoint = DateField("Date", format="%Y-%m-%d", validators=[DataRequired()])
-    slot = SelectField("Time Slot", choices=[], validators=[DataRequired()])
+    slot = SelectField("Time Slot", choices=ALL_SLOTS, validators=[DataRequired()])
     venue = StringField("Venue", validators=[DataRequired()])
     service_name = StringField("Service", validators=[DataRequired()])
     nber_services = IntegerField("Number of Services", validators=[DataRequired(), NumberRange(min=1)])
@@ -68,9 +68,9 @@ class AddAdminForm(FlaskForm):
 # === Form for creating a new appointment by admin ===
 class AddAppointment(FlaskForm):
     """Form used by admins to create a new appointment."""
-    venue = SelectField("Venue", choices=[], validators=[DataRequired()])
+    venue = SelectField("Venue", choices=ADMIN_VENUE_CHOICES, validators=[DataRequired()])
     date_appoint = DateField("Date", validators=[DataRequired()])
-    slot = SelectField("Time Slot", choices=[], validators=[DataRequired()])
+    slot = SelectField("Time Slot", choices=ALL_SLOTS, validators=[DataRequired()])
     provider_id = SelectField("Professional", coerce=int, validators=[DataRequired()])
     service = StringField("Service", validators=[DataRequired()])
     duration = IntegerField("Duration (Hours)", validators=[DataRequired()], render_kw={"id": "duration"})
@@ -80,17 +80,14 @@ class AddAppointment(FlaskForm):
 
 # === Form for creating a new report (both feedbacks) ===
 class AddReport(FlaskForm):
-    """Form used by admins to create a report with both client and professional feedback."""
+    """
+    Form used by admins to create a report with both client and professional feedback.
+
+    The appointment choices are assigned by the view only when the field is validated or
+    rendered (see get_cached_appointment_choices), not on every instantiation.
+    """
     appointment_id = SelectField("Appointment", coerce=int, validators=[DataRequired()])
     status = SelectField("Status", choices=[("open", "Open"), ("closed", "Closed")], validators=[DataRequired()])
     feedback_client = StringField("Client Feedback", validators=[DataRequired(), Length(min=3, max=150)])
     feedback_professional = TextAreaField("Professionnal Feedback", validators=[DataRequired(), Length(min=3, max=150)])
     submit = SubmitField("Submit Response")
-
-    def __init__(self, *args, **kwargs):
-        """Populate the appointment dropdown with all available appointments."""
-        super().__init__(*args, **kwargs)
-        appointments = db.get_all_appointments()
-        self.appointment_id.choices = [
-            (appt["appointment_id"], f"Appt {appt['appointment_id']}") for appt in appointments
-        ]
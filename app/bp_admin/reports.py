@@ -6,10 +6,33 @@ from app import cache
 from . import bp_admin
 from .forms import AddReport, EditReportForm
 from app.bp_report.report import Report
-from .utils_admin import role_required, flash_and_redirect, make_context
+from .utils_admin import (
+    role_required, flash_and_redirect, make_context, get_cached_appointment_choices,
+    get_cache_rev, bump_cache_rev, REPORTS_REV_KEY, get_request_user, delete_memoized_many,
+    private_cache
+)
 from models.database import db
 from .utils_report_cache import _get_report_view_cached
 
+# Status tabs of the Manage Reports page
+REPORT_FILTERS = ("all", "open", "closed", "flagged")
+
+
+def _report_view_calls(report_id):
+    """
+    List the memoized single-report views to clear when a report changes.
+
+    Args:
+        report_id (int): ID of the changed report.
+
+    Returns:
+        tuple: (memoized_function, *args) tuples for delete_memoized_many.
+    """
+    return (
+        (_get_view_report_cached, report_id),
+        (_get_report_view_cached, report_id, "my")
+    )
+
 
 
 @bp_admin.route("/manage_reports", methods=["GET", "POST"])
@@ -25,10 +48,14 @@ def manage_reports():
     Returns:
         Response: Rendered HTML page with report form and list of reports.
     """
-    form = AddReport()
+    # The form is only built to handle a submission; GET renders come from the cache
+    form = AddReport() if request.method == "POST" else None
+    if form is not None:
+        # Choices are only needed here to validate the submitted appointment
+        form.appointment_id.choices = get_cached_appointment_choices(cache, db)
 
     # If form is submitted and valid, create a new report
-    if form.validate_on_submit():
+    if form is not None and form.validate_on_submit():
         try:
             Report.create({
                 "appointment_id": form.appointment_id.data,
@@ -37,12 +64,8 @@ def manage_reports():
                 "feedback_professional": form.feedback_professional.data
             })
 
-            # Invalidate cached report list for the current filter
-            cache.delete_memoized(
-                _get_manage_reports_cached,
-                current_user.user_type,
-                request.args.get("status", "all")
-            )
+            # Invalidate cached report lists (every filter tab)
+            bump_cache_rev(cache, REPORTS_REV_KEY)
 
             flash("New Report was created successfully.", "success")
             return redirect(url_for("bp-admin.manage_reports"))
@@ -52,36 +75,48 @@ def manage_reports():
 
     # Determine the status filter for report listing
     filter_status = request.args.get("status", "all")
-    return _get_manage_reports_cached(current_user.user_type, filter_status, form=form)
+    if filter_status not in REPORT_FILTERS:
+        filter_status = "all"  # Keep the memoized variants to the known tabs
+
+    # A submitted form carries errors to display, so it is rendered without the cache
+    if form is not None:
+        return _render_manage_reports(filter_status, form)
+    return _get_manage_reports_cached(get_cache_rev(cache, REPORTS_REV_KEY), current_user.user_type, filter_status)
 
 
 
 @cache.memoize(timeout=60)
-def _get_manage_reports_cached(user_type, filter_status, form=None):
+def _get_manage_reports_cached(rev, user_type, filter_status):
     """
     Cached helper to fetch and render the Manage Reports page.
 
+    Args:
+        rev (int): Current reports generation; bumping it invalidates every cached tab.
+        user_type (str): Type of the current admin user (unused here but required for cache key uniqueness).
+        filter_status (str): Status to filter reports by (e.g., "open", "closed", "flagged").
+
+    Returns:
+        str: Rendered HTML page for managing reports.
+    """
+    return _render_manage_reports(filter_status, AddReport())
+
+
+def _render_manage_reports(filter_status, form):
+    """
+    Fetch and render the Manage Reports page.
+
     Filters the list of reports based on the given status and returns a rendered HTML
     page with the filtered reports and the form for adding a new report.
 
     Args:
-        user_type (str): Type of the current admin user (unused here but required for cache key uniqueness).
         filter_status (str): Status to filter reports by (e.g., "open", "closed", "flagged").
-        form (AddReport, optional): Pre-bound AddReport form instance. A new one is created if not provided.
+        form (AddReport): The AddReport form instance to display.
 
     Returns:
         str: Rendered HTML page for managing reports.
     """
-    form = form or AddReport()
-    reports = db.get_all_reports_with_details()
-
-    # Apply filtering based on report status
-    if filter_status == "flagged":
-        reports = [r for r in reports if r["flagged_by_professional"]]
-    elif filter_status == "open":
-        reports = [r for r in reports if r["status"] in ("open", "grieve", "done")]
-    elif filter_status == "closed":
-        reports = [r for r in reports if r["status"] == "closed"]
+    form.appointment_id.choices = get_cached_appointment_choices(cache, db)
+    reports = db.get_reports_filtered(filter_status)
 
     # Render the management page with the filtered reports and form
     return render_template(
@@ -134,15 +169,14 @@ def edit_report(report_id):
         ))
 
         # Invalidate all report management views (for each tab)
-        for s in ["all", "open", "closed", "flagged"]:
-            cache.delete_memoized(_get_manage_reports_cached, current_user.user_type, s)
+        bump_cache_rev(cache, REPORTS_REV_KEY)
 
         # Invalidate user dashboard cache if consumer ID is present
         if report.get("consumer_id"):
             cache.delete_memoized(_get_user_reports_cached, report["consumer_id"], "dashboard")
 
-        # Invalidate individual report view cache
-        cache.delete_memoized(_get_report_view_cached, report_id, "my")
+        # Invalidate individual report view caches
+        delete_memoized_many(cache, *_report_view_calls(report_id))
 
         # Log the update action
         db.log_admin_action(f"Admin '{current_user.user_name}' edited report #{report_id}", current_user.user_name)
@@ -181,25 +215,16 @@ def delete_report(report_id):
     Returns:
         Response: Redirects to the manage reports page with a flash status.
     """
-    # Retrieve the report to verify existence
-    report = db.get_report_by_id(report_id)
-    if not report:
-        return flash_and_redirect("Report not found.", "warning", "bp-admin.manage_reports")
-
     try:
-        # Attempt to delete the report
-        db.delete_report(report_id)
+        # Attempt to delete the report; False means it did not exist
+        if not db.delete_report(report_id):
+            return flash_and_redirect("Report not found.", "warning", "bp-admin.manage_reports")
 
         # Invalidate all cached report lists (for different status filters)
-        for s in ["all", "open", "closed", "flagged"]:
-            cache.delete_memoized(_get_manage_reports_cached, current_user.user_type, s)
-
-        # Invalidate user report dashboard cache if consumer ID is known
-        if report.get("consumer_id"):
-            cache.delete_memoized(_get_user_reports_cached, report["consumer_id"], "dashboard")
+        bump_cache_rev(cache, REPORTS_REV_KEY)
 
-        # Invalidate the single report view cache
-        cache.delete_memoized(_get_report_view_cached, report_id, "my")
+        # Invalidate the single report view caches
+        delete_memoized_many(cache, *_report_view_calls(report_id))
 
         flash("Report deleted successfully.", "success")
     except Exception as e:
@@ -212,6 +237,7 @@ def delete_report(report_id):
 @bp_admin.route("/view_report/<int:report_id>")
 @login_required
 @role_required("admin_appoint", "admin_super")
+@private_cache(0)  # Revalidate every time: edits redirect straight back here
 def view_report(report_id):
     """
     Admin route to view the details of a specific report.
@@ -275,24 +301,21 @@ def _get_user_reports_cached(user_id, return_to):
     Returns:
         str: Rendered HTML page listing the user's reports.
     """
-    user = db.get_user_by_id(user_id)
+    user = get_request_user(db, user_id)
     if not user:
         return flash_and_redirect("User not found.", "danger", "bp-admin.manage_users")
 
-    # Gather all appointments and fetch their corresponding reports
-    appointments = db.get_appointments_by_user(user_id)
-    reports = [
-        db.get_report_by_appointment(a["appointment_id"])
-        for a in appointments
-        if db.get_report_by_appointment(a["appointment_id"])
-    ]
+    # Gather all appointments and fetch their corresponding reports in one query
+    appointment_ids = [a["appointment_id"] for a in db.get_appointments_by_user(user_id)]
+    reports_by_appointment = db.get_reports_by_appointment_ids(appointment_ids)
+    reports = [reports_by_appointment[i] for i in appointment_ids if i in reports_by_appointment]
 
     return render_template(
         "reports/view_user_reports.html",
         reports=reports,
         context=make_context(
-            f"Reports for {user[4]}",  # user_name
-            f"Reports - {user[5]} {user[6]}"  # fname + lname
+            f"Reports for {user['user_name']}",
+            f"Reports - {user['fname']} {user['lname']}"
         ),
         user=user,
         return_to=return_to
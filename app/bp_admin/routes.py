@@ -1,14 +1,18 @@
-from flask import render_template
-from flask_login import login_required
+from flask import render_template, request
+from flask_login import login_required, current_user
 from app import cache
 from . import bp_admin
 from models.database import db
-from .utils_admin import role_required
+from .utils_admin import role_required, private_cache
+
+# Number of log entries shown per page of the admin logs
+LOGS_PER_PAGE = 200
 
 
 @bp_admin.route("/dashboard")
 @login_required
 @role_required("admin_user", "admin_super", "admin_appoint")
+@private_cache(60)
 def dashboard():
     """
     Admin route for the main dashboard.
@@ -18,14 +22,20 @@ def dashboard():
     Returns:
         str: Rendered HTML for the dashboard.
     """
-    return _get_dashboard_cached()
+    return _get_dashboard_cached(current_user.id)
 
 
-@cache.cached(timeout=60)
-def _get_dashboard_cached():
+@cache.memoize(timeout=60)
+def _get_dashboard_cached(user_id):
     """
     Cached helper to render the admin dashboard.
 
+    The page greets the admin and lists the controls their role allows, so it is
+    cached per user rather than under the shared URL.
+
+    Args:
+        user_id (int): ID of the logged-in admin.
+
     Returns:
         str: Rendered HTML for the dashboard view.
     """
@@ -35,6 +45,7 @@ def _get_dashboard_cached():
 @bp_admin.route("/admin_logs")
 @login_required
 @role_required("admin_super")
+@private_cache(60)
 def admin_logs():
     """
     Superadmin route to view administrative action logs.
@@ -42,22 +53,33 @@ def admin_logs():
     Returns:
         str: Rendered HTML page showing a list of admin actions.
     """
-    return _get_admin_logs_cached()
+    page = max(request.args.get("page", 0, type=int), 0)  # Zero-based page index
+    return _get_admin_logs_cached(page)
 
 
-@cache.cached(timeout=60)
-def _get_admin_logs_cached():
+@cache.memoize(timeout=60)
+def _get_admin_logs_cached(page):
     """
-    Cached helper to fetch and render the admin logs page.
+    Cached helper to fetch and render one page of the admin logs.
+
+    Retrieves the newest user actions from the salon_log table, LOGS_PER_PAGE at a time.
 
-    Retrieves user actions from the salon_log table.
+    Args:
+        page (int): Zero-based page index.
 
     Returns:
         str: Rendered HTML page with a list of admin logs.
     """
-    logs = db.fetch("""
-        SELECT user_action, action_by, action_time 
-        FROM salon_log 
+    # Fetch one extra row to know whether an older page exists
+    rows = db.fetch("""
+        SELECT user_action, action_by, action_time
+        FROM salon_log
         ORDER BY action_time DESC
-    """)
-    return render_template("admin_logs.html", logs=logs)
+        LIMIT %s OFFSET %s
+    """, (LOGS_PER_PAGE + 1, page * LOGS_PER_PAGE))
+    return render_template(
+        "admin_logs.html",
+        logs=rows[:LOGS_PER_PAGE],
+        page=page,
+        has_next=len(rows) > LOGS_PER_PAGE
+    )
@@ -2,17 +2,17 @@
 
 from flask import render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
-from werkzeug.utils import secure_filename
 import os
-import sys
+from collections import namedtuple
 from app import cache
 from . import bp_admin
 from .forms import EditUserForm, AddAdminForm
 from app.bp_auth.forms import RegisterForm
-from app.bp_auth.routes import allowed_file
-from app.bp_auth.user import User
+from app.bp_auth.user import User, invalidate_user_lookup
 from .utils_admin import (
-    role_required, flash_and_redirect, invalidate_user_cache, make_context
+    role_required, flash_and_redirect, invalidate_user_cache, make_context,
+    get_cache_rev, USERS_REV_KEY, delete_memoized_many, save_upload_async,
+    get_request_user, flashes_pending, empty_form, private_cache, allowed_file
 )
 from models.database import db
 from .appointments import _get_user_appointments_cached
@@ -20,6 +20,42 @@ from .reports import _get_user_reports_cached
 from .utils_user_cache import get_view_user_cached
 
 
+# Manage Users tabs a profile view can return to; each caches its own profile page
+RETURN_TYPES = ("all", "clients", "professionals", "admins", "warned", "deactivated")
+
+# Compact record for one row of the Manage Users listing
+UserRow = namedtuple("UserRow", "id username user_type active warning_count")
+
+# WHERE clause and parameters for each Manage Users filter
+USER_FILTER_SQL = {
+    "all": ("TRUE", ()),
+    "none": ("FALSE", ()),
+    "clients": ("user_type = $1", ("client",)),
+    "professionals": ("user_type = $1", ("professional",)),
+    "admins": ("user_type LIKE $1", ("admin_%",)),
+    "warned": ("warning_count > $1", (0,)),
+    "deactivated": ("active = $1", (0,))
+}
+
+# Prepare one statement per filter so each plan is reused on every pooled connection
+for _filter, (_condition, _) in USER_FILTER_SQL.items():
+    db.prepare(f"admin_users_{_filter}", f"""
+        SELECT user_id, user_name, user_type, active, warning_count
+        FROM salon_user
+        WHERE {_condition}
+    """)
+
+
+def get_register_form():
+    """
+    Return the blank "Add User" form, built once and shared between requests.
+
+    Returns:
+        EmptyFormView: The shared form, rendering a fresh CSRF token per request.
+    """
+    return empty_form(RegisterForm)
+
+
 @bp_admin.route("/manage_users")
 @login_required
 @role_required("admin_user", "admin_super")
@@ -34,63 +70,39 @@ def manage_users():
         str: Rendered HTML page listing filtered users.
     """
     filter_type = request.args.get("type", "all")  # Default to showing all users
-    return _get_manage_users_cached(current_user.user_type, filter_type)
+    if filter_type not in RETURN_TYPES:
+        filter_type = "all"
+    return _get_manage_users_cached(get_cache_rev(cache, USERS_REV_KEY), current_user.user_type, filter_type)
 
 
 
 @cache.memoize(timeout=60)
-def _get_manage_users_cached(user_type, filter_type):
+def _get_manage_users_cached(rev, user_type, filter_type):
     """
     Cached helper to render the Manage Users page with optional filtering.
 
     Args:
+        rev (int): Current users generation; bumping it invalidates every cached filter.
         user_type (str): The type of the current admin (used to restrict access to certain filters).
         filter_type (str): The user category to filter by (e.g., 'clients', 'admins').
 
     Returns:
         str: Rendered HTML of the user management page with the appropriate filtered users.
     """
-    form = RegisterForm()
-
-    # Helper to convert DB row tuples to dictionaries for rendering
-    def format_users(rows):
-        return [
-            {
-                "id": r[0],
-                "username": r[1],
-                "user_type": r[2],
-                "active": r[3],
-                "warning_count": r[4]
-            }
-            for r in rows
-        ]
-
-    # SQL conditions based on filter type
-    queries = {
-        "clients": "user_type = 'client'",
-        "professionals": "user_type = 'professional'",
-        "admins": "user_type LIKE 'admin_%'",
-        "warned": "warning_count > 0",
-        "deactivated": "active = 0"
-    }
-
-    # Default to no filter if unknown type
-    condition = queries.get(filter_type, "1=1")
-
-    # Prevent non-super admins from accessing admin list
+    form = get_register_form()
+
+    # Hide the admin list from non-super admins; unknown filters show everyone
     if filter_type == "admins" and user_type != "admin_super":
-        condition = "1=0"
+        filter_type = "none"
+    elif filter_type not in USER_FILTER_SQL:
+        filter_type = "all"
 
-    # Fetch user rows from the database based on the condition
-    rows = db.fetch(f"""
-        SELECT user_id, user_name, user_type, active, warning_count
-        FROM salon_user
-        WHERE {condition}
-    """)
+    # Fetch user rows through the prepared statement for this filter
+    rows = db.fetch_prepared(f"admin_users_{filter_type}", USER_FILTER_SQL[filter_type][1])
 
     # Render the user management page with the filtered user list and registration form
     context = make_context("Manage Users")
-    return render_template("users/manage_users.html", users=format_users(rows), form=form, context=context)
+    return render_template("users/manage_users.html", users=list(map(UserRow._make, rows)), form=form, context=context)
 
 
 
@@ -141,10 +153,7 @@ def add_user():
     # Handle image upload or set default
     image_filename = "default.jpeg"
     if image_file and allowed_file(image_file.filename):
-        filename = secure_filename(image_file.filename)
-        image_path = os.path.join("app", "static", "uploads", filename)
-        image_file.save(image_path)
-        image_filename = filename
+        image_filename = save_upload_async(image_file, os.path.join("app", "static", "uploads"))
 
     try:
         # Prepare user data dictionary
@@ -167,7 +176,7 @@ def add_user():
         User.create(new_user)
 
         # Invalidate cache so new user appears in list
-        invalidate_user_cache(cache, current_user.user_type)
+        invalidate_user_cache(cache)
 
         flash("User successfully added.", "success")
     except Exception as e:
@@ -180,6 +189,7 @@ def add_user():
 
 @bp_admin.route("/view_user/<int:user_id>")
 @login_required
+@private_cache(0)  # Revalidate every time: edits redirect straight back here
 def view_user(user_id):
     """
     Admin route to view details of a specific user.
@@ -192,6 +202,11 @@ def view_user(user_id):
     """
     # Used to determine what section the admin is returning from (e.g., 'all', 'clients', etc.)
     return_type = request.args.get("return_type", "all")
+    if return_type not in RETURN_TYPES:
+        return_type = "all"  # Keep the memoized variants to the known tabs
+    if flashes_pending():
+        # The page would show (and cache) this admin's messages: render it uncached
+        return get_view_user_cached.uncached(user_id, return_type)
     return get_view_user_cached(user_id, return_type)
 
 
@@ -214,7 +229,7 @@ def edit_user(user_id):
         Response: Renders the edit form or redirects on success.
     """
     # Fetch user data by ID
-    user_data = db.get_user_by_id(user_id)
+    user_data = get_request_user(db, user_id)
     if not user_data:
         return flash_and_redirect("User not found.", "danger", "bp-admin.manage_users")
 
@@ -234,13 +249,8 @@ def edit_user(user_id):
                 pay_rate_val = None
 
             # Update user details in the database
-            db.execute("""
-                UPDATE salon_user SET
-                    user_type = %s, user_name = %s, fname = %s, lname = %s,
-                    email = %s, phone_number = %s, address = %s, age = %s,
-                    specialty = %s, pay_rate = %s
-                WHERE user_id = %s
-            """, (
+            db.update_user_details(
+                user_id,
                 form.user_type.data,
                 form.user_name.data,
                 form.fname.data,
@@ -250,19 +260,13 @@ def edit_user(user_id):
                 form.address.data,
                 form.age.data,
                 form.specialty.data if form.user_type.data == "professional" else None,
-                pay_rate_val,
-                user_id
-            ))
+                pay_rate_val
+            )
 
             # Invalidate user cache globally and per return type
-            invalidate_user_cache(cache, current_user.user_type)
-
-            for return_type in ["all", "clients", "professionals", "admins", "warned", "deactivated"]:
-                try:
-                    view_user_func = sys.modules["app.bp_admin.utils_user_cache"].get_view_user_cached
-                    cache.delete_memoized(view_user_func, user_id, return_type)
-                except Exception as ce:
-                    flash(f"Warning: failed to clear cache for return_type '{return_type}': {ce}", "warning")
+            invalidate_user_cache(cache)
+            invalidate_user_lookup(user_id, user_data["user_name"], form.user_name.data)
+            delete_memoized_many(cache, *((get_view_user_cached, user_id, rt) for rt in RETURN_TYPES))
 
             flash("User updated successfully.", "success")
             return redirect(url_for("bp-admin.view_user", user_id=user_id))
@@ -292,31 +296,23 @@ def delete_user(user_id):
         Response: Redirects to the user management page with a status flash message.
     """
     try:
-        # Delete the user from the database
+        # Delete the user from the database; the row is read first for its cached username
+        user = get_request_user(db, user_id)
         db.delete_user(user_id)
 
         # Invalidate main user cache
-        invalidate_user_cache(cache, current_user.user_type)
-
-        # Invalidate cached profile views across user filters
-        for return_type in ["all", "clients", "professionals", "admins", "warned", "deactivated"]:
-            try:
-                view_user_func = sys.modules["app.bp_admin.utils_user_cache"].get_view_user_cached
-                cache.delete_memoized(view_user_func, user_id, return_type)
-            except Exception as ce:
-                flash(f"Warning: failed to clear view cache '{return_type}': {ce}", "warning")
-
-        # Invalidate cached appointments
-        try:
-            cache.delete_memoized(_get_user_appointments_cached, user_id)
-        except Exception as ce:
-            flash(f"Warning: failed to clear appointment cache: {ce}", "warning")
-
-        # Invalidate cached reports
-        try:
-            cache.delete_memoized(_get_user_reports_cached, user_id, "dashboard")
-        except Exception as ce:
-            flash(f"Warning: failed to clear report cache: {ce}", "warning")
+        invalidate_user_cache(cache)
+        if user:
+            invalidate_user_lookup(user_id, user["user_name"])
+
+        # Invalidate cached profile views across user filters, plus the user's
+        # appointments and reports pages, in one batch
+        delete_memoized_many(
+            cache,
+            *((get_view_user_cached, user_id, return_type) for return_type in RETURN_TYPES),
+            (_get_user_appointments_cached, user_id),
+            (_get_user_reports_cached, user_id, "dashboard")
+        )
 
         flash("User deleted successfully.", "success")
 
@@ -347,7 +343,7 @@ def warn_user(user_id):
         Response: Renders the warning form or redirects with a flash message after issuing a warning.
     """
     # Fetch the user to ensure they exist
-    user = db.get_user_by_id(user_id)
+    user = get_request_user(db, user_id)
     if not user:
         return flash_and_redirect("User not found.", "danger", "bp-admin.manage_users")
 
@@ -357,21 +353,19 @@ def warn_user(user_id):
         if not warning_text:
             flash("Warning text cannot be empty.", "danger")
         else:
-            # Store warning message and increment count
-            db.set_user_warning(user_id, warning_text)
-            new_count = db.get_warning_count(user_id) + 1
-            db.set_warning_count(user_id, new_count)
+            # Store warning message and increment count; the account is
+            # auto-deactivated in the same UPDATE when the count reaches 3
+            new_count, _ = db.bump_warning_count(user_id, warning_text)
 
-            # Auto-deactivate account if warning count reaches 3
             if new_count >= 3:
-                db.set_user_active_status(user_id, False)
                 flash("User has reached 3 warnings. Account automatically deactivated.", "danger")
             else:
                 flash("Warning issued successfully.", "success")
 
-            # Invalidate relevant caches
-            invalidate_user_cache(cache, current_user.user_type)
-            cache.delete_memoized(get_view_user_cached, user_id, "all")
+            # Invalidate relevant caches (the warning may have deactivated the account)
+            invalidate_user_cache(cache)
+            invalidate_user_lookup(user_id, user["user_name"])
+            delete_memoized_many(cache, *((get_view_user_cached, user_id, rt) for rt in RETURN_TYPES))
 
             return redirect(url_for("bp-admin.view_user", user_id=user_id))
 
@@ -397,20 +391,23 @@ def toggle_user_active(user_id):
         Response: Redirects to the user's profile page with a status flash message.
     """
     # Retrieve user data to confirm existence
-    user = db.get_user_by_id(user_id)
+    user = get_request_user(db, user_id)
     if not user:
         return flash_and_redirect("User not found.", "danger", "bp-admin.manage_users")
 
-    # Toggle the user's active status (user[1] is expected to be the 'active' field)
-    new_status = not user[1]
-    db.execute("UPDATE salon_user SET active = %s WHERE user_id = %s", (int(new_status), user_id))
+    # Toggle the user's active status
+    db.toggle_user_active(user_id)
+    return_type = request.args.get("return_type", "all")
+    if return_type not in RETURN_TYPES:
+        return_type = "all"
 
-    # Clear user cache entries
-    invalidate_user_cache(cache, current_user.user_type)
-    cache.delete_memoized(get_view_user_cached, user_id, "all")
+    # Clear user cache entries; the cached row would keep a deactivated user logged in
+    invalidate_user_cache(cache)
+    invalidate_user_lookup(user_id, user["user_name"])
+    delete_memoized_many(cache, *((get_view_user_cached, user_id, rt) for rt in RETURN_TYPES))
 
     flash("User activation status updated.", "success")
-    return redirect(url_for("bp-admin.view_user", user_id=user_id, return_type=request.args.get("return_type", "all")))
+    return redirect(url_for("bp-admin.view_user", user_id=user_id, return_type=return_type))
 
 
 
@@ -451,8 +448,7 @@ def add_admin():
             User.create(new_admin_data)
 
             # Invalidate user management cache for all filter types
-            for filter_type in ["all", "clients", "professionals", "admins", "warned", "deactivated"]:
-                cache.delete_memoized(_get_manage_users_cached, current_user.user_type, filter_type)
+            invalidate_user_cache(cache)
 
             # Log the admin creation action
             db.log_admin_action(
@@ -1,9 +1,118 @@
 # utils_admin.py (helper module for admin blueprint)
 
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import flash, redirect, url_for
-from functools import wraps
+from types import MappingProxyType
+from flask import flash, redirect, url_for, request, make_response, g, session, has_request_context, current_app
+from functools import lru_cache, wraps
 from flask_login import current_user
+from flask_wtf.csrf import generate_csrf
+from markupsafe import Markup
+from wtforms import SelectField
+from cachelib import RedisCache as CachelibRedisCache
+
+
+# Worker threads running independent queries next to the request's own, through db.submit
+# (which only hands them a spare pooled connection). Cache access needs the app context.
+db_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="admin-db")
+
+# Worker threads that write uploaded images to disk after the request has read them
+upload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="admin-upload")
+
+# Paths upload_executor is writing, so concurrent identical uploads are written once
+_pending_uploads = set()
+_pending_uploads_lock = threading.Lock()
+
+# Allowed file extensions for uploads
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+# Chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Static paths of content-addressed uploads (see save_upload), which never change
+UPLOAD_NAME_PATTERN = re.compile(r"uploads/[0-9a-f]{32}\.(?:png|jpe?g|gif)")
+
+# Bookable time slots, shared by the appointment forms as their static slot choices
+SLOT_START_HOURS = list(range(1, 12)) + list(range(13, 22))
+ALL_SLOTS = tuple((f"{h}-{h+1}", f"{h}-{h+1}") for h in SLOT_START_HOURS)
+# Bookable venues; the admin appointment form offers every venue except the common room
+VENUE_CHOICES = (
+    ("room1", "Room 1"),
+    ("room2", "Room 2"),
+    ("chair1", "Chair 1"),
+    ("chair2", "Chair 2"),
+    ("cmn_room", "Common Room")
+)
+ADMIN_VENUE_CHOICES = VENUE_CHOICES[:4]
+# Longest booking (in hours) per slot: morning slots end by 12, afternoon slots by 22
+SLOT_MAX_DURATION = {f"{h}-{h+1}": (12 if h < 12 else 22) - h for h in SLOT_START_HOURS}
+
+# Cache keys for the client/provider dropdowns, which change only when users are added or edited
+CLIENT_CHOICES_KEY = "choices:clients"
+PROVIDER_CHOICES_KEY = "choices:providers"
+BOOKING_CHOICES_KEY = "choices:booking"
+MEMBER_CHOICES_KEY = "choices:members"
+APPOINTMENT_CHOICES_KEY = "choices:appointments"
+CHOICES_TIMEOUT = 600
+
+# Generation counters: list views embed the current value in their cache key,
+# so bumping it once invalidates every filter tab at the same time
+APPOINTMENTS_REV_KEY = "rev:appointments"
+REPORTS_REV_KEY = "rev:reports"
+USERS_REV_KEY = "rev:users"
+# Every seeded generation (a millisecond timestamp) is above this; smaller values were
+# created by INCR on a missing key
+REV_SEED_FLOOR = 10 ** 12
+# Per-appointment counters expire when idle, so deleted appointments leave nothing behind
+APPOINTMENT_REV_TIMEOUT = 86400
+
+
+def current_user_type():
+    """
+    Return the logged-in user's type, read through the current_user proxy once per request.
+
+    Returns:
+        str|None: The user type, or None for anonymous users.
+    """
+    if "_user_type" not in g:
+        g._user_type = getattr(current_user, "user_type", None)
+    return g._user_type
+
+
+def get_request_user(db, user_id):
+    """
+    Look up a user row by ID, querying the database at most once per request.
+
+    Args:
+        db (Database): The database instance.
+        user_id (int): ID of the user to fetch.
+
+    Returns:
+        Row|None: The user row, or None if no such user exists.
+    """
+    users = g.setdefault("_users", {})
+    if user_id not in users:
+        users[user_id] = db.get_user_by_id(user_id)
+    return users[user_id]
+
+
+def flashes_pending():
+    """
+    Tell whether flash messages are waiting to be shown on the next rendered page.
+
+    base.html displays them, so a page rendered now must neither be cached nor be
+    answered from the cache. The session is only read, so the messages stay pending.
+
+    Returns:
+        bool: True if the session holds flash messages (never outside a request).
+    """
+    return has_request_context() and bool(session.get("_flashes"))
 
 
 def role_required(*roles):
@@ -16,60 +125,528 @@ def role_required(*roles):
     Returns:
         function: A wrapped view function that checks the user's role.
     """
+    allowed = frozenset(roles)  # Built once per decorated view, O(1) membership test
+
     def wrapper(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            if current_user.user_type not in roles:
-                flash("Access Denied.", "danger")
-                return redirect(url_for("bp-main.home"))
-            return f(*args, **kwargs)
+            if current_user_type() in allowed:
+                return f(*args, **kwargs)
+            flash("Access Denied.", "danger")
+            return redirect(url_for("bp-main.home"))
         return decorated_function
     return wrapper
 
 
-def populate_appointment_form_choices(form, db):
+class LazySelectField(SelectField):
+    """
+    SelectField whose choices are produced by a loader on first access.
+
+    The view assigns `field.loader`; the query (or cache lookup) then only runs if the
+    form is actually rendered or validated.
+    """
+
+    def __init__(self, label=None, validators=None, loader=None, **kwargs):
+        self.loader = loader
+        self._choices = None
+        super().__init__(label, validators, **kwargs)
+
+    @property
+    def choices(self):
+        if self._choices is None and self.loader is not None:
+            self._choices = list(self.loader())
+        return self._choices
+
+    @choices.setter
+    def choices(self, value):
+        self._choices = value
+
+
+def get_cached_client_choices(cache, db):
+    """
+    Return the client (user_id, full name) choices, served from the cache when possible.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        db (Database): Database instance used on a cache miss.
+
+    Returns:
+        list: A list of (user_id, full name) tuples.
+    """
+    choices = cache.get(CLIENT_CHOICES_KEY)
+    if choices is None:
+        choices = db.get_client_choices()
+        cache.set(CLIENT_CHOICES_KEY, choices, timeout=CHOICES_TIMEOUT)
+    return choices
+
+
+def get_cached_provider_choices(cache, db):
+    """
+    Return the professional choices together with their pay rates, served from the cache when possible.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        db (Database): Database instance used on a cache miss.
+
+    Returns:
+        tuple: A list of (user_id, full name) tuples and a {user_id: pay_rate} dict.
+    """
+    cached = cache.get(PROVIDER_CHOICES_KEY)
+    if cached is None:
+        choices = db.get_provider_choices()
+        pay_rates = db.get_pay_rates_for([pid for pid, _ in choices])
+        cached = (choices, pay_rates)
+        cache.set(PROVIDER_CHOICES_KEY, cached, timeout=CHOICES_TIMEOUT)
+    return cached
+
+
+def get_cached_booking_choices(cache, db):
+    """
+    Return the professional dropdown of the client booking form with pay rates, served
+    from the cache when possible.
+
+    The choices list, placeholder included, is built once per cache entry rather than
+    on every render.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        db (Database): Database instance used on a cache miss.
+
+    Returns:
+        tuple: A list of (user_id, label) tuples and a {user_id: pay_rate} dict.
+    """
+    cached = cache.get(BOOKING_CHOICES_KEY)
+    if cached is None:
+        professionals = db.get_professionals_with_pay_rates()
+        choices = [(-1, "Select a professional")] + [
+            (p["user_id"], f"{p['fname']} {p['lname']} [id:{p['user_id']}]") for p in professionals
+        ]
+        pay_rates = {p["user_id"]: p["pay_rate"] for p in professionals}
+        cached = (choices, pay_rates)
+        cache.set(BOOKING_CHOICES_KEY, cached, timeout=CHOICES_TIMEOUT)
+    return cached
+
+
+def get_cached_member_choices(cache, db):
+    """
+    Return the Group Chat member dropdown (every user, placeholder first), served from
+    the cache when possible.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        db (Database): Database instance used on a cache miss.
+
+    Returns:
+        list: A list of (user_name, label) tuples.
+    """
+    choices = cache.get(MEMBER_CHOICES_KEY)
+    if choices is None:
+        choices = [(None, "Select a member")] + [
+            (u["user_name"], f"{u['fname']} {u['lname']} [id:{u['user_id']}]")
+            for u in db.get_all_user_with_names()
+        ]
+        cache.set(MEMBER_CHOICES_KEY, choices, timeout=CHOICES_TIMEOUT)
+    return choices
+
+
+def get_cached_appointment_choices(cache, db):
+    """
+    Return the appointment (appointment_id, label) choices, served from the cache when possible.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        db (Database): Database instance used on a cache miss.
+
+    Returns:
+        list: A list of (appointment_id, label) tuples.
+    """
+    choices = cache.get(APPOINTMENT_CHOICES_KEY)
+    if choices is None:
+        choices = db.get_appointment_choices()
+        cache.set(APPOINTMENT_CHOICES_KEY, choices, timeout=60)
+    return choices
+
+
+def invalidate_choice_cache(cache):
+    """
+    Clear the cached client/provider/member choices and pay rates after users change.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+    """
+    delete_keys(cache, CLIENT_CHOICES_KEY, PROVIDER_CHOICES_KEY, BOOKING_CHOICES_KEY, MEMBER_CHOICES_KEY)
+
+
+def populate_appointment_form_choices(form, db, cache):
     """
-    Populate choices for dropdown fields in the appointment form.
+    Populate the user-dependent dropdown choices of the appointment form.
+
+    Venue and slot choices are static and set on the form class. The user choices are
+    cleared by invalidate_choice_cache whenever a user is created or edited.
 
     Args:
         form (FlaskForm): The appointment form instance.
         db (Database): Database instance for fetching user choices.
+        cache (Cache): Flask-Caching instance holding the user choices.
+
+    Returns:
+        dict: Pay rates of the listed professionals, keyed by user_id.
+    """
+    # Both lists come back from one MGET; only a miss falls through to the database
+    clients, providers = cache.get_many(CLIENT_CHOICES_KEY, PROVIDER_CHOICES_KEY)
+    if clients is None:
+        clients = get_cached_client_choices(cache, db)
+    if providers is None:
+        providers = get_cached_provider_choices(cache, db)
+    form.client_id.choices = clients
+    form.provider_id.choices, pay_rates = providers
+    return pay_rates
+
+
+def appointment_rev_key(appt_id):
+    """
+    Build the key of the generation counter of one appointment's cached pages.
+
+    Args:
+        appt_id (int): ID of the appointment.
+
+    Returns:
+        str: The counter key.
+    """
+    return f"rev:appt:{appt_id}"
+
+
+def cache_page(cache, key, render, timeout=60):
+    """
+    Return the page cached under an explicit key, rendering and caching it on a miss.
+
+    Only rendered HTML (str) is cached, so redirects and their flash messages are never replayed.
+    While flash messages are pending (e.g. form errors after a redirect) the page is rendered
+    uncached, so they are shown now and never stored in the page served to other admins.
+    Keys embed the generation counters the page depends on (see get_cache_rev), so
+    invalidating is a counter bump and never needs to track the keys in use.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        key (str): Cache key of the page.
+        render (callable): Builds the page on a miss.
+        timeout (int): Seconds to keep the page.
+
+    Returns:
+        str|Response: The rendered page, or the response returned by render.
+    """
+    if flashes_pending():
+        return render()
+
+    page = cache.get(key)
+    if page is not None:
+        return page
+
+    page = render()
+    if isinstance(page, str):
+        cache.set(key, page, timeout=timeout)
+    return page
+
+
+def delete_keys(cache, *keys):
+    """
+    Delete several cache keys, including the ones after a key that is already gone.
+
+    Cache.delete_many stops at the first key it fails to delete (e.g. an expired page)
+    unless the backend ignores errors, leaving every later key stale.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        *keys (str): The keys to delete.
+    """
+    backend = cache.cache
+    if isinstance(backend, CachelibRedisCache):
+        # One DEL for all keys; Redis simply skips the missing ones
+        CachelibRedisCache.delete_many(backend, *keys)
+    else:
+        for key in keys:
+            backend.delete(key)
+
+
+def get_cache_rev(cache, rev_key, timeout=0):
+    """
+    Return the current value of a generation counter.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        rev_key (str): Key of the counter (e.g. REPORTS_REV_KEY).
+        timeout (int): Seconds to keep a newly seeded counter (0 = forever). Expiry is
+            safe: the reseeded counter starts a generation no cached page uses.
+
+    Returns:
+        int: The current generation.
+    """
+    rev = cache.get(rev_key)
+    if rev is None:
+        # Seed with a timestamp so a lost counter never matches keys of an older generation
+        rev = _rev_seed()
+        cache.set(rev_key, rev, timeout=timeout)
+    return rev
+
+
+def _rev_seed():
+    """
+    Return a fresh generation number: the current time in milliseconds.
+
+    Returns:
+        int: A value above every generation handed out before.
+    """
+    return int(time.time() * 1000)
+
+
+def bump_cache_rev(cache, rev_key, timeout=0):
+    """
+    Advance a generation counter, invalidating every cached view keyed on it in one call.
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        rev_key (str): Key of the counter (e.g. REPORTS_REV_KEY).
+        timeout (int): Seconds to keep the counter if it has to be seeded (0 = forever).
+    """
+    # INCR on a missing (evicted) counter would restart it at 1, with the default TTL,
+    # and could bring back an old generation: seed it like get_cache_rev first
+    seed = _rev_seed()
+    cache.add(rev_key, seed, timeout=timeout)
+    rev = cache.cache.inc(rev_key)  # Atomic INCR on Redis
+    if rev is None or rev < REV_SEED_FLOOR:
+        # The counter vanished between add and inc (or the backend kept an expired entry)
+        cache.set(rev_key, seed + 1, timeout=timeout)
+
+
+def delete_memoized_many(cache, *calls):
+    """
+    Delete several memoized results with a single delete_keys call (one Redis DEL).
+
+    Args:
+        cache (Cache): Flask-Caching instance.
+        *calls (tuple): (memoized_function, *args) tuples, as would be passed to delete_memoized.
     """
-    form.venue.choices = [
-        ("room1", "Room 1"), ("room2", "Room 2"),
-        ("chair1", "Chair 1"), ("chair2", "Chair 2")
-    ]
-    form.slot.choices = [
-        (f"{i}-{i+1}", f"{i}-{i+1}") for i in list(range(1, 12)) + list(range(13, 22))
-    ]
-    form.client_id.choices = db.get_client_choices()
-    form.provider_id.choices = db.get_provider_choices()
+    keys = [func.make_cache_key(func.uncached, *args) for func, *args in calls]
+    if keys:
+        delete_keys(cache, *keys)
 
 
-def invalidate_appointment_cache(cache, user_type):
+def invalidate_appointment_cache(cache, appt_id=None):
     """
-    Clear cached appointment views for an admin user by appointment status.
+    Clear cached admin appointment pages affected by a change.
+
+    List pages are always cleared, for every admin type and status tab, by bumping the
+    appointments generation; the detail pages are cleared only for the changed appointment.
 
     Args:
         cache (Cache): Flask-Caching instance.
-        user_type (str): The admin's user type used for cache scoping.
+        appt_id (int, optional): ID of the created, edited or deleted appointment.
     """
-    from app.bp_admin.appointments import _get_manage_appointments_cached
-    for status in ["all", "requested", "accepted", "cancelled"]:
-        cache.delete_memoized(_get_manage_appointments_cached, user_type, status)
+    bump_cache_rev(cache, APPOINTMENTS_REV_KEY)
+    # The appointment dropdown lists every appointment
+    cache.delete(APPOINTMENT_CHOICES_KEY)
+    if appt_id is not None:
+        bump_cache_rev(cache, appointment_rev_key(appt_id), timeout=APPOINTMENT_REV_TIMEOUT)
 
 
-def invalidate_user_cache(cache, user_type):
+def invalidate_user_cache(cache):
     """
-    Clear cached user views for an admin user by filter type.
+    Clear the cached user lists, for every admin type and filter tab.
 
     Args:
         cache (Cache): Flask-Caching instance.
-        user_type (str): The admin's user type used for cache scoping.
     """
-    from app.bp_admin.users import _get_manage_users_cached
-    for filter_type in ["all", "clients", "professionals", "admins", "warned", "deactivated"]:
-        cache.delete_memoized(_get_manage_users_cached, user_type, filter_type)
+    bump_cache_rev(cache, USERS_REV_KEY)
+    invalidate_choice_cache(cache)  # Names, types and pay rates feed the appointment dropdowns
+
+
+def allowed_file(filename):
+    """
+    Check if the uploaded file has an allowed extension.
+
+    Args:
+        filename (str): The name of the uploaded file.
+
+    Returns:
+        bool: True if the file has a valid extension, False otherwise.
+    """
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def _upload_name(digest, original_name):
+    """
+    Build the content-addressed filename of an upload.
+
+    Args:
+        digest (str): Hex digest of the file content.
+        original_name (str): The client's filename, only used for its extension.
+
+    Returns:
+        str: e.g. "3f2a...9c.png".
+    """
+    return f"{digest}.{original_name.rsplit('.', 1)[1].lower()}"
+
+
+def _write_atomically(path, write):
+    """
+    Write a file through a temporary file in the same folder, then rename it into place,
+    so the image is never served half-written.
+
+    Args:
+        path (str): Destination path.
+        write (callable): Called with the open temporary file to fill it.
+    """
+    tmp = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".", delete=False)
+    try:
+        with tmp:
+            write(tmp)
+        os.chmod(tmp.name, 0o644)  # Temporary files are created owner-only
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+def _write_upload(data, path):
+    """
+    Write an uploaded file's bytes to disk (runs on upload_executor).
+
+    Args:
+        data (bytes): The file content.
+        path (str): Destination path.
+    """
+    _write_atomically(path, lambda f: f.write(data))
+
+
+def _upload_done(future, path, logger):
+    """
+    Release a finished background upload and log its failure, if any.
+
+    Args:
+        future (Future): The upload_executor task that wrote the file.
+        path (str): Destination path of the upload.
+        logger (Logger): The app logger, captured by the request (there is no app context here).
+    """
+    with _pending_uploads_lock:
+        _pending_uploads.discard(path)
+    error = future.exception()
+    if error is not None:
+        # The row pointing at the file is already saved, so the image will be missing
+        logger.error("Could not write uploaded file %s", path, exc_info=error)
+
+
+def save_upload(file_storage, folder):
+    """
+    Stream an uploaded file to disk in fixed-size chunks, without reading it into memory,
+    under a name derived from its content.
+
+    Identical images share one file, and a name never points at different bytes, so
+    browsers may cache uploads forever (see UPLOAD_NAME_PATTERN).
+
+    Args:
+        file_storage (FileStorage): The uploaded file from request.files.
+        folder (str): The uploads folder.
+
+    Returns:
+        str: The stored filename.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    tmp = tempfile.NamedTemporaryFile(dir=folder, delete=False)
+    try:
+        with tmp:
+            while chunk := file_storage.stream.read(UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                tmp.write(chunk)
+        filename = _upload_name(digest.hexdigest(), file_storage.filename)
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            os.unlink(tmp.name)  # Same bytes already stored
+        else:
+            os.chmod(tmp.name, 0o644)  # Temporary files are created owner-only
+            os.replace(tmp.name, path)
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+        raise
+    return filename
+
+
+def save_upload_async(file_storage, folder):
+    """
+    Save an uploaded file in the background instead of blocking the request on disk I/O.
+
+    The content is read into memory first, since the request's temporary file is
+    closed once the response is sent. The file is named after its content, as in
+    save_upload, and not written again if it already exists or is being written.
+    Write errors are logged through the app logger.
+
+    Args:
+        file_storage (FileStorage): The uploaded file from request.files.
+        folder (str): The uploads folder.
+
+    Returns:
+        str: The filename the image is stored under.
+    """
+    data = file_storage.stream.read()
+    filename = _upload_name(hashlib.blake2b(data, digest_size=16).hexdigest(), file_storage.filename)
+    path = os.path.join(folder, filename)
+    with _pending_uploads_lock:
+        if path in _pending_uploads or os.path.exists(path):
+            return filename
+        _pending_uploads.add(path)
+
+    logger = current_app.logger
+    try:
+        future = upload_executor.submit(_write_upload, data, path)
+    except BaseException:
+        with _pending_uploads_lock:
+            _pending_uploads.discard(path)
+        raise
+    future.add_done_callback(lambda f: _upload_done(f, path, logger))
+    return filename
+
+
+class EmptyFormView:
+    """
+    Read-only view of a blank form shared between requests.
+
+    Field widgets are delegated to the shared form; only the CSRF token, which is
+    tied to the session, is rendered per request by hidden_tag().
+    """
+
+    __slots__ = ("_form",)
+
+    def __init__(self, form):
+        self._form = form
+
+    def __getattr__(self, name):
+        return getattr(self._form, name)
+
+    def hidden_tag(self, *fields):
+        """
+        Render the CSRF hidden input for the current session.
+
+        Returns:
+            Markup: The hidden input tag.
+        """
+        return Markup('<input id="csrf_token" name="csrf_token" type="hidden" value="{}">').format(generate_csrf())
+
+
+@lru_cache(maxsize=None)
+def empty_form(form_cls):
+    """
+    Return a blank, unbound form of the given class, built once per process.
+
+    Only use it for rendering forms that carry no per-request state (no submitted
+    data, errors or dynamically assigned choices).
+
+    Args:
+        form_cls (type): A FlaskForm subclass.
+
+    Returns:
+        EmptyFormView: Shared view of the blank form.
+    """
+    return EmptyFormView(form_cls(formdata=None, meta={"csrf": False}))
 
 
 def flash_and_redirect(message, category, endpoint, **kwargs):
@@ -89,21 +666,87 @@ def flash_and_redirect(message, category, endpoint, **kwargs):
     return redirect(url_for(endpoint, **kwargs))
 
 
+def conditional_page(page):
+    """
+    Wrap a rendered page in a response carrying an ETag, answering 304 Not Modified
+    when the browser already holds the same version.
+
+    Args:
+        page (str|Response): Rendered HTML, or a response (e.g. a redirect) returned as-is.
+
+    Returns:
+        Response: The conditional response, or the original response.
+    """
+    if not isinstance(page, str):
+        return page
+    response = make_response(page)
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def private_cache(max_age=60):
+    """
+    Decorator letting the admin's browser reuse a GET page for max_age seconds.
+
+    The response is marked private, so shared proxies never store one admin's page,
+    and carries an ETag so a stale copy is revalidated with a cheap 304.
+
+    Args:
+        max_age (int): Seconds the browser may reuse the page without asking.
+
+    Returns:
+        function: The decorator.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            rv = f(*args, **kwargs)
+            if not isinstance(rv, str):
+                return rv  # Redirects and other responses are left untouched
+            response = conditional_page(rv)
+            response.cache_control.private = True
+            response.cache_control.max_age = max_age
+            return response
+        return wrapped
+    return decorator
+
+
+@lru_cache(maxsize=256)
 def make_context(title, heading=None):
     """
     Build a consistent context dictionary for template rendering.
 
+    The context only depends on its arguments, so it is built once per title/heading
+    and shared read-only; copy it ({**context, ...}) to add per-page keys.
+
     Args:
         title (str): Page title.
         heading (str, optional): Page heading. Defaults to title if not provided.
 
     Returns:
-        dict: Context containing 'page_title' and 'main_heading'.
+        MappingProxyType: Read-only context containing 'page_title' and 'main_heading'.
     """
-    return {
+    return MappingProxyType({
         "page_title": title,
         "main_heading": heading or title
-    }
+    })
+
+
+@lru_cache(maxsize=256)
+def _parse_datetime(text):
+    """
+    Parse an ISO-8601 date/time string, caching results for repeated values.
+
+    Args:
+        text (str): The string to parse (e.g. '2025-05-01 13:00:00').
+
+    Returns:
+        datetime|None: The parsed value, or None if the string is not ISO-8601.
+    """
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
 
 
 def register_template_filters(bp):
@@ -119,16 +762,14 @@ def register_template_filters(bp):
         Format a datetime value for display in templates.
 
         Args:
-            value (datetime|str): The datetime value to format.
+            value (date|datetime|str): The value to format.
             fmt (str): Format string.
 
         Returns:
             str: Formatted date string, or raw input if formatting fails.
         """
-        if isinstance(value, datetime):
+        # Dates and datetimes from the database format directly
+        if hasattr(value, "strftime"):
             return value.strftime(fmt)
-        try:
-            dt = datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S')
-            return dt.strftime(fmt)
-        except Exception:
-            return value
+        dt = _parse_datetime(str(value))
+        return dt.strftime(fmt) if dt is not None else value
@@ -25,8 +25,7 @@ def _get_report_view_cached(report_id, return_type):
         return flash_and_redirect("Report not found.", "danger", "bp-admin.manage_reports")
 
     # Prepare context for the page
-    context = make_context(f"Report #{report_id}", "Report Details")
-    context["return_type"] = return_type
+    context = {**make_context(f"Report #{report_id}", "Report Details"), "return_type": return_type}
 
     # Render report view
     return render_template("reports/view_report.html", report=report, context=context)
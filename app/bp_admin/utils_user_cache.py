@@ -1,7 +1,7 @@
 from flask import render_template
 from app import cache
 from models.database import db
-from .utils_admin import flash_and_redirect, make_context
+from .utils_admin import flash_and_redirect, make_context, get_request_user
 
 @cache.memoize(timeout=60)
 def get_view_user_cached(user_id, return_type):
@@ -19,15 +19,14 @@ def get_view_user_cached(user_id, return_type):
         str: Rendered HTML page showing user details, or redirect if user not found.
     """
     # Retrieve user by ID
-    user = db.get_user_by_id(user_id)
+    user = get_request_user(db, user_id)
     if not user:
         return flash_and_redirect("User not found.", "danger", "bp-admin.manage_users")
 
-    # Get the number of warnings for the user
-    warning_count = db.get_warning_count(user_id)
+    # The warning count comes with the user row, so no second query is needed
+    warning_count = user["warning_count"] or 0
 
     # Build the template context with title and heading
-    context = make_context(f"User Info - {user[4]}", f"Details for {user[4]}")
-    context["return_type"] = return_type
+    context = {**make_context(f"User Info - {user['user_name']}", f"Details for {user['user_name']}"), "return_type": return_type}
 
     return render_template("users/view_user.html", context=context, user=user, warning_count=warning_count)
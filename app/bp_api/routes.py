@@ -1,11 +1,26 @@
-from flask import jsonify, request, render_template
+import hashlib
+from flask import jsonify, request, render_template, current_app, url_for, get_flashed_messages
 from flask_login import login_required, current_user
-from functools import wraps
+from functools import lru_cache, wraps
 from . import bp_api
-from models.database import db
+from models.database import db, SlotTakenError
 from app import cache
+from app.bp_admin.utils_admin import (
+    get_cache_rev, bump_cache_rev, current_user_type, delete_memoized_many, private_cache,
+    APPOINTMENTS_REV_KEY, REPORTS_REV_KEY, USERS_REV_KEY
+)
 from flask_jwt_extended import get_jwt, jwt_required, get_jwt_identity
 
+# Number of users returned per page of GET /users
+USERS_PAGE_SIZE = 100
+
+# Seconds a looked-up ID is remembered as missing
+NOT_FOUND_TIMEOUT = 10
+
+# Fields a POST body must contain, checked with a single set difference
+REQUIRED_APPOINTMENT_FIELDS = frozenset({"consumer_id", "provider_id", "consumer_name", "provider_name"})
+REQUIRED_REPORT_FIELDS = frozenset({"appointment_id", "feedback_client", "feedback_professional"})
+
 # === Decorators ===
 def roles_required(*roles):
     """
@@ -19,56 +34,193 @@ def roles_required(*roles):
     Returns:
         function: Wrapped view function with role enforcement.
     """
+    allowed = frozenset(roles)  # Built once per decorated view, O(1) membership test
+
+    def decorator(f):
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            if current_user_type() in allowed:
+                return f(*args, **kwargs)
+            return jsonify({"error": "Unauthorized"}), 403
+        return wrapped
+    return decorator
+
+
+def etag_cached(f):
+    """
+    API decorator turning a cached (body, status, etag) entry into a conditional JSON response.
+
+    The ETag is computed once when the entry is cached, so a client sending a matching
+    If-None-Match gets an empty 304 without the body being serialized or hashed again.
+
+    Args:
+        f (function): View returning an entry built by json_entry().
+
+    Returns:
+        function: Wrapped view returning a JSON or 304 response.
+    """
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        body, status, etag, *extra = f(*args, **kwargs)
+        if status == 200 and request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, status=status, mimetype="application/json")
+        if status == 200:
+            response.set_etag(etag)
+        if extra and extra[0]:
+            response.headers.update(extra[0])
+        return response
+    return wrapped
+
+
+def shared_cache(max_age=60, stale_while_revalidate=30):
+    """
+    API decorator letting browsers and proxies reuse a public GET response.
+
+    Applied on top of etag_cached, so stale copies are revalidated with a cheap 304.
+
+    Args:
+        max_age (int): Seconds the response may be served without revalidation.
+        stale_while_revalidate (int): Extra seconds a stale copy may be served while refreshing.
+
+    Returns:
+        function: The decorator.
+    """
     def decorator(f):
         @wraps(f)
         def wrapped(*args, **kwargs):
-            if current_user.user_type not in roles:
-                return jsonify({"error": "Unauthorized"}), 403
-            return f(*args, **kwargs)
+            response = f(*args, **kwargs)
+            if response.status_code in (200, 304):
+                response.cache_control.public = True
+                response.cache_control.max_age = max_age
+                response.cache_control["stale-while-revalidate"] = str(stale_while_revalidate)
+            return response
         return wrapped
     return decorator
 
 
+def json_entry(data, status=200, headers=None):
+    """
+    Serialize data once into a cacheable JSON entry for etag_cached views.
+
+    Args:
+        data (object): JSON-serializable payload.
+        status (int): HTTP status code of the response.
+        headers (dict, optional): Extra response headers (e.g. a Link to the next page).
+
+    Returns:
+        tuple: (body bytes, status, etag, headers).
+    """
+    body = current_app.json.dumps(data).encode()
+    return body, status, hashlib.blake2b(body, digest_size=16).hexdigest(), headers
+
+
+def is_found(entry):
+    """
+    Memoize response filter: only cache entries for records that exist.
+
+    Args:
+        entry (tuple): Entry built by json_entry().
+
+    Returns:
+        bool: True unless the entry is a 404.
+    """
+    return entry[1] != 404
+
+
+@lru_cache(maxsize=None)
+def not_found_entry(entity):
+    """
+    Build the 404 JSON entry of an entity type once per process.
+
+    Args:
+        entity (str): Entity name used in the message (e.g. "User").
+
+    Returns:
+        tuple: JSON entry with the "<entity> not found" error.
+    """
+    return json_entry({"error": f"{entity} not found"}, 404)
+
+
+def fetch_or_404(entity, entity_id, loader):
+    """
+    Load a single record for an API view, remembering missing IDs for a few seconds.
+
+    A missing ID is recorded under a short-lived key instead of being memoized for
+    the full timeout, so repeated lookups skip the database yet a record created
+    with that ID shows up quickly.
+
+    Args:
+        entity (str): Entity name (e.g. "User").
+        entity_id (int): ID of the record.
+        loader (callable): Returns the record, or None if it does not exist.
+
+    Returns:
+        tuple: JSON entry with the record, or the shared 404 entry.
+    """
+    missing_key = f"404:{entity}:{entity_id}"
+    if cache.get(missing_key):
+        return not_found_entry(entity)
+
+    record = loader()
+    if not record:
+        cache.set(missing_key, True, timeout=NOT_FOUND_TIMEOUT)
+        return not_found_entry(entity)
+    return json_entry(record)
+
+
 # === Cache Invalidation Helpers ===
 def invalidate_appointment_cache(appt_id=None):
     """
     Invalidate cached appointment data.
 
-    Clears the global appointment list cache. If an appointment ID is provided,
-    also clears the individual appointment cache.
+    Bumps the shared appointments generation, which clears the API list along with the
+    admin appointment lists. If an appointment ID is provided, also clears the individual
+    appointment cache.
 
     Args:
         appt_id (int, optional): ID of a specific appointment to invalidate.
     """
-    cache.delete_memoized(_get_appointments_cached)
+    bump_cache_rev(cache, APPOINTMENTS_REV_KEY)
     if appt_id:
-        cache.delete_memoized(_get_single_appointment_cached, appt_id)
+        delete_memoized_many(cache, (_get_single_appointment_cached, appt_id))
 
 
-def invalidate_report_cache(user_type=None, user_id=None, report_id=None):
+def invalidate_report_cache():
     """
     Invalidate cached report data.
 
-    Clears cached user-specific report lists and individual report details.
-
-    Args:
-        user_type (str, optional): User type (e.g., "client", "professional").
-        user_id (int, optional): ID of the user whose reports should be cleared.
-        report_id (int, optional): ID of a single report to clear from cache.
+    Report lists and single reports are keyed on the shared reports generation, so one
+    atomic increment clears them for every user, along with the admin report lists.
     """
-    if user_type and user_id:
-        cache.delete_memoized(_get_reports_cached, user_type, user_id)
-    if report_id:
-        cache.delete_memoized(_get_single_report_cached, report_id)
+    bump_cache_rev(cache, REPORTS_REV_KEY)
 
 
 # === Routes ===
 
 @bp_api.route("/")
+@private_cache(0)
 def docs():
     """
     Public route for viewing the API documentation.
 
+    Anonymous visitors all get the same page, so it is rendered once and served from the
+    cache; signed-in users and pending flash messages change the layout, so those render.
+
+    Returns:
+        str: Rendered HTML page with API documentation.
+    """
+    if current_user.is_authenticated or get_flashed_messages():
+        return render_template("api_docs.html")
+    return _get_public_docs_cached()
+
+
+@cache.cached(timeout=86400, key_prefix="api:docs:public")
+def _get_public_docs_cached():
+    """
+    Cached helper rendering the API documentation for anonymous visitors.
+
     Returns:
         str: Rendered HTML page with API documentation.
     """
@@ -78,28 +230,62 @@ def docs():
 # === USERS ===
 
 @bp_api.route("/users", methods=["GET"])
+@shared_cache(max_age=60, stale_while_revalidate=30)
+@etag_cached
 def get_users():
     """
-    API route to retrieve a list of all users.
+    API route to retrieve users, one page at a time.
+
+    Query Parameters:
+        cursor (int): ID of the last user of the previous page (omit for the first page).
+
+    Returns:
+        JSON: Up to USERS_PAGE_SIZE users with basic identifying information. When more
+        users exist, a Link header with rel="next" points to the following page.
+    """
+    cursor = max(request.args.get("cursor", 0, type=int), 0)
+    return _get_users_cached(get_cache_rev(cache, USERS_REV_KEY), cursor)
+
+
+@cache.memoize(timeout=120)
+def _get_users_cached(rev, cursor):
+    """
+    Cached helper to fetch one page of users.
+
+    Args:
+        rev (int): Current users generation (USERS_REV_KEY).
+        cursor (int): ID after which the page starts.
 
     Returns:
-        JSON: List of all users with basic identifying information.
+        tuple: Cached JSON entry with the page of users.
     """
-    return _get_users_cached()
+    users = db.get_users_page(cursor, USERS_PAGE_SIZE)
+    headers = None
+    if len(users) == USERS_PAGE_SIZE:
+        next_url = url_for("bp-api.get_users", cursor=users[-1]["id"])
+        headers = {"Link": f'<{next_url}>; rel="next"'}
+    return json_entry(users, headers=headers)
 
 
-@cache.cached(timeout=120)
-def _get_users_cached():
+@bp_api.route("/providers", methods=["GET"])
+def search_providers():
     """
-    Cached helper to fetch all users.
+    API route to look up professionals by name prefix, for autocompleting provider fields.
+
+    Query Parameters:
+        q (str): Beginning of the professional's first or last name.
 
     Returns:
-        JSON: Cached response with list of users.
+        JSON: Up to 20 matches as {"id", "name"} objects; empty when q is blank.
     """
-    return jsonify(db.get_all_users())
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify([])
+    return jsonify([{"id": pid, "name": name} for pid, name in db.search_providers(q[:50], limit=20)])
 
 
 @bp_api.route("/users/<int:user_id>", methods=["GET"])
+@etag_cached
 def get_single_user(user_id):
     """
     API route to retrieve details of a single user by ID.
@@ -113,7 +299,7 @@ def get_single_user(user_id):
     return _get_single_user_cached(user_id)
 
 
-@cache.memoize(timeout=120)
+@cache.memoize(timeout=120, response_filter=is_found)
 def _get_single_user_cached(user_id):
     """
     Cached helper to fetch a single user by ID.
@@ -122,15 +308,16 @@ def _get_single_user_cached(user_id):
         user_id (int): ID of the user to fetch.
 
     Returns:
-        JSON: User data or 404 error message.
+        tuple: Cached JSON entry with the user data or a 404 error message.
     """
-    user = db.get_user_by_id(user_id)
-    return jsonify(user) if user else (jsonify({"error": "User not found"}), 404)
+    return fetch_or_404("User", user_id, lambda: db.get_user_by_id(user_id))
 
 
 # === APPOINTMENTS ===
 
 @bp_api.route("/appointments", methods=["GET"])
+@shared_cache(max_age=60, stale_while_revalidate=30)
+@etag_cached
 def get_appointments():
     """
     API route to retrieve all appointments.
@@ -138,21 +325,25 @@ def get_appointments():
     Returns:
         JSON: List of all appointments with associated details.
     """
-    return _get_appointments_cached()
+    return _get_appointments_cached(get_cache_rev(cache, APPOINTMENTS_REV_KEY))
 
 
-@cache.cached(timeout=60)
-def _get_appointments_cached():
+@cache.memoize(timeout=60)
+def _get_appointments_cached(rev):
     """
     Cached helper to fetch all appointments.
 
+    Args:
+        rev (int): Current appointments generation; bumping it retires this entry.
+
     Returns:
-        JSON: Cached list of appointment records.
+        tuple: Cached JSON entry with the list of appointment records.
     """
-    return jsonify(db.get_all_appointments())
+    return json_entry(db.get_all_appointments())
 
 
 @bp_api.route("/appointments/<int:appt_id>", methods=["GET"])
+@etag_cached
 def get_single_appointment(appt_id):
     """
     API route to retrieve a single appointment by ID.
@@ -166,7 +357,7 @@ def get_single_appointment(appt_id):
     return _get_single_appointment_cached(appt_id)
 
 
-@cache.memoize(timeout=60)
+@cache.memoize(timeout=60, response_filter=is_found)
 def _get_single_appointment_cached(appt_id):
     """
     Cached helper to fetch a single appointment by ID.
@@ -175,10 +366,9 @@ def _get_single_appointment_cached(appt_id):
         appt_id (int): ID of the appointment.
 
     Returns:
-        JSON: Appointment object or a 404 error message.
+        tuple: Cached JSON entry with the appointment or a 404 error message.
     """
-    appt = db.get_appointment_by_id(appt_id)
-    return jsonify(appt) if appt else (jsonify({"error": "Appointment not found"}), 404)
+    return fetch_or_404("Appointment", appt_id, lambda: db.get_appointment_by_id(appt_id))
 
 
 @bp_api.route("/appointments", methods=["POST"])
@@ -190,17 +380,17 @@ def api_create_appointment():
     and returns the newly generated appointment ID.
 
     Returns:
-        JSON: 201 with appointment_id on success, or 400/500 with error message.
+        JSON: 201 with appointment_id on success, 409 if the slot is already booked,
+        or 400/500 with error message.
     """
     data = request.get_json()
     if not data:
         return jsonify({"error": "Missing JSON body"}), 400
 
     # Validate required fields
-    required = ["consumer_id", "provider_id", "consumer_name", "provider_name"]
-    missing = [f for f in required if f not in data]
+    missing = REQUIRED_APPOINTMENT_FIELDS.difference(data)
     if missing:
-        return jsonify({"error": f"Missing fields: {', '.join(missing)}"}), 400
+        return jsonify({"error": f"Missing fields: {', '.join(sorted(missing))}"}), 400
 
     try:
         # Create appointment in the database
@@ -210,6 +400,8 @@ def api_create_appointment():
         invalidate_appointment_cache()
 
         return jsonify({"appointment_id": appt_id}), 201
+    except SlotTakenError as e:
+        return jsonify({"error": str(e)}), 409
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -226,7 +418,7 @@ def api_update_appointment(appt_id):
         appt_id (int): The ID of the appointment to update.
 
     Returns:
-        JSON: Success status or error message.
+        JSON: Success status, 409 if the new slot is already booked, or error message.
     """
     data = request.get_json()
     if not data:
@@ -240,6 +432,8 @@ def api_update_appointment(appt_id):
         invalidate_appointment_cache(appt_id)
 
         return jsonify({"status": "Appointment updated"})
+    except SlotTakenError as e:
+        return jsonify({"error": str(e)}), 409
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -272,6 +466,7 @@ def api_delete_appointment(appt_id):
 # === REPORTS ===
 
 @bp_api.route("/reports", methods=["GET"])
+@etag_cached
 def get_reports():
     """
     Public API route to retrieve all reports.
@@ -279,36 +474,27 @@ def get_reports():
     This version does NOT require login and will return all reports,
     similar to the appointments and users endpoints.
     """
-    reports = db.get_all_report()
-    return jsonify(reports), 200
-
+    return _get_all_reports_cached(get_cache_rev(cache, REPORTS_REV_KEY))
 
 
 @cache.memoize(timeout=60)
-def _get_reports_cached(user_type, user_id):
+def _get_all_reports_cached(rev):
     """
-    Cached helper to fetch reports for a user based on their role.
+    Cached helper to fetch every report.
+
+    Not keyed on the user, so every caller of the public list shares a single entry.
 
     Args:
-        user_type (str): The type of the current user (client, professional, admin).
-        user_id (int): The ID of the user making the request.
+        rev (int): Current reports generation (REPORTS_REV_KEY).
 
     Returns:
-        JSON: List of reports or error response.
+        tuple: Cached JSON entry with the list of report records.
     """
-    if user_type == "client":
-        reports = db.get_reports_by_client(user_id)
-    elif user_type == "professional":
-        reports = db.get_reports_by_professional(user_id)
-    elif user_type.startswith("admin"):
-        reports = db.get_all_report()
-    else:
-        return jsonify({"error": "Unauthorized user type"}), 403
-
-    return jsonify(reports), 200
+    return json_entry(db.get_all_report())
 
 
 @bp_api.route("/reports/<int:report_id>", methods=["GET"])
+@etag_cached
 def api_get_report(report_id):
     """
     API route to retrieve a single report by ID.
@@ -319,22 +505,22 @@ def api_get_report(report_id):
     Returns:
         JSON: Report data if found, or a 404 error message.
     """
-    return _get_single_report_cached(report_id)
+    return _get_single_report_cached(get_cache_rev(cache, REPORTS_REV_KEY), report_id)
 
 
-@cache.memoize(timeout=60)
-def _get_single_report_cached(report_id):
+@cache.memoize(timeout=60, response_filter=is_found)
+def _get_single_report_cached(rev, report_id):
     """
     Cached helper to fetch a single report by ID.
 
     Args:
+        rev (int): Current reports generation (REPORTS_REV_KEY).
         report_id (int): ID of the report.
 
     Returns:
-        JSON: Report data or 404 error message.
+        tuple: Cached JSON entry with the report data or a 404 error message.
     """
-    report = db.get_report_by_id(report_id)
-    return jsonify(report) if report else (jsonify({"error": "Report not found"}), 404)
+    return fetch_or_404("Report", report_id, lambda: db.get_report_by_id(report_id))
 
 
 @bp_api.route("/reports", methods=["POST"])
@@ -353,17 +539,16 @@ def api_create_report():
         return jsonify({"error": "Missing JSON body"}), 400
 
     # Validate required fields
-    required = ["appointment_id", "feedback_client", "feedback_professional"]
-    missing = [f for f in required if f not in data]
+    missing = REQUIRED_REPORT_FIELDS.difference(data)
     if missing:
-        return jsonify({"error": f"Missing fields: {', '.join(missing)}"}), 400
+        return jsonify({"error": f"Missing fields: {', '.join(sorted(missing))}"}), 400
 
     try:
         # Add report to the database
         report_id = db.add_report(data)
 
         # Invalidate cached report list for the user
-        invalidate_report_cache(current_user.user_type, current_user.id)
+        invalidate_report_cache()
 
         return jsonify({"report_id": report_id}), 201
     except Exception as e:
@@ -397,7 +582,7 @@ def api_update_report(report_id):
         db.update_report(report_id, data)
 
         # Invalidate relevant cached entries
-        invalidate_report_cache(current_user.user_type, current_user.id, report_id)
+        invalidate_report_cache()
 
         return jsonify({"status": "Report updated"})
     except Exception as e:
@@ -422,7 +607,7 @@ def api_delete_report(report_id):
         db.delete_report(report_id)
 
         # Invalidate all related report caches
-        invalidate_report_cache(current_user.user_type, current_user.id, report_id)
+        invalidate_report_cache()
 
         return jsonify({"status": "Report deleted"})
     except Exception as e:
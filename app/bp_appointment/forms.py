@@ -2,6 +2,7 @@ from flask_wtf import FlaskForm
 from wtforms import StringField, SelectField, DateField, IntegerField, SubmitField
 from wtforms.validators import DataRequired, NumberRange
 from datetime import date
+from app.bp_admin.utils_admin import ALL_SLOTS, VENUE_CHOICES, LazySelectField
 
 class CreateAppointmentForm(FlaskForm):
     """
@@ -17,9 +18,9 @@ class CreateAppointmentForm(FlaskForm):
         nb_services (IntegerField): Number of services requested.
         submit (SubmitField): Button to submit the form.
     """
-    venue = SelectField("Venue", choices=[], validators=[DataRequired()])
+    venue = SelectField("Venue", choices=VENUE_CHOICES, validators=[DataRequired()])
     date_appoint = DateField("Date", validators=[DataRequired()], render_kw={"min": date.today().isoformat()})
-    slot = SelectField("Slot", choices=[], validators=[DataRequired()])
+    slot = SelectField("Slot", choices=ALL_SLOTS, validators=[DataRequired()])
     provider_id = SelectField("Professional", coerce=int, validators=[DataRequired()])
     service_name = StringField("Service Name", validators=[DataRequired()])
     service_duration = IntegerField("Duration (hours)", validators=[DataRequired()])
@@ -32,8 +33,8 @@ class ModifyAppointmentForm(FlaskForm):
     Form for admins to modify an existing appointment.
 
     Fields:
-        consumer_id (SelectField): Dropdown to select a client.
-        provider_id (SelectField): Dropdown to select a professional.
+        consumer_id (LazySelectField): Dropdown to select a client.
+        provider_id (LazySelectField): Dropdown to select a professional.
         date_appoint (DateField): Date of the appointment.
         slot (StringField): Time slot (e.g., '13-14').
         venue (StringField): Location/room/chair.
@@ -42,8 +43,8 @@ class ModifyAppointmentForm(FlaskForm):
         duration (IntegerField): Duration in hours (must be ≥ 1).
         submit (SubmitField): Button to submit the form.
     """
-    consumer_id = SelectField("Consumer", coerce=int, validators=[DataRequired()])
-    provider_id = SelectField("Provider", coerce=int, validators=[DataRequired()])
+    consumer_id = LazySelectField("Consumer", coerce=int, validators=[DataRequired()])
+    provider_id = LazySelectField("Provider", coerce=int, validators=[DataRequired()])
     date_appoint = DateField("Date", format="%Y-%m-%d", validators=[DataRequired()])
     slot = StringField("Slot", validators=[DataRequired()])
     venue = StringField("Venue", validators=[DataRequired()])
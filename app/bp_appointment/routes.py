@@ -1,50 +1,36 @@
-from flask import render_template, redirect, url_for, flash, request
+from flask import render_template, redirect, url_for, flash, request, jsonify
 from datetime import date
 from flask_login import login_required, current_user
 
-from app.bp_admin.utils_admin import flash_and_redirect, make_context
+from app.bp_admin.utils_admin import (
+    flash_and_redirect, make_context, get_cached_client_choices, get_cached_provider_choices,
+    get_cached_booking_choices, get_cache_rev, bump_cache_rev, private_cache, APPOINTMENTS_REV_KEY,
+    db_executor
+)
 from . import bp_appointment
-from models.database import db
+from models.database import db, SlotTakenError
 from .forms import ModifyAppointmentForm, CreateAppointmentForm
-from types import SimpleNamespace
 from app import cache
 
 # === Constants ===
 
-# Dropdown choices for appointment venues
-VENUES = [
-    ("room1", "Room 1"),
-    ("room2", "Room 2"),
-    ("chair1", "Chair 1"),
-    ("chair2", "Chair 2"),
-    ("cmn_room", "Common Room")
-]
+# Status tabs of the all-appointments list, mapped to the stored status they keep
+LIST_STATUS_FILTERS = {
+    "all": None,
+    "requested": "requested",
+    "approved": "accepted",
+    "cancelled": "cancelled"
+}
 
-# Time slot options (1–11 AM and 1–9 PM)
-SLOTS = [(f"{h}-{h+1}", f"{h}-{h+1}") for h in list(range(1, 12)) + list(range(13, 22))]
+# Stable memoize name of the my-appointments pages; bump the version to drop every
+# cached page at once, e.g. when the row layout changes
+MY_APPTS_CACHE_NAME = "myappts:v2"
 
-# Extract only the slot values (e.g., "1-2", "13-14")
-ALL_SLOTS = [slot[0] for slot in SLOTS]
+# Sort options offered by the all-appointments list (see APPOINTMENT_SORT_COLUMNS)
+LIST_SORTS = ("date", "slot", "provider", "consumer")
 
-
-# === Helpers ===
-
-def get_pay_rates(provider_choices):
-    """
-    Construct a dictionary mapping provider IDs to their pay rates.
-
-    If a provider has no rate stored, the default is 15.75.
-
-    Args:
-        provider_choices (list): List of tuples (provider_id, display_name)
-
-    Returns:
-        dict: Mapping from provider_id to pay_rate
-    """
-    return {
-        pid: db.get_user_by_id(pid)[14] or 15.75  # pay_rate is at index 14
-        for pid, _ in provider_choices if pid != -1
-    }
+# Appointments shown per page of the all-appointments list
+LIST_PER_PAGE = 5
 
 
 # === Utility Functions ===
@@ -53,33 +39,50 @@ def invalidate_my_appt_cache():
     """
     Invalidate appointment cache entries for the currently logged-in user.
 
-    Clears both personal appointment list and global list views.
+    Clears the personal appointment list, and bumps the shared appointments generation,
+    which clears every page of the all-appointments list along with the admin and API lists.
     """
     cache.delete_memoized(_get_my_appointments_cached, current_user.id, current_user.user_type, 1)
-    cache.delete_memoized(list_all_appointments)
+    bump_cache_rev(cache, APPOINTMENTS_REV_KEY)
 
 
-def paginate(data, page, per_page):
+def list_appts_args():
     """
-    Paginate a list of data.
+    Read the all-appointments list query parameters, normalized to the supported values.
 
-    Args:
-        data (list): The full list of items to paginate.
-        page (int): Current page number (1-based).
-        per_page (int): Number of items per page.
+    Unknown statuses and sort keys fall back to the defaults, so equivalent requests share
+    one cache entry and the key space stays bounded.
 
     Returns:
-        tuple: (paginated subset, total number of pages)
+        tuple: (status filter, sort key, page number)
     """
-    total = len(data)
-    total_pages = (total + per_page - 1) // per_page
-    return data[(page - 1) * per_page : page * per_page], total_pages
+    filter_status = request.args.get("status", "all")
+    if filter_status not in LIST_STATUS_FILTERS:
+        filter_status = "all"
+    sort_by = request.args.get("sort", "date")
+    if sort_by not in LIST_SORTS:
+        sort_by = "date"
+    page = max(request.args.get("page", 1, type=int), 1)
+    return filter_status, sort_by, page
+
+
+def _list_appts_key(*args, **kwargs):
+    """
+    Build the cache key of an all-appointments list page from its normalized parameters.
+
+    Returns:
+        str: Key embedding the appointments generation, status, sort key and page.
+    """
+    filter_status, sort_by, page = list_appts_args()
+    rev = get_cache_rev(cache, APPOINTMENTS_REV_KEY)
+    return f"appt:list:{rev}:{filter_status}:{sort_by}:{page}"
 
 
 # === Routes ===
 
 @bp_appointment.route("/my-appointments")
 @login_required
+@private_cache(0)
 def my_appointments():
     """
     Route for clients and professionals to view their own appointments.
@@ -89,48 +92,61 @@ def my_appointments():
     Returns:
         str: Rendered HTML page showing a list of appointments.
     """
-    page = request.args.get("page", 1, type=int)
-    return _get_my_appointments_cached(current_user.id, current_user.user_type, page)
+    # Normalized before the memoize layer, so ?page=0, ?page=-3 and ?page=x share page 1's entry
+    page = max(request.args.get("page", 1, type=int), 1)
+    appointments, total_pages = _get_my_appointments_cached(int(current_user.id), current_user.user_type, page)
 
+    # Rendered on every request, so flashed messages and the navbar always reflect this user
+    return render_template(
+        "my_appointments.html",
+        appointments=appointments,
+        total_pages=total_pages,
+        current_page=page
+    )
 
 
-@cache.memoize(timeout=60)
+@cache.memoize(timeout=60, make_name=lambda fname: MY_APPTS_CACHE_NAME)
 def _get_my_appointments_cached(user_id, user_type, page):
-    per_page = 5
+    """
+    Cached helper fetching one page of a user's own appointments.
 
-    # Determine which appointments to fetch based on user type
-    if user_type == "client":
-        appts = db.get_appointments_by_client(user_id)
-    elif user_type == "professional":
-        appts = db.get_appointments_by_professional(user_id)
-    else:
-        appts = db.get_appointments_by_user(user_id)  # Fallback for admin types
+    Only the data is cached, not the rendered page.
 
-    print(f"[DEBUG] Total appointments for user {user_id}: {len(appts)}")
+    Args:
+        user_id (int): ID of the logged-in user.
+        user_type (str): Role of the user; professionals are matched as the provider.
+        page (int): Page number (1-based), already normalized by the route.
 
-    # Paginate the appointment list
-    paginated, total_pages = paginate(appts, page, per_page)
+    Returns:
+        tuple: The appointment dicts of the page, each with a can_write_report flag,
+            and the total number of pages.
+    """
+    per_page = 5
 
-    print(f"[DEBUG] Appointments on page {page}: {len(paginated)}")
+    # Fetch only the requested page; clients and admins are matched as the consumer,
+    # professionals as the provider
+    paginated, total = db.get_appointments_page(
+        user_id, user_type, limit=per_page, offset=(page - 1) * per_page
+    )
+    total_pages = (total + per_page - 1) // per_page
 
-    result = [
-        SimpleNamespace(**{
-            **a,
-            "can_write_report": (
-                user_type == "client"
-                and a["date_appoint"] < date.today()
-                and not db.has_report_for_appointment(a["appointment_id"])
-            )
-        })
-        for a in paginated
-    ]
+    # Clients may report past appointments that have no report yet; one query checks
+    # every candidate on the page instead of one query per row
+    today = date.today()
+    is_client = user_type == "client"
+    past = [a["appointment_id"] for a in paginated if a["date_appoint"] < today] if is_client else []
+    reported = db.get_report_appointment_ids(past)
 
-    return render_template(
-        "my_appointments.html",
-        appointments=result,
-        total_pages=total_pages,
-        current_page=page
-    )
+    # The rows are fresh dicts from the query, so the flag is added in place; Jinja's
+    # appointment.field lookups fall back to item access
+    for a in paginated:
+        a["can_write_report"] = (
+            is_client
+            and a["date_appoint"] < today
+            and a["appointment_id"] not in reported
+        )
+
+    return paginated, total_pages
 
 
 
@@ -151,30 +167,21 @@ def create_appointment():
     """
     form = CreateAppointmentForm()
 
-    # Populate dropdowns with professionals and predefined slots/venues
-    professionals = db.get_all_professionals_with_names()
-    form.provider_id.choices = [(-1, 'Select a professional')] + [
-        (p["user_id"], f"{p['fname']} {p['lname']} [id:{p['user_id']}]") for p in professionals
-    ]
-    form.venue.choices = VENUES
-    form.slot.choices = SLOTS
-
-    # Build pay rate lookup for pricing calculation
-    pay_rates = {
-        p["user_id"]: db.get_user_by_id(p["user_id"])[14] or 15.75 for p in professionals
-    }
+    # Populate the professional dropdown; slot and venue choices are static on the form.
+    # The cached entry also holds the pay rates used for pricing.
+    form.provider_id.choices, pay_rates = get_cached_booking_choices(cache, db)
 
     if form.validate_on_submit():
         try:
-            # Get selected provider's full record
+            # Get selected provider's full record (a DictCursor row, read by column name)
             provider = db.get_user_by_id(form.provider_id.data)
 
             # Create appointment record
             appoint_id = db.add_appointment({
                 "consumer_id": current_user.id,
-                "provider_id": provider[0],
+                "provider_id": provider["user_id"],
                 "consumer_name": f"{current_user.fname} {current_user.lname}",
-                "provider_name": f"{provider[5]} {provider[6]}",  # fname, lname
+                "provider_name": f"{provider['fname']} {provider['lname']}",
                 "status": "requested",
                 "approved": 0,
                 "date_appoint": form.date_appoint.data,
@@ -200,6 +207,8 @@ def create_appointment():
             flash("Appointment created successfully", "success")
             return redirect(url_for("bp-appointment.my_appointments"))
 
+        except SlotTakenError as e:
+            flash(str(e), "warning")
         except Exception as e:
             flash(f"Error creating appointment: {e}", "danger")
 
@@ -233,49 +242,28 @@ def view_appointment(appointment_id):
 
 
 @bp_appointment.route("/list_all_appointments")
-@cache.cached(timeout=60, query_string=True)
+@private_cache(0)
+@cache.cached(timeout=60, make_cache_key=_list_appts_key)
 def list_all_appointments():
     """
     Route to display a paginated and filterable list of all appointments.
 
     Admins and users can view appointments filtered by status (requested, approved, cancelled)
-    and sorted by a given field (e.g., date_appoint). Results are paginated, and
-    the output is cached per unique query string.
+    and sorted by a given field (e.g., date). Results are paginated, and the output
+    is cached per normalized status, sort and page until an appointment changes.
 
     Query Params:
         status (str): Filter by appointment status ('all', 'requested', 'approved', 'cancelled').
-        sort (str): Field to sort by (e.g., 'date_appoint').
+        sort (str): Field to sort by ('date', 'slot', 'provider' or 'consumer').
         page (int): Page number for pagination.
 
     Returns:
         str: Rendered HTML template with paginated, sorted, and filtered appointments.
     """
-    status_map = {
-        "all": None,
-        "requested": "requested",
-        "approved": "accepted",
-        "cancelled": "cancelled"
-    }
-
-    # Get query parameters
-    filter_status = request.args.get("status", "all")
-    sort_by = request.args.get("sort", "date_appoint")
-    page = request.args.get("page", 1, type=int)
-
-    # Fetch all appointments
-    appts = db.get_all_appointments()
-
-    # Filter based on selected status
-    if status_map[filter_status]:
-        filtered = [a for a in appts if a["status"] == status_map[filter_status]]
-    else:
-        filtered = appts
-
-    # Sort the appointments by the requested field
-    filtered.sort(key=lambda x: x.get(sort_by, x.get("date_appoint")))
-
-    # Paginate the sorted list
-    paginated, total_pages = paginate(filtered, page, 5)
+    # Get the normalized query parameters
+    filter_status, sort_by, page = list_appts_args()
+    rev = get_cache_rev(cache, APPOINTMENTS_REV_KEY)
+    paginated, total_pages = _get_all_appointments_page_cached(rev, filter_status, sort_by, page)
 
     # Render the appointment list view
     return render_template(
@@ -285,10 +273,84 @@ def list_all_appointments():
         current_page=page,
         status_filter=filter_status,
         sort_by=sort_by,
+        status_counts=_get_status_counts_cached(rev),
         current_user=current_user
     )
 
 
+@bp_appointment.route("/list_all_appointments.json")
+def list_all_appointments_json():
+    """
+    JSON variant of the all-appointments list, used by the list page to change page,
+    filter or sort without reloading and re-rendering the whole layout.
+
+    Takes the same query parameters as list_all_appointments.
+
+    Returns:
+        Response: JSON with the page's 'items', 'total_pages', 'current_page', 'status',
+            'sort' and per-tab 'status_counts', carrying an ETag so an unchanged page is
+            answered with 304.
+    """
+    filter_status, sort_by, page = list_appts_args()
+    rev = get_cache_rev(cache, APPOINTMENTS_REV_KEY)
+    items, total_pages = _get_all_appointments_page_cached(rev, filter_status, sort_by, page)
+
+    # jsonify would send dates as RFC 1123 timestamps; send the YYYY-MM-DD the HTML page shows
+    items = [dict(item, date_appoint=item["date_appoint"].isoformat()) for item in items]
+
+    response = jsonify({
+        "items": items,
+        "total_pages": total_pages,
+        "current_page": page,
+        "status": filter_status,
+        "sort": sort_by,
+        "status_counts": _get_status_counts_cached(rev)
+    })
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@cache.memoize(timeout=30)
+def _get_status_counts_cached(rev):
+    """
+    Cached helper counting appointments under each status tab of the list.
+
+    Args:
+        rev (int): Current appointments generation; bumping it retires this entry.
+
+    Returns:
+        dict: Number of appointments per key of LIST_STATUS_FILTERS.
+    """
+    counts = db.get_appointment_status_counts()
+    return {tab: counts[status or "all"] for tab, status in LIST_STATUS_FILTERS.items()}
+
+
+@cache.memoize(timeout=60)
+def _get_all_appointments_page_cached(rev, filter_status, sort_by, page):
+    """
+    Cached helper fetching one page of the all-appointments list.
+
+    Shared by the HTML and JSON views, so either one warms the other.
+
+    Args:
+        rev (int): Current appointments generation; bumping it retires this entry.
+        filter_status (str): Normalized status tab (a key of LIST_STATUS_FILTERS).
+        sort_by (str): Normalized sort key (one of LIST_SORTS).
+        page (int): Page number (1-based).
+
+    Returns:
+        tuple: The appointment dicts of the page and the total number of pages.
+    """
+    # Filter, sort and paginate in SQL, so only the displayed page is fetched
+    items, total = db.get_appointments_page(
+        status=LIST_STATUS_FILTERS[filter_status],
+        sort_by=sort_by,
+        limit=LIST_PER_PAGE,
+        offset=(page - 1) * LIST_PER_PAGE
+    )
+    return items, (total + LIST_PER_PAGE - 1) // LIST_PER_PAGE
+
+
 @bp_appointment.route("/accept/<int:appointment_id>", methods=["POST"])
 @login_required
 def accept_appointment(appointment_id):
@@ -305,18 +367,20 @@ def accept_appointment(appointment_id):
     Returns:
         Response: Redirects to the appointment detail view with a flash message.
     """
-    # Retrieve the appointment
-    appointment = db.get_appointment_by_id(appointment_id)
+    # Update the status to 'accepted'; the WHERE clause only matches when the
+    # current user is the provider, so access is checked in the same query
+    try:
+        accepted = db.set_appointment_status_if_participant(
+            appointment_id, "accepted", current_user.id, provider_only=True
+        )
+    except SlotTakenError as e:
+        flash(str(e), "warning")
+        return redirect(url_for("bp-appointment.view_appointment", appointment_id=appointment_id))
 
-    # Validate access: only the provider can accept the appointment
-    if not appointment or current_user.id != appointment["provider_id"]:
+    if not accepted:
         flash("You are not authorized to accept this appointment.", "danger")
         return redirect(url_for("bp-appointment.view_appointment", appointment_id=appointment_id))
 
-    # Update appointment status to 'accepted'
-    appointment["status"] = "accepted"
-    db.update_appointment(appointment_id, appointment)
-
     # Invalidate appointment caches
     invalidate_my_appt_cache()
 
@@ -340,24 +404,27 @@ def cancel_appointment(appointment_id):
     Returns:
         Response: Redirects to the appointment view with a flash message.
     """
-    # Retrieve appointment record
-    appointment = db.get_appointment_by_id(appointment_id)
-    if not appointment:
-        flash("Appointment not found.", "danger")
-        return redirect(url_for("bp-appointment.list_all_appointments"))
-
-    # Authorization: must be the consumer or provider
-    if current_user.id not in [appointment["provider_id"], appointment["consumer_id"]]:
-        flash("You are not authorized to cancel this appointment.", "danger")
-        return redirect(url_for("bp-appointment.view_appointment", appointment_id=appointment_id))
+    # Cancel in one query: only matches a requested appointment of which the current
+    # user is the consumer or provider
+    if not db.set_appointment_status_if_participant(
+        appointment_id, "cancelled", current_user.id, from_status="requested"
+    ):
+        # Rare failure path: look the appointment up only to explain the refusal
+        appointment = db.get_appointment_by_id(appointment_id)
+        if not appointment:
+            flash("Appointment not found.", "danger")
+            return redirect(url_for("bp-appointment.list_all_appointments"))
+
+        # Authorization: must be the consumer or provider
+        if current_user.id not in [appointment["provider_id"], appointment["consumer_id"]]:
+            flash("You are not authorized to cancel this appointment.", "danger")
+            return redirect(url_for("bp-appointment.view_appointment", appointment_id=appointment_id))
 
-    # Only requested appointments can be cancelled
-    if appointment["status"] != "requested":
+        # Only requested appointments can be cancelled
         flash("Only requested appointments can be cancelled.", "warning")
         return redirect(url_for("bp-appointment.view_appointment", appointment_id=appointment_id))
 
-    # Update status and invalidate cache
-    db.update_appointment_status(appointment_id, "cancelled")
+    # Invalidate cache
     invalidate_my_appt_cache()
 
     flash("Appointment cancelled.", "info")
@@ -437,8 +504,12 @@ def modify_appointment(appointment_id):
     Returns:
         Response: Rendered template on GET or form error, or redirect on success.
     """
-    # Fetch appointment from DB
-    appt = db.get_appointment_by_id(appointment_id)
+    # Fetch the appointment on a spare pooled connection while the provider choices
+    # (and their pay rates, needed for pricing) are read; on a cold cache the two
+    # queries overlap instead of running back to back
+    appt_future = db.submit(db_executor, db.get_appointment_by_id, appointment_id)
+    provider_choices, pay_rates = get_cached_provider_choices(cache, db)
+    appt = appt_future.result()
     if not appt:
         return flash_and_redirect("Appointment not found.", "danger", "bp-appointment.my_appointments")
 
@@ -450,19 +521,15 @@ def modify_appointment(appointment_id):
     form = ModifyAppointmentForm()
 
     # Populate dropdown choices
-    form.consumer_id.choices = db.get_client_choices()
-    form.provider_id.choices = db.get_provider_choices()
-    pay_rates = {
-        pid: db.get_user_by_id(pid)[14] or 15.75 for pid, _ in form.provider_id.choices
-    }
+    # Client choices load only when the form is rendered or validated
+    form.consumer_id.loader = lambda: get_cached_client_choices(cache, db)
+    form.provider_id.choices = provider_choices
 
     if form.validate_on_submit():
         try:
             # Extract form data
             consumer_id = form.consumer_id.data
             provider_id = form.provider_id.data
-            consumer_name = db.get_user_name_by_id(consumer_id)
-            provider_name = db.get_user_name_by_id(provider_id)
             date = form.date_appoint.data
             slot = form.slot.data
             venue = form.venue.data
@@ -488,39 +555,39 @@ def modify_appointment(appointment_id):
                 flash(f"Services ({nber_services}) cannot exceed duration ({duration}).", "danger")
                 return render_template("modify_appointment.html", form=form, pay_rates=pay_rates)
 
-            # Update appointment info
-            db.execute("""
-                UPDATE salon_appointment
-                SET date_appoint = %s, slot = %s, venue = %s,
-                    provider_id = %s, provider_name = %s,
-                    consumer_id = %s, consumer_name = %s,
-                    nber_services = %s
-                WHERE appointment_id = %s
-            """, (
-                date, slot, venue,
-                provider_id, provider_name,
-                consumer_id, consumer_name,
-                nber_services, appointment_id
-            ))
-
-            # Update linked service info
-            db.execute("""
-                UPDATE salon_service
-                SET service_name = %s, service_duration = %s,
-                    service_price = %s
-                WHERE appointment_id = %s
-            """, (
-                service_name,
-                duration,
-                duration * pay_rates.get(provider_id, 15.75),
-                appointment_id
-            ))
-
-            db.log_admin_action(f"{current_user.user_name} modified appt #{appointment_id}", current_user.user_name)
+            # Names are only looked up once the input is known to be valid
+            consumer_name = db.get_user_name_by_id(consumer_id)
+            provider_name = db.get_user_name_by_id(provider_id)
+
+            # Update the appointment, its service and the admin log in one atomic statement
+            db.update_appointment_and_service(
+                appointment_id,
+                {
+                    "date_appoint": date,
+                    "slot": slot,
+                    "venue": venue,
+                    "provider_id": provider_id,
+                    "provider_name": provider_name,
+                    "consumer_id": consumer_id,
+                    "consumer_name": consumer_name,
+                    "nber_services": nber_services
+                },
+                {
+                    "service_name": service_name,
+                    "service_duration": duration,
+                    "service_price": duration * pay_rates.get(provider_id, 15.75)
+                },
+                f"{current_user.user_name} modified appt #{appointment_id}",
+                current_user.user_name
+            )
+            invalidate_my_appt_cache()
 
             flash("Appointment updated successfully.", "success")
             return redirect(url_for("bp-appointment.view_appointment", appointment_id=appointment_id))
 
+        except SlotTakenError as e:
+            flash(str(e), "warning")
+            return render_template("modify_appointment.html", form=form, pay_rates=pay_rates)
         except Exception as e:
             flash(f"Error updating appointment: {e}", "danger")
             return render_template("modify_appointment.html", form=form, pay_rates=pay_rates)
@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token
+from models.passwords import verify_user_password
 from app.bp_auth.user import User
-from models.database import db
 
 bp_api_auth = Blueprint("bp_api_auth", __name__)
 
@@ -26,9 +26,10 @@ def api_login():
     username = data.get("user_name")
     password = data.get("password")
 
-    # Fetch user and validate password
+    # Fetch user and validate password against the hash already loaded with it
+    # (db.check_password would look the same user up a second time)
     user = User.get_user_by_username(username)
-    if user and db.check_password(username, password):
+    if verify_user_password(user, password):
         # Generate JWT with user's ID and username as claims
         token = create_access_token(
             identity=str(user.id),
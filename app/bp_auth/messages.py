@@ -93,16 +93,30 @@ class Message():
     @staticmethod
     def get_messages_by_group_name(group_name):
         """
-        Get all messages of a specific group_name.
+        Get the most recent messages of a specific group_name.
 
         Args:
             group_name (str): The group name/ group chat (identifier) to retrieve (e.g., 'rix_andrew', 'funtime2025').
 
         Returns:
-            list: A list of Messages objects matching the given group_name.
+            list: A list of message dictionaries (sender_username, contents, time_sent, members), oldest first.
         """
-        rows = db.get_messages_by_group_name(group_name)
-        return [{"sender_username": r[0], "contents": r[1], "time_sent": r[2], "members": r[3]} for r in rows]
+        # The database already returns one dictionary per row
+        return db.get_messages_by_group_name(group_name)
+
+
+    @staticmethod
+    def get_current_members(group_name):
+        """
+        Get the current members of a specific group_name (those of its latest message).
+
+        Args:
+            group_name (str): The group name/ group chat (identifier) to retrieve (e.g., 'rix_andrew', 'funtime2025').
+
+        Returns:
+            str: Comma-separated usernames of the members, or None if the group has no messages.
+        """
+        return db.get_group_members(group_name)
 
 
     @staticmethod
@@ -123,3 +137,18 @@ class Message():
             group_list.append(row)
     
         return group_list
+
+
+    @staticmethod
+    def is_member(user_name, group_name):
+        """
+        Check whether a user is a member of a specific Group Chat.
+
+        Args:
+            user_name (str): The username of the user (e.g., 'rix', 'andrew').
+            group_name (str): The group name/ group chat (identifier) to check.
+
+        Returns:
+            bool: True if the user is a member of the Group Chat.
+        """
+        return db.is_group_member(user_name, group_name)
@@ -1,14 +1,18 @@
 """Imports"""
 import os
-from flask import render_template, redirect, url_for, flash
+from flask import render_template, redirect, url_for, flash, current_app
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import check_password_hash
-from werkzeug.utils import secure_filename
 from models.database import db
+from models.passwords import verify_user_password, needs_rehash, hash_password
 from app import cache
+# Importing utils_admin loads the whole bp_admin package, whose modules import bp_auth:
+# they must only use modules loaded before this one (user, forms) or utils_admin itself
+from app.bp_admin.utils_admin import (
+    invalidate_choice_cache, get_cached_member_choices, save_upload, allowed_file, make_context
+)
 from .forms import LoginForm, RegisterForm, ProfileForm, NewGroupChatForm, MessageForm
 from . import bp_auth
-from .user import User
+from .user import User, invalidate_user_lookup
 from .messages import Message
 
 # Folder for uploaded files
@@ -17,24 +21,9 @@ UPLOAD_FOLDER = os.path.join("app", "static", "uploads")
 # Default image filename if no image is uploaded
 DEFAULT_IMAGE = 'default.jpeg'
 
-# Allowed file extensions for uploads
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
-
 # Create the upload folder if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-def allowed_file(filename):
-    """
-    Check if the uploaded file has an allowed extension.
-
-    Args:
-        filename (str): The name of the uploaded file.
-
-    Returns:
-        bool: True if the file has a valid extension, False otherwise.
-    """
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
 @bp_auth.route("/login", methods=["GET", "POST"])
 def login():
     """
@@ -55,15 +44,21 @@ def login():
         # Fetch user by username
         user = User.get_user_by_username(form.user_name.data)
         
-        # Authenticate user and check if account is active
-        if user and check_password_hash(user.password, form.password.data):
+        # Authenticate user and check if account is active; unknown usernames cost the
+        # same hashing time as wrong passwords so timing does not reveal which exist
+        if verify_user_password(user, form.password.data):
             if not user.active:
                 flash("Account is deactivated. Please contact support.", "danger")
                 return redirect(url_for("bp-auth.login"))
 
+            # Upgrade legacy or outdated hashes while the plain password is at hand
+            if needs_rehash(user.password):
+                db.set_password_hash(user.id, hash_password(form.password.data))
+                invalidate_user_lookup(user.id, user.user_name)
+
             # Log the user in
             login_user(user)
-            print(f"[DEBUG] Logged in as {user.user_name}, id={user.id}")
+            current_app.logger.debug("Logged in as %s, id=%s", user.user_name, user.id)
 
             # Display warning if applicable
             if (warning := db.get_user_warning(user.id)):
@@ -76,10 +71,10 @@ def login():
                 if reports:
                     flash(f"📋 You have {len(reports)} report(s) awaiting your response.", "info")
             elif user.user_type == "client":
-                responses = db.get_reports_with_new_professional_feedback(user.id)
+                # Fetched and marked as seen in one statement
+                responses = db.fetch_and_mark_new_professional_feedback(user.id)
                 if responses:
                     flash(f"✅ {len(responses)} report(s) received a professional response.", "success")
-                    db.mark_reports_as_seen_by_client([r["report_id"] for r in responses])
 
             flash("Logged in successfully.", "success")
             return redirect(url_for("bp-main.home"))
@@ -114,10 +109,7 @@ def register():
 
         # Check if image is valid and save it
         if image and allowed_file(image.filename):
-            filename = secure_filename(image.filename)
-            image_path = os.path.join(UPLOAD_FOLDER, filename)
-            image.save(image_path)
-            image_filename = filename
+            image_filename = save_upload(image, UPLOAD_FOLDER)
 
         try:
             # Prepare form data and create user
@@ -126,6 +118,8 @@ def register():
 
             # Create new user in the database
             User.create(data)
+            # New clients/professionals appear in the appointment dropdowns
+            invalidate_choice_cache(cache)
 
             flash("Account created! You can now log in.", "success")
             return redirect(url_for("bp-auth.login"))
@@ -177,10 +171,7 @@ def profile():
 
         # If a valid image is uploaded, save it
         if image and allowed_file(image.filename):
-            filename = secure_filename(image.filename)
-            image_path = os.path.join(UPLOAD_FOLDER, filename)
-            image.save(image_path)
-            image_filename = filename
+            image_filename = save_upload(image, UPLOAD_FOLDER)
 
         try:
             # Update the user profile information in the database
@@ -197,6 +188,8 @@ def profile():
                 image_filename,
                 current_user.id
             ))
+            invalidate_choice_cache(cache)  # Dropdowns show the user's full name
+            invalidate_user_lookup(current_user.id, current_user.user_name)
 
             # Refresh the user session after updating their profile
             updated_user = User.get_user_by_id(current_user.id)
@@ -233,27 +226,11 @@ def manage_groupchat():
     Returns:
         Response: Rendered template for message creation or redirect after successful submission.
     """
-
-    return _get_groupchat_cached()
-
-
-@cache.memoize(timeout=10)
-def _get_groupchat_cached():
-    """
-    Cached helper to render the View Manage Group Chat page with all our Group Chat.
-
-    Returns:
-        str: Rendered template displaying all Group Chat the current user is member of.
-    """
-
     # Initialize the form for the Group Chat creation
     form = NewGroupChatForm()
 
-    # Populate dropdowns with all users
-    users = db.get_all_user_with_names()
-    form.members.choices = [(None, 'Select a member')] + [
-        (u["user_name"], f"{u['fname']} {u['lname']} [id:{u['user_id']}]") for u in users
-    ]
+    # Populate dropdowns with all users (cached until users are added or edited)
+    form.members.choices = get_cached_member_choices(cache, db)
 
     # Handle form submission
     if form.validate_on_submit():
@@ -276,13 +253,30 @@ def _get_groupchat_cached():
             flash(f"Group Chat Creation error: {e}", "danger")
 
     # Get a list of all Group Chat the Logged user is member of.
-    groupchats = Message.get_group_name_by_member(current_user.user_name)
+    groupchats = _get_groupchats_cached(current_user.user_name)
     
     # Render the Manage Group Chat page with the list of all Group Chat the user is part of
     context = make_context("My Group Chats")
     return render_template("manage_groupchat.html", groupchats=groupchats, form=form, context=context)
 
 
+@cache.memoize(timeout=10)
+def _get_groupchats_cached(user_name):
+    """
+    Cached list of the Group Chats a user is member of.
+
+    Only the data is cached: the page itself carries the user's CSRF token, flashes
+    and navbar, so it is rendered per request.
+
+    Args:
+        user_name (str): Username of the member.
+
+    Returns:
+        list: Group Chat name rows for the user.
+    """
+    return [tuple(row) for row in Message.get_group_name_by_member(user_name)]
+
+
 # -------- Group Chat and its Messages
 
 @bp_auth.route("/groupchat/<string:group_name>", methods=["GET", "POST"])
@@ -300,47 +294,41 @@ def view_groupchat_messages(group_name):
     Returns:
         Response: Rendered message form or a redirect after submission.
     """
-    group_list = Message.get_group_name_by_member(current_user.user_name)
-
-    # Ensure the Logged User is a member of the current Group Chat
-    valid_group_name = False
-    for groupchat in group_list:
-        if groupchat[0] == group_name:
-            valid_group_name = True
-            break
-    # If not a member of the Group Chat, redirect to manage_groupchat
-    if valid_group_name is False:
+    # Ensure the Logged User is a member of the current Group Chat;
+    # if not, redirect to manage_groupchat
+    if not Message.is_member(current_user.user_name, group_name):
         flash("Unauthorized access", "danger")
         return redirect(url_for("bp-auth.manage_groupchat"))
     
-    return _get_messages_cached(group_name)
+    return _render_groupchat(group_name)
 
-# @cache.memoize(timeout=5)
-def _get_messages_cached(group_name):
-    """
-    Cached helper to render the View Group Chat page with all its previous messages displayed.
 
-    Returns:
-        str: Rendered template displaying messages of a Group Chat.
+def _render_groupchat(group_name):
     """
-    # Get a list of all previous messages sent in the current Group Chat
-    messages = Message.get_messages_by_group_name(group_name)
+    Handle the message form and render the View Group Chat page with its previous messages.
 
-    # Set the members attributed to the new message be the same as the last messages sent
-    members = messages[len(messages)-1]["members"]
+    Not cached: the page carries the user's CSRF token and flashes, and must show
+    a message as soon as it is sent.
 
+    Args:
+        group_name (str): Unique identifier of the Group Chat.
+
+    Returns:
+        Response: Rendered template displaying messages of a Group Chat, or a redirect after sending.
+    """
     # Initialize form for a message in a Group Chat
     form = MessageForm()
 
-    # Populate dropdowns with all users
-    users = db.get_all_user_with_names()
-    form.members.choices = [(None, 'Select a member')] + [
-        (u["user_name"], f"{u['fname']} {u['lname']} [id:{u['user_id']}]") for u in users
-    ]
+    # Populate dropdowns with all users (cached until users are added or edited)
+    form.members.choices = get_cached_member_choices(cache, db)
 
     # Handle form submission (POST request)
     if form.validate_on_submit():
         try:
+            # Set the members attributed to the new message be the same as the last message
+            # sent (read on its own: the history is only needed when the page is rendered)
+            members = Message.get_current_members(group_name) or ""
+
             if form.members.data is not None:
                 new_members = form.members.data + f", {members}"
             else:
@@ -355,8 +343,10 @@ def _get_messages_cached(group_name):
                 "contents": form.contents.data
             })
 
-            # Invalidate cached messages data to reflect recent changes
-            # invalidate_messages_caches(group_name)
+            if form.members.data is not None:
+                # The added member now sees this Group Chat in their list
+                # (cleared after the write, so no request can re-cache the old list)
+                invalidate_messages_caches()
 
             flash("Your message has been sent.", "success")
             return redirect(url_for("bp-auth.view_groupchat_messages", group_name=f"{group_name}"))
@@ -364,6 +354,9 @@ def _get_messages_cached(group_name):
         except Exception as e:
             flash(f"Message Creation error: {e}", "danger")
     
+    # Get a list of all previous messages sent in the current Group Chat
+    messages = Message.get_messages_by_group_name(group_name)
+
     # Render the Group Chat page with the list of previous messages and message form
     context = make_context("Group Chat", group_name)
     return render_template("groupchat.html", messages=messages, form=form, context=context)
@@ -371,38 +364,12 @@ def _get_messages_cached(group_name):
 
 # === Utilities ===
 
-def invalidate_messages_caches(group_name=None):
+def invalidate_messages_caches():
     """
-    Invalidate cached report data to ensure fresh data retrieval.
+    Invalidate the cached Group Chat lists after a Group Chat or its membership changes.
 
-    This function clears memoized caches for user messages (Group Chat) and optionally
-    clears specific caches for individual message if a message ID is provided.
-
-    Args:
-        group_name (int, optional): Specific Group Chat Identifier whose cache should be cleared.
-            Defaults to None.
+    Messages themselves are not cached, so only the per-user lists need clearing.
     """
 
-    # Clear cache for the list of Group Chats the Logged User is part of
-    cache.delete_memoized(_get_groupchat_cached)
-
-    if group_name:
-        # Clear cache for the specific Groupchat
-        cache.delete_memoized(_get_messages_cached, group_name)
-
-
-def make_context(title, heading=None):
-    """
-    Build a consistent context dictionary for template rendering.
-
-    Args:
-        title (str): Page title.
-        heading (str, optional): Page heading. Defaults to title if not provided.
-
-    Returns:
-        dict: Context containing 'page_title' and 'main_heading'.
-    """
-    return {
-        "page_title": title,
-        "main_heading": heading or title
-    }
\ No newline at end of file
+    # Clear the cached Group Chat lists of every user (membership may have changed)
+    cache.delete_memoized(_get_groupchats_cached)
@@ -1,7 +1,55 @@
 """User class for the application."""
+from operator import attrgetter
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash
+from app import cache
 from models.database import db
+from models.passwords import hash_password
+
+# Seconds a user row stays cached for logins and the per-request user loader
+USER_LOOKUP_TIMEOUT = 30
+
+
+@cache.memoize(timeout=USER_LOOKUP_TIMEOUT)
+def _get_user_row_by_id(user_id):
+    """
+    Fetch a user row by ID, cached so the user loader skips the database on most requests.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        tuple|None: The user's columns in User() argument order, or None (not cached).
+    """
+    row = db.get_user_by_id(user_id)
+    return tuple(row) if row else None
+
+
+@cache.memoize(timeout=USER_LOOKUP_TIMEOUT)
+def _get_user_row_by_username(user_name):
+    """
+    Fetch a user row by username, cached for repeated logins.
+
+    Args:
+        user_name (str): The username of the user.
+
+    Returns:
+        tuple|None: The user's columns in User() argument order, or None (not cached).
+    """
+    row = db.get_user_by_username(user_name)
+    return tuple(row) if row else None
+
+
+def invalidate_user_lookup(user_id, *user_names):
+    """
+    Drop the cached rows of a user after it is updated or deleted.
+
+    Args:
+        user_id (int): The ID of the user.
+        *user_names (str): Usernames the user was cached under (old and new on a rename).
+    """
+    cache.delete_memoized(_get_user_row_by_id, int(user_id))
+    for user_name in user_names:
+        cache.delete_memoized(_get_user_row_by_username, user_name)
 
 
 class User(UserMixin):
@@ -31,6 +79,15 @@ class User(UserMixin):
         warning_count (int): The number of warnings the user has received.
     """
 
+    # One instance is built per request by the user loader. These fields live in slot
+    # descriptors; UserMixin declares no __slots__, so instances still get a __dict__,
+    # which merely stays empty unless other attributes are set
+    __slots__ = (
+        "id", "active", "user_type", "access_level", "user_name", "fname", "lname",
+        "email", "user_image", "password", "phone_number", "address", "age",
+        "specialty", "pay_rate", "warning", "warning_count"
+    )
+
     def __init__(self, user_id, active, user_type, access_level, user_name,
                  fname, lname, email, user_image, password, phone_number,
                  address, age, specialty=None, pay_rate=None, warning=None, warning_count=0):
@@ -77,23 +134,22 @@ class User(UserMixin):
 
 
     @staticmethod
-    def create(data):
+    def _prepare_user_data(data):
         """
-        Create a new user in the database.
+        Build the database row for a new user.
 
         This method hashes the password, determines the user's role, sets default values for 
-        missing fields, and creates the user in the database. It also assigns an appropriate
-        access level based on the user's role.
+        missing fields, and assigns an appropriate access level based on the user's role.
 
         Args:
             data (dict): Dictionary containing user data such as username, password, 
                          first name, last name, email, etc.
 
         Returns:
-            object: The newly created user record from the database.
+            dict: The values to insert for the user.
         """
         # Hash the provided password
-        hashed = generate_password_hash(data["password"])
+        hashed = hash_password(data["password"])
 
         # Set the user type (default to 'client' if not provided)
         user_type = data.get("user_type", "client")
@@ -119,8 +175,36 @@ class User(UserMixin):
             "specialty": data.get("specialty", "Hair-Dresser" if user_type == "professional" else None)  # Specialty for professionals
         }
 
-        # Call the database method to create the user and return the result
-        return db.create_user(user_data)
+        return user_data
+
+
+    @staticmethod
+    def create(data):
+        """
+        Create a new user in the database.
+
+        Args:
+            data (dict): Dictionary containing user data such as username, password, 
+                         first name, last name, email, etc.
+
+        Returns:
+            int: The ID of the newly created user.
+        """
+        return User.bulk_create([data])[0]
+
+
+    @staticmethod
+    def bulk_create(data_list):
+        """
+        Create several users in a single INSERT and transaction (e.g. for imports).
+
+        Args:
+            data_list (list): Dictionaries in the format accepted by create().
+
+        Returns:
+            list: The IDs of the newly created users, in input order.
+        """
+        return db.create_users([User._prepare_user_data(data) for data in data_list])
 
 
 
@@ -136,8 +220,8 @@ class User(UserMixin):
         Returns:
             User: The user object if found, or None if not found.
         """
-        # TODO: Change based on how db methods are implemented
-        row = db.get_user_by_id(user_id)
+        # Flask-Login passes the ID from the session as a string; normalise the cache key
+        row = _get_user_row_by_id(int(user_id))
         return User(*row) if row else None
 
 
@@ -152,84 +236,38 @@ class User(UserMixin):
         Returns:
             User: The user object if found, or None if not found.
         """
-        # TODO: Change based on how db methods are implemented
-        row = db.get_user_by_username(user_name)
+        row = _get_user_row_by_username(user_name)
         return User(*row) if row else None
 
 
     @staticmethod
-    def get_users_by_type(user_type):
+    def get_users_by_usernames(user_names):
         """
-        Get all users of a specific type.
+        Retrieve several users by username with one query.
 
         Args:
-            user_type (str): The type of users to retrieve (e.g., 'client', 'professional').
+            user_names (list): The usernames of the users to retrieve.
 
         Returns:
-            list: A list of User objects matching the given user_type.
+            dict: {user_name: User} for the usernames that exist.
         """
-        rows = db.get_users_by_type(user_type)
-        return [User(*row) for row in rows]
-
+        return {row["user_name"]: User(*row) for row in db.get_users_by_usernames(user_names)}
 
-    @property
-    def user_id(self):
-        """
-        Property to retrieve the user ID.
 
-        Returns:
-            int: The unique ID of the user.
+    @staticmethod
+    def get_users_by_type(user_type):
         """
-        return self.id
-
-
-
-
-class ProfessionalUser(User):
-    """
-    Professional user class for users with a specific profession.
-
-    Inherits from the User class and sets default values for professional-specific
-    attributes, such as pay rate and specialty. The user_type is automatically set to
-    'professional' for this class.
+        Get all users of a specific type.
 
-    Attributes:
-        pay_rate (float): The pay rate for the professional (default is 15.75).
-        specialty (str): The user's professional specialty (default is 'Hair-Dresser').
-    """
+        Args:
+            user_type (str): The type of users to retrieve (e.g., 'client', 'professional').
 
-    def __init__(self, user_id, active, user_type, access_level, user_name, fname, lname,
-                 email, user_image, password, phone_number, address, age,
-                 pay_rate=15.75, specialty="Hair-Dresser"):
+        Returns:
+            list: A list of User objects matching the given user_type.
         """
-        Initialize a new ProfessionalUser object.
+        rows = db.get_users_by_type(user_type)
+        return [User(*row) for row in rows]
 
-        Args:
-            user_id (int): The unique ID for the user.
-            active (bool): Indicates if the user account is active.
-            user_type (str): The type of user, default is 'professional'.
-            access_level (int): The user's access level.
-            user_name (str): The username for login.
-            fname (str): The user's first name.
-            lname (str): The user's last name.
-            email (str): The user's email address.
-            user_image (str): The filename for the user's profile image.
-            password (str): The user's password (hashed).
-            phone_number (str): The user's phone number.
-            address (str): The user's address.
-            age (int): The user's age.
-            pay_rate (float, optional): The professional's pay rate (default is 15.75).
-            specialty (str, optional): The professional's specialty (default is 'Hair-Dresser').
-
-        """
-        # Initialize base User class with general attributes
-        super().__init__(user_id, active, user_type, access_level, user_name, fname, lname,
-                         email, user_image, password, phone_number, address, age)
-        
-        # Set user type to 'professional' for this subclass
-        self.user_type = "professional"
-        
-        # Set default or provided pay rate and specialty for professionals
-        self.pay_rate = pay_rate
-        self.specialty = specialty
 
+    # Alias of id (read through a C-level getter rather than a Python function call)
+    user_id = property(attrgetter("id"), doc="int: The unique ID of the user.")
@@ -1,9 +1,7 @@
 from flask import Blueprint, render_template
-from flask_login import current_user
 from app.bp_auth.user import User
 from app import cache
 from models.database import db
-from app.bp_auth.user import User
 
 # Blueprint for the main routes of the application.
 bp_main = Blueprint(
@@ -14,6 +12,10 @@ bp_main = Blueprint(
     static_url_path='/bp_main/static/'
 )
 
+# Usernames of the super admins presented on the About page, in display order
+SUPER_ADMIN_USERNAMES = ("andrew", "alexander", "rix")
+
+
 @bp_main.route("/")
 @bp_main.route("/home")
 def home():
@@ -23,23 +25,15 @@ def home():
 @bp_main.route("/about")
 def about():
     """Render the About page with context including super admin users."""
-
-    image_path = {}
-    username = ["andrew", "alexander", "rix"]
-    for user in username:
-        if (single_user := User.get_user_by_username(user)):
-            image_path[user] = single_user.user_image
-    
-    return _render_about(current_user.is_authenticated, image_path)
-
-
-@cache.memoize(timeout=300)
-def _render_about(_auth_flag, image_path):
+    # The page is rendered per request (the navbar shows the signed-in user);
+    # the admin records and their images come from one cached lookup
+    super_admins = get_super_admins_cached()
     context = {
         "page_title": "About",
         "main_heading": "About Page",
-        "super_admins": get_super_admins_cached()
+        "super_admins": super_admins
     }
+    image_path = {admin.user_name: admin.user_image for admin in super_admins}
     return render_template("about.html", context=context, image_path=image_path)
 
 
@@ -51,8 +45,6 @@ def get_super_admins_cached():
     Returns:
         list: List of User objects for super admin usernames.
     """
-    # List comprehension to filter existing users by their usernames
-    return [
-        user for username in ["andrew", "alexander", "rix"]
-        if (user := User.get_user_by_username(username))
-    ]
+    # One query for all of them, then keep the display order and skip missing users
+    users = User.get_users_by_usernames(SUPER_ADMIN_USERNAMES)
+    return [users[username] for username in SUPER_ADMIN_USERNAMES if username in users]
@@ -3,6 +3,29 @@ from wtforms import StringField, SelectField, SubmitField, HiddenField, TextArea
 from wtforms.validators import DataRequired, Length
 from flask_login import current_user
 from models.database import db
+from app import cache
+from app.bp_admin.utils_admin import get_cache_rev, APPOINTMENTS_REV_KEY
+
+# Status choices of a report, shared by every ProfessionalReportForm
+REPORT_STATUS_CHOICES = (("open", "Open"), ("closed", "Closed"))
+
+
+@cache.memoize(timeout=300)
+def _get_report_appointment_choices(rev, user_id):
+    """
+    Cached appointment dropdown of a client's report form.
+
+    Args:
+        rev (int): Current appointments generation; any appointment change invalidates the entry.
+        user_id (int): ID of the client.
+
+    Returns:
+        list: A list of (appointment_id, label) tuples.
+    """
+    return [
+        (appt_id, f"Appt {appt_id}")
+        for appt_id in db.get_appointment_ids_by_consumer(user_id)
+    ]
 
 
 class ClientReportForm(FlaskForm):
@@ -28,13 +51,12 @@ class ClientReportForm(FlaskForm):
         """
         super().__init__(*args, **kwargs)
         if current_user.is_authenticated:
-            # Fetch appointments for the currently logged-in user
-            appointments = db.get_appointments_by_user(current_user.user_id)
-            # Populate appointment choices as tuples of (id, description)
-            self.appointment_id.choices = [
-                (appt["appointment_id"], f"Appt {appt['appointment_id']}")
-                for appt in appointments
-            ]
+            # Populate appointment choices as tuples of (id, description) for the currently
+            # logged-in user. Still needed on POST: SelectField only accepts a listed ID,
+            # which is what stops a client from reporting on someone else's appointment.
+            self.appointment_id.choices = _get_report_appointment_choices(
+                get_cache_rev(cache, APPOINTMENTS_REV_KEY), current_user.user_id
+            )
 
 
 class ProfessionalReportForm(FlaskForm):
@@ -51,7 +73,7 @@ class ProfessionalReportForm(FlaskForm):
     )
     status = SelectField(
         "Status",
-        choices=[("open", "Open"), ("closed", "Closed")],
+        choices=REPORT_STATUS_CHOICES,
         validators=[DataRequired()]
     )
     submit = SubmitField("Submit Response")
@@ -4,6 +4,7 @@ from .report import Report
 from .forms import ClientReportForm, ProfessionalReportForm
 from models.database import db
 from app import cache
+from app.bp_admin.utils_admin import delete_memoized_many
 from flask import Blueprint
 
 bp_report = Blueprint("bp-report", __name__, template_folder="templates", static_folder="static", static_url_path='/bp_report/static/')
@@ -15,19 +16,22 @@ def invalidate_report_caches(report_id=None):
 
     This function clears memoized caches for user reports and optionally
     clears specific caches for individual reports if a report ID is provided.
+    All keys are removed together by delete_memoized_many (one Redis round-trip).
 
     Args:
         report_id (int, optional): Specific report ID whose cache should be cleared.
             Defaults to None.
     """
     # Clear cached user reports based on current user details
-    cache.delete_memoized(_get_user_reports_cached, current_user.id, current_user.user_type)
+    calls = [(_get_user_reports_cached, current_user.id, current_user.user_type)]
 
     if report_id:
         # Clear cache for the specific report detail
-        cache.delete_memoized(_get_report_cached, report_id)
+        calls.append((_get_report_cached, report_id))
         # Clear cache for the detailed view of the report in 'my_reports' context
-        cache.delete_memoized(_get_report_view_cached, report_id, "my_reports")
+        calls.append((_get_report_view_cached, report_id, "my_reports"))
+
+    delete_memoized_many(cache, *calls)
 
 
 # === Routes ===
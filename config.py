@@ -1,6 +1,9 @@
+import logging
 import os
 import secrets
 
+logger = logging.getLogger(__name__)
+
 class Config:
     """
     Configuration class for the application.
@@ -19,6 +22,34 @@ class Config:
     DATABASE_USER = os.environ.get("DATABASE_USER", "andrew")  # Default to 'andrew' if not set
     DATABASE_PASSWORD = os.environ.get("DATABASE_PASSWORD", "password")  # Default to 'password' if not set
     DATABASE_PORT = int(os.environ.get("DATABASE_PORT", 5432))  # Default to port 5432 if not set
+    DATABASE_POOL_MIN = int(os.environ.get("DATABASE_POOL_MIN", 1))  # Connections opened at startup
+    DATABASE_POOL_MAX = int(os.environ.get("DATABASE_POOL_MAX", 20))  # Upper bound of pooled connections
+
+    # Directory where compiled Jinja templates are persisted between worker restarts
+    # (defaults to <instance path>/jinja_cache when unset)
+    JINJA_CACHE_DIR = os.environ.get("JINJA_CACHE_DIR")
+
+    # Cache settings: a shared Redis cache when REDIS_URL is set, so every Gunicorn worker
+    # sees the same entries and invalidations; otherwise fall back to an in-process cache
+    CACHE_REDIS_URL = os.environ.get("REDIS_URL")
+    CACHE_TYPE = "RedisCache" if CACHE_REDIS_URL else "SimpleCache"
+    CACHE_DEFAULT_TIMEOUT = int(os.environ.get("CACHE_DEFAULT_TIMEOUT", 60))
+    CACHE_KEY_PREFIX = "salon:"
+    # Degrade to a cache miss instead of stalling a request when Redis is slow
+    CACHE_OPTIONS = {"socket_timeout": 0.2} if CACHE_REDIS_URL else None
+
+    # JWT signing for the API: HS256 (symmetric HMAC) is the cheapest algorithm to sign and
+    # verify; the key is read from the environment once, at import
+    JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "super-secret-key")
+    JWT_ALGORITHM = "HS256"
+
+    # Level of the application logger; debug messages are dropped before formatting
+    # unless this is lowered (e.g. LOG_LEVEL=DEBUG in development)
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING")
 
-# For debugging: Print the database configuration to verify the values
-print(Config.DATABASE_HOST, Config.DATABASE_NAME, Config.DATABASE_USER, Config.DATABASE_PASSWORD, Config.DATABASE_PORT)
\ No newline at end of file
+# For debugging: log the database target (never the password); arguments are only
+# formatted if a handler accepts DEBUG records
+logger.debug(
+    "Database %s@%s:%s/%s",
+    Config.DATABASE_USER, Config.DATABASE_HOST, Config.DATABASE_PORT, Config.DATABASE_NAME
+)
\ No newline at end of file
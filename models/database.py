@@ -1,52 +1,291 @@
 import os
+import threading
+import uuid
+from concurrent.futures import Future
 import psycopg2
+import psycopg2.errors
+from flask import g, has_app_context
 from config import Config
 from contextlib import contextmanager
-from werkzeug.security import check_password_hash
 import psycopg2.extras
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import DictCursor, RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+from models.passwords import verify_password
 import logging
 
 # Logger for database-related errors and information
 logger = logging.getLogger(__name__)
 
+# Hourly rate used for professionals who have no pay_rate set
+DEFAULT_PAY_RATE = 15.75
+
+# Sort keys accepted by get_appointments_page, mapped to the column they order by
+APPOINTMENT_SORT_COLUMNS = {
+    "date": "sa.date_appoint",
+    "date_appoint": "sa.date_appoint",
+    "slot": "sa.slot",
+    "provider": "sa.provider_name",
+    "consumer": "sa.consumer_name",
+    "status": "sa.status"
+}
+
+# Number of most recent messages loaded when a group chat is opened
+MESSAGE_HISTORY_LIMIT = 200
+
+# Matches one username against the comma-separated members column of messages
+MEMBER_MATCH_SQL = r"%s = ANY(regexp_split_to_array(members, '\s*,\s*'))"
+
+# Report statuses shown under each status tab of the admin Manage Reports page
+REPORT_STATUS_MAP = {
+    "open": ("open", "grieve", "done"),
+    "closed": ("closed",)
+}
+
+# Columns of a full user row, in the order User(*row) and the admin views expect
+USER_COLUMNS = """
+    user_id, active, user_type, access_level, user_name, fname, lname, email,
+    user_image, password, phone_number, address, age, specialty, pay_rate,
+    warning, warning_count
+"""
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """Pooled connection that remembers which server-side prepared statements it holds."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()  # Names of the statements already PREPAREd on this session
+        self.in_transaction = False  # True while a Database.transaction() block is open
+
 class Database:
-    """Database class for handling PostgreSQL database operations."""
+    """Database class for handling PostgreSQL database operations through a connection pool."""
     
-    def __init__(self, autocommit=True):
+    def __init__(self, autocommit=True, minconn=None, maxconn=None):
         """
-        Initialize the Database instance and establish a connection.rm 
+        Initialize the Database instance and create its connection pool.
+
+        Connections are checked out of the pool for a single call and released as soon as
+        the rows are fetched, so concurrent requests run their queries in parallel instead
+        of sharing one connection.
 
         Args:
-            autocommit (bool): Whether to enable autocommit for the database connection. Defaults to True.
+            autocommit (bool): Whether to enable autocommit for pooled connections. Defaults to True.
+            minconn (int, optional): Connections opened up front. Defaults to Config.DATABASE_POOL_MIN.
+            maxconn (int, optional): Upper bound of open connections. Defaults to Config.DATABASE_POOL_MAX.
         """
-        # Establish a connection to the database
-        self.__connection = self.__connect()
-        self.__connection.autocommit = autocommit
+        self.__autocommit = autocommit
+        self.__minconn = minconn or Config.DATABASE_POOL_MIN
+        self.__maxconn = maxconn or Config.DATABASE_POOL_MAX
+        # Callers wait for a free connection instead of getting a PoolError when all are in use
+        self.__available = threading.BoundedSemaphore(self.__maxconn)
+        self.__statements = {}  # Prepared statement name -> SQL text (with $1, $2... placeholders)
+        self.__local = threading.local()  # Connection reserved for a worker thread (see submit)
+        self.__pool = self.__create_pool()
 
-    def __connect(self):
+    def __create_pool(self):
         """
-        Establish a connection to the PostgreSQL database using configuration from the Config class.
+        Create the PostgreSQL connection pool using configuration from the Config class.
+
+        Rows are returned by DictCursor, so they can be read by position (row[4]) or by
+        column name (row["user_name"]).
 
         Returns:
-            psycopg2.extensions.connection: A connection object to interact with the database.
+            psycopg2.pool.ThreadedConnectionPool: A thread-safe pool of database connections.
 
         Raises:
             DatabaseConnectionError: If there is an error connecting to the database.
         """
         try:
-            return psycopg2.connect(
+            return ThreadedConnectionPool(
+                self.__minconn,
+                self.__maxconn,
                 host=Config.DATABASE_HOST,
                 database=Config.DATABASE_NAME,
                 user=Config.DATABASE_USER,
                 password=Config.DATABASE_PASSWORD,
-                port=Config.DATABASE_PORT
+                port=Config.DATABASE_PORT,
+                connection_factory=PooledConnection,
+                cursor_factory=DictCursor
             )
         except psycopg2.Error as e:
             # Log the error and raise a custom exception
             raise DatabaseConnectionError(f"Database connection error: {e}") from e
 
-    
+    def __checkout(self):
+        """
+        Take a live connection out of the pool.
+
+        Connections that were closed by the server are discarded and replaced, up to 3 attempts.
+
+        Returns:
+            psycopg2.extensions.connection: An open pooled connection.
+
+        Raises:
+            DatabaseConnectionError: If no open connection could be obtained after 3 attempts.
+        """
+        for _ in range(3):
+            try:
+                conn = self.__pool.getconn()
+            except psycopg2.Error as e:
+                logger.warning("Could not open a pooled connection: %s", e)
+                continue
+            if conn.closed:
+                self.__pool.putconn(conn, close=True)  # Drop dead connections from the pool
+                continue
+            if conn.autocommit != self.__autocommit:
+                conn.autocommit = self.__autocommit
+            return conn
+        raise DatabaseConnectionError("Failed to get a database connection after 3 attempts")
+
+    def __acquire(self):
+        """
+        Wait for a free pool slot and check a connection out.
+
+        Returns:
+            psycopg2.extensions.connection: An open pooled connection.
+        """
+        self.__available.acquire()
+        try:
+            return self.__checkout()
+        except Exception:
+            self.__available.release()
+            raise
+
+    def __release(self, conn, close=False):
+        """
+        Return a connection to the pool and free its slot.
+
+        Args:
+            conn (psycopg2.extensions.connection): The connection to give back.
+            close (bool): Close it instead of keeping it for the next caller.
+        """
+        try:
+            self.__pool.putconn(conn, close=close or bool(conn.closed))
+        finally:
+            self.__available.release()
+
+    def submit(self, executor, fn, *args):
+        """
+        Run a db call on a worker thread with its own pooled connection, if one is free now.
+
+        The worker's pool slot is reserved here without waiting: a request holding its own
+        connection must never block on a second one, or the pool deadlocks once every slot
+        belongs to a request waiting on its worker. When no slot is spare, fn runs right
+        away on the caller's connection, so callers need no fallback of their own.
+
+        Args:
+            executor (Executor): The thread pool to run fn on.
+            fn (callable): A db call (no app context is available on the worker).
+            *args: Arguments for fn.
+
+        Returns:
+            Future: The result of fn.
+        """
+        if not self.__available.acquire(blocking=False):
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        try:
+            return executor.submit(self.__run_reserved, fn, args)
+        except BaseException:
+            self.__available.release()
+            raise
+
+    def __run_reserved(self, fn, args):
+        """
+        Run fn on a worker thread with a connection checked out on the slot reserved by submit.
+
+        Args:
+            fn (callable): The db call.
+            args (tuple): Arguments for fn.
+
+        Returns:
+            object: The result of fn.
+        """
+        try:
+            conn = self.__checkout()
+        except Exception:
+            self.__available.release()
+            raise
+        self.__local.conn = conn
+        broken = False
+        try:
+            return fn(*args)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.__local.conn = None
+            self.__release(conn, close=broken)
+
+    def init_app(self, app):
+        """
+        Scope connections to the Flask application context.
+
+        While a request (app context) is active, every call reuses one pooled connection
+        pinned on flask.g; it goes back to the pool when the context tears down.
+
+        Args:
+            app (Flask): The application to register the teardown handler on.
+        """
+        app.teardown_appcontext(self.release_request_connection)
+
+    def release_request_connection(self, exc=None):
+        """
+        Return the connection pinned to the current app context to the pool.
+
+        Args:
+            exc (Exception, optional): The exception that ended the context, if any.
+        """
+        conn = g.pop("_db_conn", None)
+        if conn is not None:
+            self.__release(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager providing a pooled connection.
+
+        Inside an app context the request's pinned connection is used (and checked out on
+        first use); elsewhere, e.g. in worker threads, a connection is checked out for the
+        block only. Connections that failed with a connection-level error are closed instead
+        of being handed to the next caller.
+
+        Yields:
+            psycopg2.extensions.connection: A pooled connection object.
+        """
+        conn = getattr(self.__local, "conn", None)
+        if conn is not None:
+            yield conn  # Worker thread running a submit() call on its reserved connection
+            return
+
+        if has_app_context():
+            conn = g.get("_db_conn")
+            if conn is None or conn.closed:
+                if conn is not None:
+                    self.release_request_connection()
+                conn = g._db_conn = self.__acquire()
+            try:
+                yield conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                self.__release(g.pop("_db_conn"), close=True)
+                raise
+            return
+
+        conn = self.__acquire()
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.__release(conn, close=broken)
+
     def execute(self, query, params=None):
         """
         Execute a database query with optional parameters.
@@ -55,9 +294,8 @@ class Database:
             query (str): The SQL query string to execute.
             params (tuple, optional): A tuple of parameters to pass with the query.
         """
-        with self.__connection.cursor() as cur:
+        with self.cursor() as cur:
             cur.execute(query, params)  # Execute the query with the parameters
-            self.__connection.commit()  # Commit the transaction to the database
 
     def fetch(self, query, params=None):
         """
@@ -68,87 +306,178 @@ class Database:
             params (tuple, optional): A tuple of parameters to pass with the query.
 
         Returns:
-            list: A list of tuples representing the rows returned by the query.
+            list: A list of rows returned by the query.
         """
-        with self.__connection.cursor() as cur:
+        with self.cursor() as cur:
             cur.execute(query, params)  # Execute the query with the parameters
             return cur.fetchall()  # Return all rows of the query result
 
-    def __reconnect(self):
+    def fetch_tuples(self, query, params=None):
         """
-        Attempt to reconnect to the database if the current connection is lost.
-        
-        This method closes the existing connection (if possible) and tries to re-establish it.
-        """
-        try:
-            self.close()  # Attempt to close the existing connection
-        except psycopg2.Error:
-            pass  # If closing fails, ignore it and proceed
-        self.__connection = self.__connect()  # Reconnect to the database
+        Execute a query and fetch all results as plain tuples.
 
-    def db_conn(self):
-        """
-        Return the current database connection object.
+        Cheaper than the pool's default DictCursor rows when the caller knows the
+        column order, e.g. to build a dict straight from (key, value) rows.
+
+        Args:
+            query (str): The SQL query string to execute.
+            params (tuple, optional): A tuple of parameters to pass with the query.
 
         Returns:
-            psycopg2.extensions.connection: The current database connection object.
+            list: A list of tuples returned by the query.
         """
-        return self.__connection
+        with self.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
 
-    def close(self):
+    def prepare(self, name, query):
         """
-        Close the current database connection.
+        Register a statement to be prepared server-side, so Postgres parses and plans it
+        once per pooled connection instead of on every call.
 
-        If the connection exists, it will be closed and set to None.
+        Args:
+            name (str): Identifier of the statement.
+            query (str): The SQL text, using $1, $2... placeholders.
         """
-        if self.__connection is not None:
-            self.__connection.close()  # Close the connection
-            self.__connection = None  # Set the connection to None to indicate it's closed
+        self.__statements[name] = query
+
+    def execute_prepared(self, cur, name, params):
+        """
+        Execute a registered prepared statement, preparing it on the cursor's connection on first use.
+
+        Args:
+            cur (psycopg2.extensions.cursor): The cursor to execute with (e.g. from transaction()).
+            name (str): Identifier given to prepare().
+            params (tuple): Values for the $1, $2... placeholders, in order.
+        """
+        conn = cur.connection
+        if name not in conn.prepared:
+            cur.execute(f"PREPARE {name} AS {self.__statements[name]}")
+            conn.prepared.add(name)
+        if not params:
+            cur.execute(f"EXECUTE {name}")
+            return
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXECUTE {name} ({placeholders})", params)
 
-    def get_cursor(self):
+    def fetch_prepared(self, name, params=()):
         """
-        Get a new cursor for interacting with the database.
+        Execute a registered prepared statement and fetch all results.
 
-        Attempts to get a database cursor up to 3 times before raising an exception if it fails.
+        Args:
+            name (str): Identifier given to prepare().
+            params (tuple, optional): Values for the $1, $2... placeholders, in order.
 
         Returns:
-            psycopg2.extensions.cursor: A cursor object for database interaction.
+            list: A list of rows returned by the statement.
+        """
+        with self.cursor() as cur:
+            self.execute_prepared(cur, name, params)
+            return cur.fetchall()
 
-        Raises:
-            DatabaseConnectionError: If a cursor cannot be retrieved after 3 attempts.
+    def close(self):
         """
-        for _ in range(3):
-            try:
-                return self.__connection.cursor()  # Try to get a cursor
-            except psycopg2.Error:
-                self.__reconnect()  # If an error occurs, try to reconnect
-        raise DatabaseConnectionError("Failed to get a database cursor after 3 attempts")  # Raise an error if all attempts fail
+        Close every connection held by the pool.
 
+        The pool cannot be used afterwards.
+        """
+        if self.__pool is not None and not self.__pool.closed:
+            self.__pool.closeall()  # Close all pooled connections
 
     @contextmanager
-    def cursor(self):
+    def cursor(self, cursor_factory=None):
         """
         Context manager for database cursor to ensure proper resource handling.
 
-        Provides a database cursor within the context and ensures that the transaction 
+        Provides a database cursor on a pooled connection and ensures that the transaction 
         is committed if no exceptions are raised. If an exception occurs, the transaction
-        is rolled back to maintain data integrity.
+        is rolled back to maintain data integrity. The connection goes back to the pool
+        when the block exits.
+
+        Args:
+            cursor_factory (type, optional): Cursor class to use instead of the pool's DictCursor.
 
         Yields:
             psycopg2.extensions.cursor: A cursor object for interacting with the database.
 
         Raises:
-            Exception: If any exception occurs during query execution, it is raised.
+            SlotTakenError: If the statement would double-book a professional's slot.
+            Exception: If any other exception occurs during query execution, it is raised.
         """
-        cur = self.get_cursor()  # Get a new cursor for interacting with the database
-        try:
-            yield cur  # Yield the cursor to be used in the context block
-            self.__connection.commit()  # Commit the transaction if no errors occurred
-        except Exception as e:
-            self.__connection.rollback()  # Rollback the transaction in case of an error
-            raise e  # Re-raise the exception
-        finally:
-            cur.close()  # Ensure the cursor is closed after the operation
+        with slot_conflicts(), self.connection() as conn:
+            cur = conn.cursor(cursor_factory=cursor_factory) if cursor_factory else conn.cursor()
+            try:
+                yield cur  # Yield the cursor to be used in the context block
+                if not conn.in_transaction:
+                    conn.commit()  # Commit the transaction if no errors occurred
+            except Exception as e:
+                if not conn.in_transaction:
+                    conn.rollback()  # Rollback the transaction in case of an error
+                raise e  # Re-raise the exception
+            finally:
+                cur.close()  # Ensure the cursor is closed after the operation
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager that runs every statement of the block in one database transaction.
+
+        Autocommit is switched off on the pooled connection for the duration of the block,
+        so the statements are committed together on success or rolled back together on error.
+
+        Yields:
+            psycopg2.extensions.cursor: A cursor bound to the open transaction.
+
+        Raises:
+            SlotTakenError: If a statement would double-book a professional's slot.
+        """
+        with slot_conflicts(), self.connection() as conn:
+            conn.autocommit = False
+            conn.in_transaction = True  # Other calls on this connection must not commit early
+            try:
+                with conn.cursor() as cur:
+                    yield cur
+                conn.commit()  # Commit all statements at once
+            except Exception:
+                conn.rollback()  # Undo every statement of the block
+                raise
+            finally:
+                conn.in_transaction = False
+                if not conn.closed:
+                    conn.autocommit = self.__autocommit
+
+    def iter_rows(self, query, params=None, itersize=500):
+        """
+        Stream the rows of a query through a server-side cursor instead of loading them all.
+
+        Rows are fetched from the server itersize at a time while the caller iterates. The
+        connection stays in a transaction until the generator is exhausted or closed.
+
+        Args:
+            query (str): The SQL query string to execute.
+            params (tuple, optional): A tuple of parameters to pass with the query.
+            itersize (int): Number of rows fetched per round trip.
+
+        Yields:
+            Row: Each row of the query result.
+        """
+        with self.connection() as conn:
+            conn.autocommit = False  # Named cursors live inside a transaction
+            conn.in_transaction = True
+            try:
+                with conn.cursor(name=f"iter_{uuid.uuid4().hex}") as cur:
+                    cur.itersize = itersize
+                    cur.execute(query, params)
+                    yield from cur
+                conn.commit()
+            except BaseException:
+                # Also reached when the consumer stops early (GeneratorExit)
+                conn.rollback()
+                raise
+            finally:
+                conn.in_transaction = False
+                if not conn.closed:
+                    conn.autocommit = self.__autocommit
 
     def __run_file(self, file_path):
         """
@@ -163,7 +492,7 @@ class Database:
         Raises:
             DatabaseConnectionError: If there is an error while executing the SQL script.
         """
-        with self.__connection.cursor() as cursor:
+        with self.connection() as conn, conn.cursor() as cursor:
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     statement = ''
@@ -175,9 +504,9 @@ class Database:
                         if line.strip().endswith(';'):
                             cursor.execute(statement)  # Execute the SQL statement
                             statement = ''  # Reset the statement for the next query
-                self.__connection.commit()  # Commit the transaction after running the script
+                conn.commit()  # Commit the transaction after running the script
             except psycopg2.Error as e:
-                self.__connection.rollback()  # Rollback if an error occurs
+                conn.rollback()  # Rollback if an error occurs
                 raise DatabaseConnectionError(f"Error running SQL script {file_path}: {e}") from e
 
     def run_sql_script(self, sql_filename, close_after=True):
@@ -202,11 +531,12 @@ class Database:
 
     def __del__(self):
         """
-        Cleanup method to close the database connection when the object is destroyed.
+        Cleanup method to close the pooled connections when the object is destroyed.
 
-        Ensures that the database connection is properly closed to release resources.
+        Ensures that the database connections are properly closed to release resources.
         """
-        self.close()  # Close the database connection when the object is deleted
+        if getattr(self, "_Database__pool", None) is not None:
+            self.close()  # Close the pooled connections when the object is deleted
 
 
 
@@ -231,11 +561,11 @@ class Database:
         if not row:
             return False
 
-        # Extract the hashed password from the retrieved user data (index 9 corresponds to 'password' column)
-        hashed_password = row[9]  # Column index for 'password'
+        # Extract the hashed password from the retrieved user data
+        hashed_password = row["password"]
         
         # Compare the provided plain password with the stored hashed password
-        return check_password_hash(hashed_password, plain_password)  # Return True if passwords match, False otherwise
+        return verify_password(hashed_password, plain_password)  # Return True if passwords match, False otherwise
 
     
     def create_user(self, user_data):
@@ -251,33 +581,53 @@ class Database:
         Returns:
             int: The user ID of the newly inserted user.
         """
-        # Define the SQL query for inserting a new user into the salon_user table
+        return self.create_users([user_data])[0]
+
+
+    def create_users(self, users_data):
+        """
+        Insert several users into the salon_user table in one statement and transaction.
+
+        Args:
+            users_data (list): Dictionaries with the same keys as create_user() expects.
+
+        Returns:
+            list: The user IDs of the newly inserted users, in input order.
+        """
+        # Define the SQL query for inserting users; execute_values expands the VALUES list
         query = """
         INSERT INTO salon_user (
             user_type, access_level, user_name, fname, lname, email,
             password, phone_number, address, age, pay_rate, specialty
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ) VALUES %s
         RETURNING user_id;
         """
 
         # Prepare the values to insert into the database
-        values = (
-            user_data.get("user_type", "client"),  # Default to "client" if not provided
-            user_data.get("access_level", 1),  # Default to 1 if not provided
-            user_data["user_name"],  # Username (required)
-            user_data["fname"],  # First name (required)
-            user_data["lname"],  # Last name (required)
-            user_data["email"],  # Email address (required)
-            user_data["password"],  # Password (required)
-            user_data.get("phone_number", "514-123-4567"),  # Default to "514-123-4567" if not provided
-            user_data.get("address", "Montreal"),  # Default to "Montreal" if not provided
-            user_data.get("age", 18),  # Default to 18 if not provided
-            user_data.get("pay_rate"),  # Pay rate (optional)
-            user_data.get("specialty")  # Specialty (optional)
-        )
+        values = [
+            (
+                user_data.get("user_type", "client"),  # Default to "client" if not provided
+                user_data.get("access_level", 1),  # Default to 1 if not provided
+                user_data["user_name"],  # Username (required)
+                user_data["fname"],  # First name (required)
+                user_data["lname"],  # Last name (required)
+                user_data["email"],  # Email address (required)
+                user_data["password"],  # Password (required)
+                user_data.get("phone_number", "514-123-4567"),  # Default to "514-123-4567" if not provided
+                user_data.get("address", "Montreal"),  # Default to "Montreal" if not provided
+                user_data.get("age", 18),  # Default to 18 if not provided
+                user_data.get("pay_rate"),  # Pay rate (optional)
+                user_data.get("specialty")  # Specialty (optional)
+            )
+            for user_data in users_data
+        ]
+        if not values:
+            return []
 
-        # Insert the new user and return the user_id of the newly created user
-        return self.insert_and_return_id(query, values)
+        # Insert every user at once and return their IDs (RETURNING follows VALUES order)
+        with self.cursor() as cur:
+            rows = psycopg2.extras.execute_values(cur, query, values, page_size=len(values), fetch=True)
+            return [row[0] for row in rows]
 
 
 
@@ -294,12 +644,35 @@ class Database:
         query = "SELECT user_id, user_name, user_type FROM salon_user;"
 
         # Execute the query and fetch all rows
-        rows = self.fetchall(query)
+        rows = self.fetch_tuples(query)
 
         # Return a list of dictionaries with user information
         return [{"id": r[0], "username": r[1], "user_type": r[2]} for r in rows]
 
 
+    def get_users_page(self, after_id=0, limit=100):
+        """
+        Retrieve one page of users, in user ID order, using keyset pagination.
+
+        Args:
+            after_id (int): Return users whose ID is greater than this (0 for the first page).
+            limit (int): Maximum number of users to return.
+
+        Returns:
+            list: A list of dictionaries, each containing the 'id', 'username', and 'user_type' of a user.
+        """
+        # Seek past the previous page on the primary key instead of using OFFSET
+        query = """
+            SELECT user_id, user_name, user_type
+            FROM salon_user
+            WHERE user_id > %s
+            ORDER BY user_id
+            LIMIT %s
+        """
+        rows = self.fetch_tuples(query, (after_id, limit))
+        return [{"id": r[0], "username": r[1], "user_type": r[2]} for r in rows]
+
+
     def get_all_user_with_names(self):
         """
         Fetch all users, including their user_id, username, and full name.
@@ -342,25 +715,8 @@ class Database:
                         or None if the user does not exist.
         """
         # Define the SQL query to retrieve the user's details based on their user_id
-        query = """
-            SELECT
-                user_id,
-                active,
-                user_type,
-                access_level,
-                user_name,
-                fname,
-                lname,
-                email,
-                user_image,
-                password,
-                phone_number,
-                address,
-                age,
-                specialty,
-                pay_rate,
-                warning,
-                warning_count
+        query = f"""
+            SELECT {USER_COLUMNS}
             FROM salon_user
             WHERE user_id = %s
         """
@@ -369,6 +725,59 @@ class Database:
         return self.fetchone(query, (user_id,))
 
 
+    def update_user_details(self, user_id, user_type, user_name, fname, lname, email,
+                            phone_number, address, age, specialty, pay_rate):
+        """
+        Update the admin-editable details of a user and return the updated row.
+
+        Args:
+            user_id (int): The unique identifier of the user to update.
+            user_type (str): The user's type (client, professional, admin_*).
+            user_name (str): The username.
+            fname (str): First name.
+            lname (str): Last name.
+            email (str): Email address.
+            phone_number (str): Phone number.
+            address (str): Address.
+            age (int): Age.
+            specialty (str|None): Specialty, for professionals.
+            pay_rate (float|None): Hourly pay rate, for professionals.
+
+        Returns:
+            Row or None: The updated user in get_user_by_id() column order, or None if the user does not exist.
+        """
+        query = f"""
+            UPDATE salon_user SET
+                user_type = %s, user_name = %s, fname = %s, lname = %s,
+                email = %s, phone_number = %s, address = %s, age = %s,
+                specialty = %s, pay_rate = %s
+            WHERE user_id = %s
+            RETURNING {USER_COLUMNS}
+        """
+        return self.fetchone(query, (
+            user_type, user_name, fname, lname, email,
+            phone_number, address, age, specialty, pay_rate, user_id
+        ))
+
+
+    def toggle_user_active(self, user_id):
+        """
+        Flip a user's active flag and return the updated row.
+
+        Args:
+            user_id (int): The unique identifier of the user.
+
+        Returns:
+            Row or None: The updated user in get_user_by_id() column order, or None if the user does not exist.
+        """
+        query = f"""
+            UPDATE salon_user SET active = 1 - active
+            WHERE user_id = %s
+            RETURNING {USER_COLUMNS}
+        """
+        return self.fetchone(query, (user_id,))
+
+
 
 
     def get_user_by_username(self, user_name):
@@ -397,6 +806,24 @@ class Database:
 
 
 
+    def get_users_by_usernames(self, user_names):
+        """
+        Retrieve the users matching any of the given usernames in a single query.
+
+        Args:
+            user_names (list): The usernames to look up.
+
+        Returns:
+            list: The matching user rows (unknown usernames are skipped), in no particular order.
+        """
+        query = f"""
+            SELECT {USER_COLUMNS}
+            FROM salon_user
+            WHERE user_name = ANY(%s)
+        """
+        return self.fetchall(query, (list(user_names),))
+
+
     def get_users_by_type(self, user_type):
         """
         Retrieve all users that match a specific user type.
@@ -532,6 +959,52 @@ class Database:
         ]
 
 
+    def get_professionals_with_pay_rates(self):
+        """
+        Fetch all professionals with their names and pay rates in a single query.
+
+        Returns:
+            list: A list of dictionaries, each containing the 'user_id', 'user_name', 'fname',
+                'lname' and 'pay_rate' (DEFAULT_PAY_RATE when none is set) of a professional.
+        """
+        query = """
+            SELECT user_id, user_name, fname, lname, COALESCE(pay_rate, %s) AS pay_rate
+            FROM salon_user
+            WHERE user_type = 'professional'
+            ORDER BY user_name;
+        """
+        rows = self.fetchall(query, (DEFAULT_PAY_RATE,))
+
+        # Rows are looked up by column name, not by position in the user table
+        return [
+            {
+                "user_id": r["user_id"],
+                "user_name": r["user_name"],
+                "fname": r["fname"],
+                "lname": r["lname"],
+                "pay_rate": r["pay_rate"]
+            } for r in rows
+        ]
+
+
+    def get_pay_rates_for(self, user_ids):
+        """
+        Fetch the pay rates of several professionals in a single query.
+
+        Args:
+            user_ids (list): The IDs of the professionals to look up.
+
+        Returns:
+            dict: A mapping of user_id to pay rate, using DEFAULT_PAY_RATE when none is set.
+        """
+        # Skip the round-trip entirely when there is nothing to look up
+        if not user_ids:
+            return {}
+
+        query = "SELECT user_id, COALESCE(pay_rate, %s) FROM salon_user WHERE user_id = ANY(%s)"
+        return dict(self.fetch_tuples(query, (DEFAULT_PAY_RATE, list(user_ids))))
+
+
     def set_user_warning(self, user_id, warning_text):
         """
         Set a warning message for a user by their user ID.
@@ -567,6 +1040,18 @@ class Database:
         return result[0] if result else None
 
 
+    def set_password_hash(self, user_id, password_hash):
+        """
+        Replace the stored password hash of a user (used to upgrade legacy hashes on login).
+
+        Args:
+            user_id (int): The unique identifier of the user.
+            password_hash (str): The new password hash.
+        """
+        query = "UPDATE salon_user SET password = %s WHERE user_id = %s"
+        self.execute_commit(query, (password_hash, user_id))
+
+
     def clear_user_warning(self, user_id):
         """
         Clear the warning message for a specific user.
@@ -640,6 +1125,31 @@ class Database:
         self.execute_commit(query, (count, user_id))
 
 
+    def bump_warning_count(self, user_id, warning_text):
+        """
+        Record a warning for a user and increment their warning count in a single statement.
+
+        The account is deactivated once the count reaches 3.
+
+        Args:
+            user_id (int): The unique identifier of the user being warned.
+            warning_text (str): The warning message to store.
+
+        Returns:
+            tuple or None: The user's new (warning_count, active) values, or None if the user does not exist.
+        """
+        # Right-hand expressions see the row's previous values, so the count is only read once
+        query = """
+            UPDATE salon_user
+            SET warning = %s,
+                warning_count = COALESCE(warning_count, 0) + 1,
+                active = CASE WHEN COALESCE(warning_count, 0) + 1 >= 3 THEN 0 ELSE active END
+            WHERE user_id = %s
+            RETURNING warning_count, active
+        """
+        return self.fetchone(query, (warning_text, user_id))
+
+
     def set_user_active_status(self, user_id, active):
         """
         Set whether a user is active (1) or inactive (0).
@@ -727,7 +1237,7 @@ class Database:
         result = self.fetchone(query, (user_id,))
 
         # Return the full name (first name + last name) if found, otherwise return None
-        return f"{result[0]} {result[1]}" if result else None
+        return f"{result['fname']} {result['lname']}" if result else None
 
 
 #------------APPOINTMENT METHODS
@@ -752,6 +1262,9 @@ class Database:
 
         Returns:
             int: The appointment ID of the newly created appointment.
+
+        Raises:
+            SlotTakenError: If the provider already has an active appointment in that slot.
         """
         # Define the SQL query to insert a new appointment into the salon_appointment table
         query = """
@@ -779,7 +1292,9 @@ class Database:
             appt_data.get("provider_report")  # Provider report (optional)
         )
         
-        # Call the method to insert the values into the database and return the appointment ID
+        # Call the method to insert the values into the database and return the appointment ID.
+        # uq_appt_provider_slot rejects a second active booking of the same provider slot,
+        # which closes the race a SELECT pre-check would leave open (see slot_conflicts).
         return self.insert_and_return_id(query, values)
 
 
@@ -832,18 +1347,39 @@ class Database:
             list: A list of dictionaries, each containing the appointment details with 
                 the associated service data (if available).
         """
-        # Define the SQL query to retrieve all appointments with associated service data
+        return self.get_appointments()
+
+
+    def get_appointments(self, status=None):
+        """
+        Retrieve appointments with joined service data, optionally limited to one status.
+
+        The status predicate runs in SQL (backed by idx_appt_status_date), so filtered-out rows
+        are never transferred.
+
+        Args:
+            status (str, optional): Appointment status to keep. None or 'all' returns every appointment.
+
+        Returns:
+            list: A list of dictionaries, each containing the appointment details with 
+                the associated service data (if available).
+        """
+        # Define the SQL query to retrieve appointments with associated service data
         query = """
             SELECT sa.appointment_id, sa.status, sa.date_appoint, sa.slot, sa.venue,
                 sa.consumer_id, sa.consumer_name, sa.provider_id, sa.provider_name,
                 ss.service_name, ss.service_duration, ss.service_price
             FROM salon_appointment sa
             LEFT JOIN salon_service ss ON sa.appointment_id = ss.appointment_id
+            {where}
             ORDER BY sa.date_appoint ASC, sa.slot ASC;
         """
-        
-        # Execute the query and fetch all rows
-        rows = self.fetchall(query)
+
+        # Execute the query and fetch the rows, filtering by status when one is given
+        if status and status != "all":
+            rows = self.fetchall(query.format(where="WHERE sa.status = %s"), (status,))
+        else:
+            rows = self.fetchall(query.format(where=""))
 
         # Return the results as a list of dictionaries with appointment and service details
         return [
@@ -865,6 +1401,112 @@ class Database:
 
 
 
+    def get_appointments_page(self, user_id=None, user_type=None, status=None, limit=5, offset=0,
+                              sort_by=None):
+        """
+        Retrieve one page of appointments, with the total number of matching rows.
+
+        Filtering, ordering and LIMIT/OFFSET all run in SQL, so only the requested page is
+        transferred. The total comes from a COUNT(*) window over the same query, in the
+        same round-trip.
+
+        Args:
+            user_id (int, optional): Restrict to one user's appointments. None returns everyone's.
+            user_type (str, optional): Role of user_id; professionals are matched on provider_id,
+                everyone else on consumer_id. Clients see their appointments oldest first,
+                other users newest first.
+            status (str, optional): Appointment status to keep. None or 'all' keeps every status.
+            limit (int): Maximum number of rows to return.
+            offset (int): Number of matching rows to skip.
+            sort_by (str, optional): Key of APPOINTMENT_SORT_COLUMNS to order by first;
+                unknown keys keep the default date order.
+
+        Returns:
+            tuple: A list of appointment dictionaries (with service data, if available)
+                and the total number of matching appointments.
+        """
+        conditions, params = [], []
+        if user_id is not None:
+            # Only these fixed column names are ever interpolated into the query
+            column = "sa.provider_id" if user_type == "professional" else "sa.consumer_id"
+            conditions.append(f"{column} = %s")
+            params.append(user_id)
+        if status and status != "all":
+            conditions.append("sa.status = %s")
+            params.append(status)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = "DESC" if user_id is not None and user_type != "client" else "ASC"
+        order = f"sa.date_appoint {direction}, sa.slot ASC, sa.appointment_id ASC"
+        # Whitelisted column names only; the user-supplied key never reaches the SQL text
+        sort_column = APPOINTMENT_SORT_COLUMNS.get(sort_by)
+        if sort_column and sort_column != "sa.date_appoint":
+            order = f"{sort_column} ASC, {order}"
+        query = f"""
+            SELECT sa.appointment_id, sa.status, sa.date_appoint, sa.slot, sa.venue,
+                sa.consumer_id, sa.consumer_name, sa.provider_id, sa.provider_name,
+                ss.service_name, ss.service_duration, ss.service_price,
+                COUNT(*) OVER () AS total
+            FROM salon_appointment sa
+            LEFT JOIN salon_service ss ON sa.appointment_id = ss.appointment_id
+            {where}
+            ORDER BY {order}
+            LIMIT %s OFFSET %s;
+        """
+        rows = self.fetchall(query, (*params, limit, offset))
+
+        if rows:
+            total = rows[0][12]
+        elif offset:
+            # Past the last page the window count has no row to ride on, so count directly
+            count_query = f"SELECT COUNT(*) FROM salon_appointment sa {where};"
+            total = self.fetchone(count_query, tuple(params))[0]
+        else:
+            total = 0
+
+        appointments = [
+            {
+                "appointment_id": r[0],
+                "status": r[1],
+                "date_appoint": r[2],
+                "slot": r[3],
+                "venue": r[4],
+                "consumer_id": r[5],
+                "consumer_name": r[6],
+                "provider_id": r[7],
+                "provider_name": r[8],
+                "service_name": r[9] if r[9] else "N/A",  # Default to "N/A" if no service is linked
+                "service_duration": r[10] if r[10] else 0,  # Default to 0 if no service duration is available
+                "service_price": r[11] if r[11] else 0.00  # Default to 0 if no service price is available
+            } for r in rows
+        ]
+        return appointments, total
+
+
+
+    def get_appointment_status_counts(self):
+        """
+        Count appointments per status with a single aggregate query.
+
+        Returns:
+            dict: Number of appointments under 'all', 'requested', 'accepted' and 'cancelled'.
+        """
+        query = """
+            SELECT COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE status = 'requested') AS requested,
+                COUNT(*) FILTER (WHERE status = 'accepted') AS accepted,
+                COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled
+            FROM salon_appointment;
+        """
+        row = self.fetchone(query)
+        return {
+            "all": row["total"],
+            "requested": row["requested"],
+            "accepted": row["accepted"],
+            "cancelled": row["cancelled"]
+        }
+
+
     def get_appointment_by_id(self, appt_id):
         """
         Retrieve a specific appointment by its ID, including joined service information.
@@ -917,6 +1559,25 @@ class Database:
 
 
     
+    def get_appointment_ids_by_consumer(self, user_id):
+        """
+        Retrieve only the IDs of a client's appointments, newest first (for dropdowns).
+
+        Args:
+            user_id (int): The unique identifier of the client.
+
+        Returns:
+            list: The appointment IDs.
+        """
+        # Served by idx_appt_consumer_date without touching salon_service
+        query = """
+            SELECT appointment_id FROM salon_appointment
+            WHERE consumer_id = %s
+            ORDER BY date_appoint DESC, slot ASC
+        """
+        return [row["appointment_id"] for row in self.fetchall(query, (user_id,))]
+
+
     def get_appointments_by_user(self, user_id):
         """
         Return all appointments booked by a specific client, including service details.
@@ -1063,6 +1724,84 @@ class Database:
 
 
     
+    def update_appointment_and_service(self, appointment_id, appt_data, service_data, action_text, action_by):
+        """
+        Update an appointment and its service, and log the change, in one atomic round-trip.
+
+        The two UPDATEs run as data-modifying CTEs of the log INSERT, so Postgres applies
+        all three as a single statement: they succeed or fail together. Nothing is logged
+        when the appointment does not exist.
+
+        Args:
+            appointment_id (int): The unique identifier of the appointment to update.
+            appt_data (dict): New 'date_appoint', 'slot', 'venue', 'provider_id', 'provider_name',
+                'consumer_id', 'consumer_name' and 'nber_services' of the appointment.
+            service_data (dict): New 'service_name', 'service_duration' and 'service_price'.
+            action_text (str): Description of the change for the salon_log table.
+            action_by (str): Username of the user making the change.
+        """
+        query = """
+            WITH appt AS (
+                UPDATE salon_appointment
+                SET date_appoint = %s, slot = %s, venue = %s,
+                    provider_id = %s, provider_name = %s,
+                    consumer_id = %s, consumer_name = %s,
+                    nber_services = %s
+                WHERE appointment_id = %s
+                RETURNING appointment_id
+            ), service AS (
+                UPDATE salon_service
+                SET service_name = %s, service_duration = %s, service_price = %s
+                WHERE appointment_id = %s
+            )
+            INSERT INTO salon_log (user_action, action_by)
+            SELECT %s, %s FROM appt;
+        """
+        params = (
+            appt_data["date_appoint"], appt_data["slot"], appt_data["venue"],
+            appt_data["provider_id"], appt_data["provider_name"],
+            appt_data["consumer_id"], appt_data["consumer_name"],
+            appt_data["nber_services"], appointment_id,
+            service_data["service_name"], service_data["service_duration"],
+            service_data["service_price"], appointment_id,
+            action_text, action_by
+        )
+        self.execute_commit(query, params)
+
+
+    def set_appointment_status_if_participant(self, appointment_id, status, user_id,
+                                              provider_only=False, from_status=None):
+        """
+        Change an appointment's status only if the user may do so, in a single UPDATE.
+
+        The authorization and state checks are part of the WHERE clause, so they are
+        applied atomically with the change and no prior SELECT is needed.
+
+        Args:
+            appointment_id (int): The unique identifier of the appointment to update.
+            status (str): The new status to set.
+            user_id (int): The user making the change; must be the provider, or either
+                participant unless provider_only is set.
+            provider_only (bool): Only allow the appointment's provider.
+            from_status (str, optional): Only update an appointment currently in this status.
+
+        Returns:
+            bool: True if the appointment was updated, False if it does not exist or a check failed.
+        """
+        conditions = ["provider_id = %s" if provider_only else "%s IN (consumer_id, provider_id)"]
+        params = [status, appointment_id, user_id]
+        if from_status:
+            conditions.append("status = %s")
+            params.append(from_status)
+
+        query = f"""
+            UPDATE salon_appointment SET status = %s
+            WHERE appointment_id = %s AND {' AND '.join(conditions)}
+            RETURNING appointment_id;
+        """
+        return self.fetchone(query, tuple(params)) is not None
+
+
     def update_appointment(self, appointment_id, update_data):
         """
         Update appointment and related service details for a given appointment ID.
@@ -1209,6 +1948,33 @@ class Database:
         return self.fetchone(query, (appointment_id,))
 
 
+    def get_reports_by_appointment_ids(self, appointment_ids):
+        """
+        Retrieve the reports of several appointments in a single query.
+
+        Args:
+            appointment_ids (list): The appointment IDs to look up.
+
+        Returns:
+            dict: A mapping of appointment_id to its report row (the first one if several exist).
+        """
+        # Skip the round-trip entirely when there is nothing to look up
+        if not appointment_ids:
+            return {}
+
+        query = """
+            SELECT * FROM salon_report
+            WHERE appointment_id = ANY(%s)
+            ORDER BY report_id
+        """
+        rows = self.fetchall(query, (list(appointment_ids),))
+
+        reports = {}
+        for row in rows:
+            reports.setdefault(row["appointment_id"], row)
+        return reports
+
+
     def get_report_by_id(self, report_id):
         """
         Retrieve a report and related appointment information by report ID.
@@ -1290,15 +2056,11 @@ class Database:
         Returns:
             bool: True if the report was deleted successfully, False if no such report exists.
         """
-        # Check if the report exists before attempting to delete
-        if not self.exists("SELECT 1 FROM salon_report WHERE report_id = %s", (report_id,)):
-            return False  # Return False if the report does not exist
-
-        # Execute the SQL query to delete the report
-        self.execute_commit("DELETE FROM salon_report WHERE report_id = %s", (report_id,))
+        # Delete and report back in one statement: RETURNING yields no row if nothing matched
+        deleted = self.fetchone("DELETE FROM salon_report WHERE report_id = %s RETURNING report_id", (report_id,))
 
         # Return True to indicate that the report was deleted
-        return True
+        return deleted is not None
 
     
     def get_all_report(self):
@@ -1363,6 +2125,24 @@ class Database:
             return False
 
 
+    def get_report_appointment_ids(self, appointment_ids):
+        """
+        Return which of the given appointments already have a report, in a single query.
+
+        Args:
+            appointment_ids (list): The appointment IDs to check.
+
+        Returns:
+            set: The subset of appointment_ids that have at least one report.
+        """
+        # Skip the round-trip entirely when there is nothing to check
+        if not appointment_ids:
+            return set()
+
+        query = "SELECT DISTINCT appointment_id FROM salon_report WHERE appointment_id = ANY(%s)"
+        return {r[0] for r in self.fetch_tuples(query, (list(appointment_ids),))}
+
+
     def get_pending_reports_for_professional(self, professional_id):
         """
         Get all client-submitted reports that the professional has not yet responded to.
@@ -1412,6 +2192,32 @@ class Database:
         return self.fetchall_dict(query, (client_id,))
 
 
+    def fetch_and_mark_new_professional_feedback(self, client_id):
+        """
+        Mark a client's reports with unseen professional feedback as seen, returning their IDs.
+
+        Combines get_reports_with_new_professional_feedback and mark_reports_as_seen_by_client
+        in one UPDATE ... RETURNING statement (one round trip, no window between the two).
+
+        Args:
+            client_id (int): The unique identifier of the client.
+
+        Returns:
+            list: The IDs of the reports that were newly marked as seen.
+        """
+        query = """
+            UPDATE salon_report r
+            SET client_seen = TRUE
+            FROM salon_appointment a
+            WHERE r.appointment_id = a.appointment_id
+            AND a.consumer_id = %s
+            AND r.feedback_professional IS NOT NULL
+            AND (r.client_seen IS NULL OR r.client_seen = FALSE)
+            RETURNING r.report_id
+        """
+        return [row["report_id"] for row in self.fetchall(query, (client_id,))]
+
+
     def mark_reports_as_seen_by_client(self, report_ids):
         """
         Mark multiple reports as seen by the client.
@@ -1558,6 +2364,45 @@ class Database:
             for r in rows
         ]
 
+    def get_reports_filtered(self, filter_status="all"):
+        """
+        Retrieve the reports shown on the Manage Reports page, filtered in SQL.
+
+        Only the columns the listing renders are selected, and rows are streamed from a
+        server-side cursor as the caller iterates.
+
+        Args:
+            filter_status (str): "open", "closed", "flagged" or "all" (any other value means all).
+
+        Yields:
+            dict: The report id, status, date, flag and participant names of each report.
+        """
+        # Status tabs filter with one ANY() predicate; the flagged tab uses its partial index
+        if filter_status in REPORT_STATUS_MAP:
+            condition, params = "r.status = ANY(%s)", (list(REPORT_STATUS_MAP[filter_status]),)
+        elif filter_status == "flagged":
+            condition, params = "r.flagged_by_professional", ()
+        else:
+            condition, params = "TRUE", ()
+
+        query = f"""
+            SELECT r.report_id, r.status, r.date_report, r.flagged_by_professional,
+                a.consumer_name, a.provider_name
+            FROM salon_report r
+            JOIN salon_appointment a ON r.appointment_id = a.appointment_id
+            WHERE {condition}
+            ORDER BY r.date_report DESC
+        """
+        for r in self.iter_rows(query, params):
+            yield {
+                "id": r[0],
+                "status": r[1],
+                "date": r[2],
+                "flagged_by_professional": r[3],
+                "client_name": r[4],
+                "professional_name": r[5]
+            }
+
     
     def flag_report_by_professional(self, report_id):
         """
@@ -1676,12 +2521,56 @@ class Database:
         """
         
         # Execute the query and fetch all the rows
-        rows = self.fetchall(query)
+        rows = self.fetch_tuples(query)
 
         # Return the results as a list of tuples with the client user ID and full name
         return [(r[0], f"{r[1]} {r[2]}") for r in rows]
 
 
+    def get_appointment_choices(self):
+        """
+        Return a list of appointment (appointment_id, label) tuples for dropdown menus.
+
+        Returns:
+            list: A list of tuples, where each tuple contains an appointment ID and its label.
+        """
+        # Only the IDs are needed, so skip the service join of get_all_appointments
+        query = """
+            SELECT appointment_id
+            FROM salon_appointment
+            ORDER BY date_appoint ASC, slot ASC;
+        """
+
+        rows = self.fetchall(query)
+
+        return [(r[0], f"Appt {r[0]}") for r in rows]
+
+
+    def search_providers(self, prefix, limit=20):
+        """
+        Find professionals whose first or last name starts with the given text.
+
+        Args:
+            prefix (str): Beginning of the name, matched case-insensitively.
+            limit (int): Maximum number of matches to return.
+
+        Returns:
+            list: A list of (user_id, full name) tuples, ordered by first name.
+        """
+        # Escape LIKE wildcards so the text is matched literally
+        pattern = prefix.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        query = """
+            SELECT user_id, fname, lname
+            FROM salon_user
+            WHERE user_type = 'professional'
+              AND (lower(fname) LIKE %s OR lower(lname) LIKE %s)
+            ORDER BY fname
+            LIMIT %s
+        """
+        rows = self.fetchall(query, (pattern, pattern, limit))
+        return [(r["user_id"], f"{r['fname']} {r['lname']}") for r in rows]
+
+
     def get_provider_choices(self):
         """
         Return a list of professional (user_id, full name) tuples for dropdown menus.
@@ -1698,7 +2587,7 @@ class Database:
         """
         
         # Execute the query and fetch all the rows
-        rows = self.fetchall(query)
+        rows = self.fetch_tuples(query)
 
         # Return the results as a list of tuples with the professional user ID and full name
         return [(r[0], f"{r[1]} {r[2]}") for r in rows]
@@ -1848,7 +2737,7 @@ class Database:
         Returns:
             list: A list of dictionaries, each representing a row in the query result.
         """
-        with self.__connection.cursor(cursor_factory=RealDictCursor) as cur:
+        with self.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(query, params)  # Execute the query with parameters
             return cur.fetchall()  # Return all results as a list of dictionaries
 
@@ -1937,29 +2826,56 @@ class Database:
         return self.fetchone(query, (message_id,))
     
 
-    def get_messages_by_group_name(self, group_name):
+    def get_messages_by_group_name(self, group_name, limit=MESSAGE_HISTORY_LIMIT):
         """
-        Retrieve all messages that match a specific group name.
+        Retrieve the most recent messages that match a specific group name.
 
         Args:
             group_name (str): The group name to filter by (e.g., 'rix_andrew', 'funtime2025').
+            limit (int): Maximum number of messages to return, counted from the newest.
 
         Returns:
-            list: A list of dictionaries, each containing the details of a message with the specified group_name.
+            list: A list of dictionaries with the 'sender_username', 'contents', 'time_sent' and
+                'members' of each message, oldest first.
         """
-        # Define the SQL query to retrieve messages with the specified group_name
+        # Define the SQL query to retrieve the most recent messages of the group_name,
+        # returned oldest first (message_id breaks ties between equal timestamps)
         query = """
-            SELECT DISTINCT 
-            m.sender_username, m.contents, m.time_sent, m.members
-            FROM messages m
-            JOIN messages as m2 on m.group_name = m2.group_name
-            WHERE m.group_name = %s
-            ORDER BY m.time_sent ASC;
+            SELECT sender_username, contents, time_sent, members
+            FROM (
+                SELECT message_id, sender_username, contents, time_sent, members
+                FROM messages
+                WHERE group_name = %s
+                ORDER BY time_sent DESC, message_id DESC
+                LIMIT %s
+            ) recent
+            ORDER BY time_sent ASC, message_id ASC;
+        """
+
+        # Execute the query; RealDictCursor rows already are the dictionaries callers use
+        return self.fetchall_dict(query, (group_name, limit))
+    
+
+    def get_group_members(self, group_name):
         """
+        Retrieve the members of a Group Chat as listed on its latest message.
+
+        Args:
+            group_name (str): The group name/ group chat (identifier).
+
+        Returns:
+            str or None: The comma-separated member usernames, or None if the group has no messages.
+        """
+        # Served by idx_messages_group_time: a single index entry is read
+        query = """
+            SELECT members FROM messages
+            WHERE group_name = %s
+            ORDER BY time_sent DESC, message_id DESC
+            LIMIT 1
+        """
+        row = self.fetchone(query, (group_name,))
+        return row["members"] if row else None
 
-        # Execute the query and return all matching results as a list of dictionaries
-        return self.fetchall(query, (group_name,))
-    
 
     def get_group_name_by_member(self, member):
         """
@@ -1972,13 +2888,33 @@ class Database:
             list: A list of dictionaries, each containing the details of a message with the specified group_name.
         """
         # Define the SQL query to retrieve the group_name with the specified member
+        # (members is a comma-separated list of usernames, matched as a whole name)
         query = f"""
             SELECT DISTINCT group_name from messages
-            WHERE members LIKE '%{member}%';
+            WHERE {MEMBER_MATCH_SQL};
         """
 
         # Execute the query and return all matching results as a list of dictionaries
-        return self.fetchall(query)
+        return self.fetchall(query, (member,))
+
+
+    def is_group_member(self, member, group_name):
+        """
+        Check whether a user is a member of a Group Chat, without loading their group list.
+
+        Args:
+            member (str): The username of the user.
+            group_name (str): The Group Chat identifier.
+
+        Returns:
+            bool: True if any message of the group lists the user among its members.
+        """
+        query = f"""
+            SELECT 1 FROM messages
+            WHERE group_name = %s AND {MEMBER_MATCH_SQL}
+            LIMIT 1
+        """
+        return self.fetchone(query, (group_name, member)) is not None
 
 
 
@@ -1993,6 +2929,39 @@ class DatabaseConnectionError(Exception):
     pass  # No additional implementation needed for this custom exception
 
 
+class SlotTakenError(Exception):
+    """
+    Raised when an appointment would double-book a professional's date and slot.
+
+    Enforced by the uq_appt_provider_slot index, so the check is atomic with the write.
+    """
+    pass
+
+
+# Partial unique index on (provider_id, date_appoint, slot) of the non-cancelled appointments
+SLOT_CONSTRAINT = "uq_appt_provider_slot"
+
+
+@contextmanager
+def slot_conflicts():
+    """
+    Context manager turning a violation of the provider slot index into SlotTakenError.
+
+    Wraps every cursor and transaction, so inserts, reschedules and status changes
+    (e.g. un-cancelling an appointment) all report a double booking the same way.
+    Other unique violations are re-raised unchanged.
+
+    Raises:
+        SlotTakenError: If a statement in the block violated uq_appt_provider_slot.
+    """
+    try:
+        yield
+    except psycopg2.errors.UniqueViolation as e:
+        if e.diag.constraint_name != SLOT_CONSTRAINT:
+            raise
+        raise SlotTakenError("This professional is already booked for that date and slot.") from e
+
+
 # Create an instance of the Database class
 db = Database()
 
@@ -0,0 +1,94 @@
+"""Password hashing: Argon2id when argon2-cffi is installed, Werkzeug's PBKDF2 otherwise."""
+from functools import lru_cache
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # Optional: existing and new hashes fall back to Werkzeug
+    PasswordHasher = None
+
+# Argon2id sized for a login verify in the tens of milliseconds: 12 MiB, 3 passes, 2 lanes
+_hasher = PasswordHasher(time_cost=3, memory_cost=12288, parallelism=2) if PasswordHasher else None
+
+# Prefix of every Argon2 hash string; anything else is a legacy Werkzeug hash
+ARGON2_PREFIX = "$argon2"
+
+
+def hash_password(password):
+    """
+    Hash a plain-text password for storage.
+
+    Args:
+        password (str): The plain-text password.
+
+    Returns:
+        str: An Argon2id hash, or a Werkzeug hash when argon2-cffi is not installed.
+    """
+    if _hasher is not None:
+        return _hasher.hash(password)
+    return generate_password_hash(password)
+
+
+def verify_password(stored_hash, password):
+    """
+    Check a plain-text password against a stored Argon2 or legacy Werkzeug hash.
+
+    Both libraries compare the derived digests in constant time.
+
+    Args:
+        stored_hash (str): The hash stored for the user.
+        password (str): The plain-text password to check.
+
+    Returns:
+        bool: True if the password matches.
+    """
+    if stored_hash.startswith(ARGON2_PREFIX):
+        if _hasher is None:
+            return False
+        try:
+            return _hasher.verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_password_hash(stored_hash, password)
+
+
+def needs_rehash(stored_hash):
+    """
+    Tell whether a stored hash should be replaced after the next successful login.
+
+    Args:
+        stored_hash (str): The hash stored for the user.
+
+    Returns:
+        bool: True for legacy Werkzeug hashes and Argon2 hashes with outdated parameters.
+    """
+    if _hasher is None:
+        return False
+    return not stored_hash.startswith(ARGON2_PREFIX) or _hasher.check_needs_rehash(stored_hash)
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash():
+    """Hash checked when the username is unknown (built once, on first use)."""
+    return hash_password("not-a-real-password")
+
+
+def verify_user_password(user, password):
+    """
+    Check a login attempt, spending the same hashing work whether or not the user exists.
+
+    Without the dummy verify, an unknown username would answer measurably faster than a
+    wrong password, revealing which usernames are registered.
+
+    Args:
+        user (User|None): The user looked up by username, or None if there is none.
+        password (str): The plain-text password submitted.
+
+    Returns:
+        bool: True if the user exists and the password matches.
+    """
+    if user is None:
+        verify_password(_dummy_hash(), password)
+        return False
+    return verify_password(user.password, password)
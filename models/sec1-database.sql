@@ -24,6 +24,10 @@ CREATE TABLE SALON_USER (
     warning_count INTEGER DEFAULT 0,
     CONSTRAINT unique_user_email UNIQUE (user_name, email)
 );
+
+-- Provider autocomplete matches name prefixes among professionals
+CREATE INDEX idx_provider_fname ON SALON_USER(lower(fname) text_pattern_ops) WHERE user_type = 'professional';
+CREATE INDEX idx_provider_lname ON SALON_USER(lower(lname) text_pattern_ops) WHERE user_type = 'professional';
  
 -- $2b$12$gqsQ8F1vZRxuRj.k2PM57eL/NA.Y/b6FxJ0SfihztJdlcPw7q2E9G'
 -- >>> gen_pw('12')
@@ -157,6 +161,18 @@ CREATE TABLE SALON_APPOINTMENT (
     CONSTRAINT salon_provider_fk FOREIGN KEY (provider_id) REFERENCES SALON_USER(user_id)
 );
 
+-- Admin appointment tabs and the all-appointments list filter by status and order by date,
+-- so the index serves both the filter and the ORDER BY ... LIMIT with no sort step
+CREATE INDEX idx_appt_status_date ON SALON_APPOINTMENT(status, date_appoint, slot);
+-- Unfiltered "all" tab, in date order
+CREATE INDEX idx_appt_date ON SALON_APPOINTMENT(date_appoint, slot);
+-- My-appointments pages: clients oldest first, professionals newest first
+CREATE INDEX idx_appt_consumer_date ON SALON_APPOINTMENT(consumer_id, date_appoint, slot);
+CREATE INDEX idx_appt_provider_date ON SALON_APPOINTMENT(provider_id, date_appoint DESC, slot);
+-- A professional can hold one active booking per date and slot; cancelled ones free the slot
+CREATE UNIQUE INDEX uq_appt_provider_slot ON SALON_APPOINTMENT(provider_id, date_appoint, slot)
+    WHERE status <> 'cancelled';
+
 
    
 -- Client1 appointments
@@ -260,6 +276,10 @@ CREATE TABLE SALON_REPORT (
     CONSTRAINT salon_appointment_fk FOREIGN KEY (appointment_id) REFERENCES SALON_APPOINTMENT(appointment_id)
 );
 
+-- Admin report tabs filter by status or professional flag
+CREATE INDEX idx_report_status ON SALON_REPORT(status, flagged_by_professional);
+CREATE INDEX idx_report_flagged ON SALON_REPORT(date_report DESC) WHERE flagged_by_professional;
+
 INSERT INTO SALON_REPORT (appointment_id, status, date_report, feedback_client, feedback_professional, client_seen, flagged_by_professional)
 VALUES (1, 'closed', '2025-05-01', 'was a good hour', 'any time', TRUE, FALSE);
 
@@ -331,6 +351,9 @@ CREATE TABLE SALON_LOG (
     action_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Admin logs page reads the newest entries first, straight from the index
+CREATE INDEX idx_log_time ON SALON_LOG(action_time DESC) INCLUDE (user_action, action_by);
+
 
 DROP TABLE IF EXISTS MESSAGES CASCADE;
 CREATE TABLE MESSAGES (
@@ -343,6 +366,9 @@ CREATE TABLE MESSAGES (
 	contents TEXT
 );
 
+-- Opening a group chat reads its latest messages
+CREATE INDEX idx_messages_group_time ON MESSAGES(group_name, time_sent DESC, message_id DESC);
+
 INSERT INTO MESSAGES (group_name, sender_id, sender_username, members , contents)
 VALUES
 ('rix_andrew_nasr',  7, 'rix', 'rix, andrew' ,'Hi Andrew!');
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# Repository root, so the subprocesses import the app from this checkout
+ROOT = Path(__file__).resolve().parent.parent
+
+# Builds the app with the connection pool stubbed out (no database is needed to boot)
+BOOT_SCRIPT = """
+from unittest import mock
+with mock.patch("psycopg2.pool.ThreadedConnectionPool"):
+    {first_import}
+    from app import create_app
+    app = create_app()
+print(sorted(app.blueprints))
+"""
+
+
+class TestAppBoot(unittest.TestCase):
+    """
+    Smoke tests for the application import graph.
+
+    Each test boots the app in a fresh interpreter, so a circular import between
+    blueprints fails here instead of at server start. The import that runs first
+    decides the order modules are loaded in, so several entry points are tried.
+    """
+
+    def boot(self, first_import="pass"):
+        """
+        Boot the app in a new interpreter after running first_import.
+
+        Args:
+            first_import (str): Statement executed before create_app is imported.
+
+        Returns:
+            str: The standard output of the interpreter (the registered blueprints).
+        """
+        result = subprocess.run(
+            [sys.executable, "-c", BOOT_SCRIPT.format(first_import=first_import)],
+            cwd=ROOT, capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def test_create_app(self):
+        """The app factory imports every blueprint and registers them."""
+        output = self.boot()
+        for name in ("bp-admin", "bp-auth", "bp-main", "bp-report", "bp_api_auth"):
+            self.assertIn(name, output)
+
+    def test_admin_package_imported_first(self):
+        """Loading the admin blueprint before the app package does not hit a cycle."""
+        self.boot("import app.bp_admin.users")
+
+    def test_auth_routes_imported_first(self):
+        """Loading the auth routes before the app package does not hit a cycle."""
+        self.boot("import app.bp_auth.routes")
+
+    def test_report_forms_imported_first(self):
+        """Loading the report forms (which use utils_admin) first does not hit a cycle."""
+        self.boot("import app.bp_report.forms")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import time
+import unittest
+from unittest import mock
+
+from flask import flash
+
+# Import the app with the connection pool stubbed out: these tests never reach the database
+with mock.patch("psycopg2.pool.ThreadedConnectionPool"):
+    from app import create_app, cache
+    from app.bp_admin.utils_admin import (
+        bump_cache_rev, get_cache_rev, delete_keys, cache_page,
+        invalidate_appointment_cache, appointment_rev_key
+    )
+
+
+class TestCacheRevisions(unittest.TestCase):
+    """
+    Test case for the generation counters used to invalidate cached pages.
+
+    The app runs on the in-process SimpleCache (no REDIS_URL), with a fresh cache per test.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the application once for all tests."""
+        cls.app = create_app()
+
+    def setUp(self):
+        """Enter an application context with an empty cache."""
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        cache.clear()
+
+    def tearDown(self):
+        """Leave the application context."""
+        self.ctx.pop()
+
+    def test_bump_advances_generation(self):
+        """Bumping a counter moves it to a new generation."""
+        rev = get_cache_rev(cache, "rev:test")
+        bump_cache_rev(cache, "rev:test")
+        self.assertEqual(get_cache_rev(cache, "rev:test"), rev + 1)
+
+    def test_bump_after_eviction_never_reuses_a_generation(self):
+        """A counter lost from the cache is reseeded above every older generation."""
+        bump_cache_rev(cache, "rev:test")
+        old_rev = get_cache_rev(cache, "rev:test")
+
+        # Simulate an eviction a moment later (seeds are millisecond timestamps),
+        # then bump again: INCR alone would restart the counter at 1
+        time.sleep(0.01)
+        cache.delete("rev:test")
+        bump_cache_rev(cache, "rev:test")
+        self.assertGreater(get_cache_rev(cache, "rev:test"), old_rev)
+
+    def test_cache_page_renders_uncached_while_flashes_pending(self):
+        """Flash messages are shown on the next page and never stored in the shared copy."""
+        self.assertEqual(cache_page(cache, "page:test", lambda: "cached"), "cached")
+        with self.app.test_request_context():
+            flash("Slot: Not a valid choice.", "danger")
+            self.assertEqual(cache_page(cache, "page:test", lambda: "with errors"), "with errors")
+        self.assertEqual(cache.get("page:test"), "cached")
+
+    def test_delete_keys_continues_past_missing_keys(self):
+        """A key that is already gone (e.g. expired) does not stop the keys after it."""
+        cache.set("page:a", "a")
+        cache.set("page:c", "c")
+        delete_keys(cache, "page:a", "page:missing", "page:c")
+        self.assertIsNone(cache.get("page:a"))
+        self.assertIsNone(cache.get("page:c"))
+
+    def test_appointment_change_clears_only_its_detail_page(self):
+        """Invalidating one appointment moves its detail pages to a new key, not the others'."""
+        other_rev = get_cache_rev(cache, appointment_rev_key(2))
+        rev = get_cache_rev(cache, appointment_rev_key(1))
+        self.assertEqual(cache_page(cache, f"appt:view:1:{rev}", lambda: "old"), "old")
+
+        invalidate_appointment_cache(cache, 1)
+
+        new_rev = get_cache_rev(cache, appointment_rev_key(1))
+        self.assertNotEqual(new_rev, rev)
+        self.assertEqual(cache_page(cache, f"appt:view:1:{new_rev}", lambda: "new"), "new")
+        self.assertEqual(get_cache_rev(cache, appointment_rev_key(2)), other_rev)
+
+
+if __name__ == '__main__':
+    unittest.main()
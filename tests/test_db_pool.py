@@ -0,0 +1,67 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from flask import Flask
+
+# Import the models with the connection pool stubbed out: these tests never reach the database
+with mock.patch("psycopg2.pool.ThreadedConnectionPool"):
+    from models.database import Database
+
+
+class TestSubmit(unittest.TestCase):
+    """
+    Test case for Database.submit, which runs a query on a worker thread next to the request's.
+
+    The pool hands out mock connections, so slot accounting can be checked without a database.
+    """
+
+    def setUp(self):
+        """Create a database with a two-connection pool and a worker thread pool."""
+        with mock.patch("models.database.ThreadedConnectionPool") as pool_cls:
+            pool_cls.return_value.getconn.side_effect = lambda: mock.MagicMock(closed=False, autocommit=True)
+            self.db = Database(maxconn=2)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+        self.app = Flask(__name__)
+
+    def connection_and_thread(self):
+        """Return the connection a db call would use and the thread it runs on."""
+        with self.db.connection() as conn:
+            return conn, threading.current_thread()
+
+    def test_runs_on_a_worker_with_its_own_connection(self):
+        """With a spare slot, the call overlaps the request on a second connection."""
+        with self.app.app_context():
+            with self.db.connection() as request_conn:
+                conn, thread = self.db.submit(self.executor, self.connection_and_thread).result(timeout=2)
+        self.assertIsNot(conn, request_conn)
+        self.assertIsNot(thread, threading.current_thread())
+
+    def test_runs_inline_when_the_pool_is_full(self):
+        """With every slot taken, the call runs on the request's connection instead of waiting."""
+        with self.app.app_context():
+            with self.db.connection() as request_conn:
+                other_conn = self.db._Database__acquire()  # Another request holds the last slot
+                try:
+                    conn, thread = self.db.submit(self.executor, self.connection_and_thread).result(timeout=2)
+                finally:
+                    self.db._Database__release(other_conn)
+        self.assertIs(conn, request_conn)
+        self.assertIs(thread, threading.current_thread())
+
+    def test_worker_slot_is_freed(self):
+        """The worker's connection goes back to the pool once the call returns or fails."""
+        for _ in range(3):
+            self.db.submit(self.executor, lambda: None).result(timeout=2)
+        failed = self.db.submit(self.executor, mock.Mock(side_effect=ValueError("bad query")))
+        with self.assertRaises(ValueError):
+            failed.result(timeout=2)
+        # Both slots are free again
+        self.assertTrue(self.db._Database__available.acquire(blocking=False))
+        self.assertTrue(self.db._Database__available.acquire(blocking=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
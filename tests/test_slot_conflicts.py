@@ -0,0 +1,126 @@
+import types
+import unittest
+from contextlib import contextmanager
+from unittest import mock
+
+import psycopg2.errors
+
+# Import the app with the connection pool stubbed out: these tests never reach the database
+with mock.patch("psycopg2.pool.ThreadedConnectionPool"):
+    from app import create_app
+    from models.database import Database, SlotTakenError, SLOT_CONSTRAINT, db
+
+
+def unique_violation(constraint_name):
+    """
+    Build the UniqueViolation psycopg2 raises for the given constraint.
+
+    Args:
+        constraint_name (str): Name reported in the error diagnostics.
+
+    Returns:
+        psycopg2.errors.UniqueViolation: The error, as raised by cursor.execute.
+    """
+    class FakeUniqueViolation(psycopg2.errors.UniqueViolation):
+        diag = types.SimpleNamespace(constraint_name=constraint_name)
+
+    return FakeUniqueViolation("duplicate key value violates unique constraint")
+
+
+class TestSlotConflicts(unittest.TestCase):
+    """
+    Test case for double bookings rejected by the uq_appt_provider_slot index.
+
+    The connection is replaced by a mock whose cursor raises the violation Postgres
+    would report, so every appointment writer can be checked without a database.
+    """
+
+    def fake_connection(self, error):
+        """
+        Make Database.connection yield a connection whose statements raise error.
+
+        Args:
+            error (Exception): Raised by every cursor.execute.
+        """
+        conn = mock.MagicMock(in_transaction=False)
+        conn.cursor.return_value.execute.side_effect = error
+        conn.cursor.return_value.__enter__.return_value = conn.cursor.return_value
+
+        @contextmanager
+        def connection(_self):
+            yield conn
+
+        patcher = mock.patch.object(Database, "connection", connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return conn
+
+    def test_writers_raise_slot_taken(self):
+        """Inserts, reschedules and status changes all report the conflict the same way."""
+        conn = self.fake_connection(unique_violation(SLOT_CONSTRAINT))
+        appointment = {
+            "provider_id": 2, "provider_name": "P", "consumer_id": 1, "consumer_name": "C",
+            "venue": "cmn_room", "date_appoint": "2026-01-05", "slot": "10-11", "nber_services": 1
+        }
+        writers = [
+            lambda: db.add_appointment({
+                "consumer_id": 1, "provider_id": 2, "consumer_name": "C", "provider_name": "P"
+            }),
+            lambda: db.update_appointment_status(1, "requested"),
+            lambda: db.set_appointment_status_if_participant(1, "accepted", 2, provider_only=True),
+            lambda: db.update_appointment(1, dict(
+                appointment, status="requested", service_name="Cut", service_duration=1, service_price=15.75
+            )),
+            lambda: db.update_appointment_and_service(
+                1, appointment, {"service_name": "Cut", "service_duration": 1, "service_price": 15.75},
+                "admin moved appt #1", "admin"
+            ),
+        ]
+        for write in writers:
+            with self.assertRaises(SlotTakenError):
+                write()
+        conn.rollback.assert_called()
+
+    def test_transaction_raises_slot_taken(self):
+        """A violation inside a transaction is translated after the rollback."""
+        conn = self.fake_connection(unique_violation(SLOT_CONSTRAINT))
+        with self.assertRaises(SlotTakenError):
+            with db.transaction() as cur:
+                cur.execute("UPDATE salon_appointment SET slot = %s", ("10-11",))
+        conn.rollback.assert_called_once()
+
+    def test_other_unique_violations_pass_through(self):
+        """Only the provider slot index is reported as a double booking."""
+        self.fake_connection(unique_violation("salon_user_user_name_key"))
+        with self.assertRaises(psycopg2.errors.UniqueViolation) as raised:
+            db.execute_commit("INSERT INTO salon_user (user_name) VALUES (%s)", ("taken",))
+        self.assertNotIsInstance(raised.exception, SlotTakenError)
+
+
+class TestSlotConflictResponses(unittest.TestCase):
+    """Test case for how the API answers a double booking."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the application and a test client once for all tests."""
+        cls.app = create_app()
+        cls.app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+        cls.client = cls.app.test_client()
+
+    def test_create_conflict_returns_409(self):
+        """Creating an appointment in a booked slot is a conflict, not a server error."""
+        payload = {"consumer_id": 1, "provider_id": 2, "consumer_name": "C", "provider_name": "P"}
+        with mock.patch.object(db, "add_appointment", side_effect=SlotTakenError("booked")):
+            response = self.client.post("/api/appointments", json=payload)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json(), {"error": "booked"})
+
+    def test_update_conflict_returns_409(self):
+        """Moving an appointment into a booked slot is a conflict, not a server error."""
+        with mock.patch.object(db, "update_appointment", side_effect=SlotTakenError("booked")):
+            response = self.client.put("/api/appointments/1", json={"slot": "10-11"})
+        self.assertEqual(response.status_code, 409)
+
+
+if __name__ == '__main__':
+    unittest.main()
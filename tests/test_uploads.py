@@ -0,0 +1,106 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from werkzeug.datastructures import FileStorage
+
+# Import the app with the connection pool stubbed out: these tests never reach the database
+with mock.patch("psycopg2.pool.ThreadedConnectionPool"):
+    from app import create_app
+    from app.bp_admin import utils_admin
+    from app.bp_admin.utils_admin import save_upload_async
+
+
+def upload(data=b"image bytes", filename="photo.png"):
+    """
+    Build an uploaded file as found in request.files.
+
+    Args:
+        data (bytes): The file content.
+        filename (str): The client-side filename.
+
+    Returns:
+        FileStorage: The uploaded file.
+    """
+    return FileStorage(stream=io.BytesIO(data), filename=filename)
+
+
+def wait_for(condition, timeout=2):
+    """
+    Wait until condition() is true, e.g. for a background upload to finish.
+
+    Args:
+        condition (callable): Returns True once the expected state is reached.
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        bool: Whether the condition was met.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestSaveUploadAsync(unittest.TestCase):
+    """Test case for writing uploaded images on the background upload executor."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create the application once for all tests."""
+        cls.app = create_app()
+
+    def setUp(self):
+        """Enter an application context with an empty, temporary uploads folder."""
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, ignore_errors=True)
+
+    def tearDown(self):
+        """Leave the application context."""
+        self.ctx.pop()
+
+    def test_writes_file_named_after_content(self):
+        """The image is written in the background under the returned name."""
+        filename = save_upload_async(upload(), self.folder)
+        path = os.path.join(self.folder, filename)
+        self.assertTrue(wait_for(lambda: os.path.exists(path)))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"image bytes")
+
+    def test_write_error_is_logged(self):
+        """A failed write (e.g. disk full) is reported instead of silently dropped."""
+        with mock.patch.object(utils_admin, "_write_atomically", side_effect=OSError("No space left")), \
+                mock.patch.object(self.app.logger, "error") as log_error:
+            save_upload_async(upload(), self.folder)
+            self.assertTrue(wait_for(lambda: log_error.called))
+        self.assertIsInstance(log_error.call_args.kwargs["exc_info"], OSError)
+
+    def test_identical_uploads_in_flight_are_written_once(self):
+        """A second upload of the same bytes does not queue another write while the first runs."""
+        release = threading.Event()
+        writes = []
+
+        def slow_write(data, path):
+            writes.append(path)
+            release.wait(2)
+
+        with mock.patch.object(utils_admin, "_write_upload", slow_write):
+            first = save_upload_async(upload(), self.folder)
+            second = save_upload_async(upload(), self.folder)
+            release.set()
+            self.assertTrue(wait_for(lambda: not utils_admin._pending_uploads))
+        self.assertEqual(first, second)
+        self.assertEqual(len(writes), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()